@@ -29,6 +29,7 @@ from .exceptions import *
 from .features import *
 from .io import *
 from .metrics import *
+from .portfolio import *
 from .samples.load import *
 from .segmentation import *
 from .transform import *
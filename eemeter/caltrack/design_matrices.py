@@ -17,6 +17,9 @@
    limitations under the License.
 
 """
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 
 from eemeter.features import (
@@ -24,6 +27,8 @@ from eemeter.features import (
     compute_temperature_features,
     compute_usage_per_day_feature,
     merge_features,
+    _compute_temperature_features_with_day_temperatures,
+    _get_degree_day_totals,
 )
 from eemeter.segmentation import iterate_segmented_dataset
 from eemeter.caltrack.hourly import caltrack_hourly_fit_feature_processor
@@ -34,9 +39,243 @@ __all__ = (
     "create_caltrack_hourly_segmented_design_matrices",
     "create_caltrack_daily_design_matrix",
     "create_caltrack_billing_design_matrix",
+    "LazyDegreeDayDesignMatrix",
 )
 
 
+class LazyDegreeDayDesignMatrix(object):
+    """A daily or billing design matrix which stores the mean temperature of
+    each kept day of each period once and computes ``cdd_<bp>`` and
+    ``hdd_<bp>`` columns when they are accessed.
+
+    It can be used in place of the :any:`pandas.DataFrame` returned by
+    :any:`eemeter.create_caltrack_daily_design_matrix` or
+    :any:`eemeter.create_caltrack_billing_design_matrix` (with
+    ``lazy_degree_days=True``) in :any:`eemeter.fit_caltrack_usage_per_day_model`
+    and supports the parts of the :any:`pandas.DataFrame` interface used
+    there: ``index``, ``columns``, column access with ``data[name]``,
+    ``data[names]`` or ``data.name``, ``dropna()``, ``reindex()`` and
+    ``sum()``. Degree day columns have the same values as in the
+    corresponding :any:`pandas.DataFrame`. When fitting, the statistics
+    over all degree day columns are computed for chunks of rows, so the
+    degree day columns are never all computed at once.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame`
+        The design matrix columns other than degree days, including
+        ``n_days_kept``. Rows with any null value are null in every column.
+    day_temperatures : :any:`numpy.ndarray`
+        Mean temperature of each kept day, sorted by row.
+    day_rows : :any:`numpy.ndarray` of :any:`int`
+        Row (position in ``data``) of each kept day.
+    cooling_balance_points, heating_balance_points : :any:`list` of :any:`int` or :any:`float`
+        Balance points of the ``cdd_<bp>`` and ``hdd_<bp>`` columns.
+    n_days : :any:`numpy.ndarray`, optional
+        Number of days each degree day value represents, for each row.
+        Defaults to 1, i.e., mean daily values.
+    cache_size : :any:`int`, optional
+        Number of computed degree day columns to keep.
+    """
+
+    def __init__(
+        self,
+        data,
+        day_temperatures,
+        day_rows,
+        cooling_balance_points,
+        heating_balance_points,
+        n_days=None,
+        cache_size=16,
+    ):
+        self.data = data
+        self.day_temperatures = np.asarray(day_temperatures, dtype=float)
+        self.day_rows = np.asarray(day_rows, dtype=int)
+        self.cooling_balance_points = list(cooling_balance_points)
+        self.heating_balance_points = list(heating_balance_points)
+        if n_days is None:
+            n_days = np.ones(len(data))
+        self.n_days = np.asarray(n_days, dtype=float)
+        self.cache_size = cache_size
+
+        self._degree_day_columns = OrderedDict(
+            [("cdd_%s" % bp, ("cdd", bp)) for bp in self.cooling_balance_points]
+            + [("hdd_%s" % bp, ("hdd", bp)) for bp in self.heating_balance_points]
+        )
+        self._row_is_null = data.isnull().any(axis=1).to_numpy()
+        self._cache = OrderedDict()
+
+    def __repr__(self):
+        return "LazyDegreeDayDesignMatrix(n_rows={}, n_degree_day_columns={})".format(
+            len(self), len(self._degree_day_columns)
+        )
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, column):
+        return column in self.data.columns or column in self._degree_day_columns
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self:
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self._degree_day_columns:
+                return pd.Series(
+                    self._get_degree_day_column(key), index=self.index, name=key
+                )
+            return self.data[key]
+        columns = list(key)
+        missing = [column for column in columns if column not in self]
+        if len(missing) > 0:
+            raise KeyError(missing)
+        degree_day_columns = [
+            column for column in columns if column in self._degree_day_columns
+        ]
+        values = dict(
+            zip(degree_day_columns, self._compute_degree_days(degree_day_columns).T)
+        )
+        return pd.DataFrame(
+            {
+                column: values[column]
+                if column in values
+                else self.data[column].to_numpy()
+                for column in columns
+            },
+            index=self.index,
+            columns=columns,
+        )
+
+    @property
+    def index(self):
+        return self.data.index
+
+    @property
+    def columns(self):
+        return pd.Index(list(self.data.columns) + list(self._degree_day_columns))
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    ndim = 2
+
+    @property
+    def empty(self):
+        return 0 in self.shape
+
+    @property
+    def nbytes(self):
+        """Number of bytes held by this design matrix, excluding cached
+        degree day columns."""
+        return (
+            int(self.data.memory_usage(index=False).sum())
+            + self.day_temperatures.nbytes
+            + self.day_rows.nbytes
+            + self.n_days.nbytes
+        )
+
+    def _compute_degree_days(self, columns):
+        cooling_balance_points = []
+        heating_balance_points = []
+        for column in columns:
+            kind, balance_point = self._degree_day_columns[column]
+            if kind == "cdd":
+                cooling_balance_points.append(balance_point)
+            else:
+                heating_balance_points.append(balance_point)
+        cdd, hdd = _get_degree_day_totals(
+            self.day_temperatures,
+            self.day_rows,
+            len(self),
+            cooling_balance_points,
+            heating_balance_points,
+        )
+        n_days_kept = self.data["n_days_kept"].to_numpy(dtype=float)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            degree_days = (
+                np.column_stack([cdd, hdd]) / n_days_kept * self.n_days[:, None]
+            )
+        degree_days[self._row_is_null] = np.nan
+
+        # restore the requested column order
+        kinds = ["cdd"] * len(cooling_balance_points) + ["hdd"] * len(
+            heating_balance_points
+        )
+        positions = {
+            ("%s_%s" % (kind, bp)): i
+            for i, (kind, bp) in enumerate(
+                zip(kinds, cooling_balance_points + heating_balance_points)
+            )
+        }
+        return degree_days[:, [positions[column] for column in columns]].reshape(
+            len(self), len(columns)
+        )
+
+    def _get_degree_day_column(self, column):
+        if column in self._cache:
+            self._cache.move_to_end(column)
+            return self._cache[column]
+        values = self._compute_degree_days([column])[:, 0]
+        if self.cache_size > 0:
+            self._cache[column] = values
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return values
+
+    def _take(self, index):
+        # select (or add null) rows by index label
+        positions = self.index.get_indexer(index)
+        if (positions < 0).any():
+            data = self.data.reindex(index)
+        else:
+            data = self.data.iloc[positions]
+            data.index = index
+        first_days = np.searchsorted(self.day_rows, positions, side="left")
+        n_row_days = np.where(
+            positions >= 0,
+            np.searchsorted(self.day_rows, positions, side="right") - first_days,
+            0,
+        )
+        # positions of the kept days of each selected row, in row order
+        new_first_days = np.cumsum(n_row_days) - n_row_days
+        day_positions = np.repeat(first_days - new_first_days, n_row_days)
+        day_positions += np.arange(len(day_positions))
+        return LazyDegreeDayDesignMatrix(
+            data,
+            self.day_temperatures[day_positions],
+            np.repeat(np.arange(len(positions)), n_row_days),
+            self.cooling_balance_points,
+            self.heating_balance_points,
+            n_days=np.where(positions >= 0, self.n_days[positions], np.nan),
+            cache_size=self.cache_size,
+        )
+
+    def dropna(self):
+        """Return a design matrix without the rows with null values."""
+        return self._take(self.index[~self._row_is_null])
+
+    def reindex(self, index):
+        """Return a design matrix with rows ``index``; rows not in this
+        design matrix are null."""
+        return self._take(pd.Index(index))
+
+    def sum(self, axis=0, skipna=True):
+        """Sums of the materialized design matrix, see :any:`to_frame`."""
+        return self.to_frame().sum(axis=axis, skipna=skipna)
+
+    def copy(self):
+        return self._take(self.index)
+
+    def to_frame(self):
+        """Return the design matrix as a :any:`pandas.DataFrame` with all
+        degree day columns."""
+        return self[list(self.columns)]
+
+
 def create_caltrack_hourly_preliminary_design_matrix(meter_data, temperature_data):
     """A helper function which calls basic feature creation methods to create an
     input suitable for use in the first step of creating a CalTRACK hourly model.
@@ -69,7 +308,57 @@ def create_caltrack_hourly_preliminary_design_matrix(meter_data, temperature_dat
     return design_matrix
 
 
-def create_caltrack_billing_design_matrix(meter_data, temperature_data):
+def _create_lazy_degree_day_design_matrix(
+    meter_data,
+    temperature_data,
+    balance_points,
+    tolerance=None,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
+):
+    if meter_data.index.freq == "H":
+        raise ValueError(
+            "degree_day_method='hourly' must be used with"
+            " hourly meter data. Found: 'daily'"
+        )
+    (
+        temperature_features,
+        day_temperatures,
+        day_rows,
+    ) = _compute_temperature_features_with_day_temperatures(
+        meter_data.index,
+        temperature_data,
+        data_quality=True,
+        tolerance=tolerance,
+        period_index=period_index,
+        temperature_cache=temperature_cache,
+        temperature_cache_key=temperature_cache_key,
+    )
+    if day_temperatures is None:
+        # as in compute_temperature_features, no degree day columns without
+        # temperature data in any period.
+        day_temperatures = np.empty(0)
+        day_rows = np.empty(0, dtype=int)
+        balance_points = []
+
+    usage_per_day = compute_usage_per_day_feature(meter_data, series_name="meter_value")
+    data = merge_features([usage_per_day, temperature_features])
+    # degree days, and so the whole row, are null without kept days.
+    data.loc[data.n_days_kept == 0] = np.nan
+    return LazyDegreeDayDesignMatrix(
+        data, day_temperatures, day_rows, balance_points, balance_points
+    )
+
+
+def create_caltrack_billing_design_matrix(
+    meter_data,
+    temperature_data,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
+    lazy_degree_days=False,
+):
     """A helper function which calls basic feature creation methods to create a
     design matrix suitable for use with CalTRACK Billing methods.
 
@@ -79,13 +368,36 @@ def create_caltrack_billing_design_matrix(meter_data, temperature_data):
         Hourly meter data in eemeter format.
     temperature_data : :any:`pandas.Series`
         Hourly temperature data in eemeter format.
+    period_index : :any:`eemeter.TemperaturePeriodIndex`, optional
+        A precomputed assignment of ``temperature_data`` to the periods of
+        ``meter_data``, e.g., to reuse for prediction. See
+        :any:`eemeter.compute_temperature_features`.
+    temperature_cache : :any:`eemeter.TemperatureFeatureCache`, optional
+        A cache of daily temperature aggregates shared by meters with the
+        same ``temperature_data``.
+    temperature_cache_key : hashable, optional
+        Key of ``temperature_data`` in ``temperature_cache``, e.g., a weather
+        station id.
+    lazy_degree_days : :any:`bool`, optional
+        If True, return a :any:`eemeter.LazyDegreeDayDesignMatrix`, which
+        computes degree day columns when they are accessed.
 
     Returns
     -------
-    design_matrix : :any:`pandas.DataFrame`
+    design_matrix : :any:`pandas.DataFrame` or :any:`eemeter.LazyDegreeDayDesignMatrix`
         A design matrics with mean usage_per_day, hdd_30-hdd_90, and cdd_30-cdd_90
         features.
     """
+    if lazy_degree_days:
+        return _create_lazy_degree_day_design_matrix(
+            meter_data,
+            temperature_data,
+            range(30, 91),
+            tolerance=pd.Timedelta("35D"),
+            period_index=period_index,
+            temperature_cache=temperature_cache,
+            temperature_cache_key=temperature_cache_key,
+        )
     usage_per_day = compute_usage_per_day_feature(meter_data, series_name="meter_value")
     temperature_features = compute_temperature_features(
         meter_data.index,
@@ -96,12 +408,22 @@ def create_caltrack_billing_design_matrix(meter_data, temperature_data):
         tolerance=pd.Timedelta(
             "35D"
         ),  # limit temperature data matching to periods of up to 35 days.
+        period_index=period_index,
+        temperature_cache=temperature_cache,
+        temperature_cache_key=temperature_cache_key,
     )
     design_matrix = merge_features([usage_per_day, temperature_features])
     return design_matrix
 
 
-def create_caltrack_daily_design_matrix(meter_data, temperature_data):
+def create_caltrack_daily_design_matrix(
+    meter_data,
+    temperature_data,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
+    lazy_degree_days=False,
+):
     """A helper function which calls basic feature creation methods to create a
     design matrix suitable for use with CalTRACK daily methods.
 
@@ -111,13 +433,35 @@ def create_caltrack_daily_design_matrix(meter_data, temperature_data):
         Hourly meter data in eemeter format.
     temperature_data : :any:`pandas.Series`
         Hourly temperature data in eemeter format.
+    period_index : :any:`eemeter.TemperaturePeriodIndex`, optional
+        A precomputed assignment of ``temperature_data`` to the periods of
+        ``meter_data``, e.g., to reuse for prediction. See
+        :any:`eemeter.compute_temperature_features`.
+    temperature_cache : :any:`eemeter.TemperatureFeatureCache`, optional
+        A cache of daily temperature aggregates shared by meters with the
+        same ``temperature_data``.
+    temperature_cache_key : hashable, optional
+        Key of ``temperature_data`` in ``temperature_cache``, e.g., a weather
+        station id.
+    lazy_degree_days : :any:`bool`, optional
+        If True, return a :any:`eemeter.LazyDegreeDayDesignMatrix`, which
+        computes degree day columns when they are accessed.
 
     Returns
     -------
-    design_matrix : :any:`pandas.DataFrame`
+    design_matrix : :any:`pandas.DataFrame` or :any:`eemeter.LazyDegreeDayDesignMatrix`
         A design matrics with mean usage_per_day, hdd_30-hdd_90, and cdd_30-cdd_90
         features.
     """
+    if lazy_degree_days:
+        return _create_lazy_degree_day_design_matrix(
+            meter_data,
+            temperature_data,
+            range(30, 91),
+            period_index=period_index,
+            temperature_cache=temperature_cache,
+            temperature_cache_key=temperature_cache_key,
+        )
     usage_per_day = compute_usage_per_day_feature(meter_data, series_name="meter_value")
     temperature_features = compute_temperature_features(
         meter_data.index,
@@ -125,6 +469,9 @@ def create_caltrack_daily_design_matrix(meter_data, temperature_data):
         heating_balance_points=range(30, 91),
         cooling_balance_points=range(30, 91),
         data_quality=True,
+        period_index=period_index,
+        temperature_cache=temperature_cache,
+        temperature_cache_key=temperature_cache_key,
     )
     design_matrix = merge_features([usage_per_day, temperature_features])
     return design_matrix
@@ -17,6 +17,8 @@
    limitations under the License.
 
 """
+from functools import partial
+
 import numpy as np
 import pandas as pd
 import statsmodels.formula.api as smf
@@ -289,6 +291,29 @@ class CalTRACKHourlyModel(SegmentedModel):
         return c
 
 
+def _compute_occupancy_temperature_bin_features(
+    temperatures, occupancy_feature, occupied_bin_endpoints, unoccupied_bin_endpoints
+):
+    # occupied and unoccupied temperature bin features written into a single
+    # block, each set to zero in the other occupancy mode.
+    n_occupied_bins = len(occupied_bin_endpoints) + 1
+    n_unoccupied_bins = len(unoccupied_bin_endpoints) + 1
+    data = np.empty((len(temperatures), n_occupied_bins + n_unoccupied_bins))
+    occupied = data[:, :n_occupied_bins]
+    unoccupied = data[:, n_occupied_bins:]
+    compute_temperature_bin_features(temperatures, occupied_bin_endpoints, out=occupied)
+    compute_temperature_bin_features(
+        temperatures, unoccupied_bin_endpoints, out=unoccupied
+    )
+    occupancy = occupancy_feature.values
+    occupied[occupancy == 0] = 0
+    unoccupied[occupancy == 1] = 0
+    columns = ["bin_{}_occupied".format(i) for i in range(n_occupied_bins)] + [
+        "bin_{}_unoccupied".format(i) for i in range(n_unoccupied_bins)
+    ]
+    return pd.DataFrame(data, index=temperatures.index, columns=columns)
+
+
 def caltrack_hourly_fit_feature_processor(
     segment_name,
     segmented_data,
@@ -342,35 +367,18 @@ def caltrack_hourly_fit_feature_processor(
         .index[unoccupied_temperature_bins[segment_name]]
         .tolist()
     )
-    occupied_temperature_bin_features = compute_temperature_bin_features(
-        segmented_data.temperature_mean, occupied_bin_endpoints_list
-    )
-    occupied_temperature_bin_features[occupancy_feature == 0] = 0
-    occupied_temperature_bin_features.rename(
-        columns={
-            c: "{}_occupied".format(c)
-            for c in occupied_temperature_bin_features.columns
-        },
-        inplace=True,
-    )
-    unoccupied_temperature_bin_features = compute_temperature_bin_features(
-        segmented_data.temperature_mean, unoccupied_bin_endpoints_list
-    )
-    unoccupied_temperature_bin_features[occupancy_feature == 1] = 0
-    unoccupied_temperature_bin_features.rename(
-        columns={
-            c: "{}_unoccupied".format(c)
-            for c in unoccupied_temperature_bin_features.columns
-        },
-        inplace=True,
+    temperature_bin_features = _compute_occupancy_temperature_bin_features(
+        segmented_data.temperature_mean,
+        occupancy_feature,
+        occupied_bin_endpoints_list,
+        unoccupied_bin_endpoints_list,
     )
 
     # combine features
     return merge_features(
         [
             segmented_data[["meter_value", "hour_of_week"]],
-            occupied_temperature_bin_features,
-            unoccupied_temperature_bin_features,
+            temperature_bin_features,
             segmented_data.weight,
         ]
     )
@@ -434,41 +442,96 @@ def caltrack_hourly_prediction_feature_processor(
         .index[unoccupied_temperature_bins[segment_name]]
         .tolist()
     )
-    occupied_temperature_bin_features = compute_temperature_bin_features(
-        segmented_data.temperature_mean, occupied_bin_endpoints_list
-    )
-    occupied_temperature_bin_features[occupancy_feature == 0] = 0
-    occupied_temperature_bin_features.rename(
-        columns={
-            c: "{}_occupied".format(c)
-            for c in occupied_temperature_bin_features.columns
-        },
-        inplace=True,
-    )
-    unoccupied_temperature_bin_features = compute_temperature_bin_features(
-        segmented_data.temperature_mean, unoccupied_bin_endpoints_list
-    )
-    unoccupied_temperature_bin_features[occupancy_feature == 1] = 0
-    unoccupied_temperature_bin_features.rename(
-        columns={
-            c: "{}_unoccupied".format(c)
-            for c in unoccupied_temperature_bin_features.columns
-        },
-        inplace=True,
+    temperature_bin_features = _compute_occupancy_temperature_bin_features(
+        segmented_data.temperature_mean,
+        occupancy_feature,
+        occupied_bin_endpoints_list,
+        unoccupied_bin_endpoints_list,
     )
 
     # combine features
     return merge_features(
         [
             hour_of_week_feature,
-            occupied_temperature_bin_features,
-            unoccupied_temperature_bin_features,
+            temperature_bin_features,
             segmented_data.weight,
         ]
     )
 
 
-def fit_caltrack_hourly_model_segment(segment_name, segment_data):
+def _fit_hourly_segment_absorbed(segment_data, bin_columns):
+    """Fit the segment formula with the hour of week intercepts absorbed.
+
+    The weighted group means of each hour of week are subtracted from the
+    meter values and the bin features, the temperature slopes are solved on
+    the demeaned data, and the intercepts are recovered from the group means.
+    Hours of week with no weight get a zero intercept, like the minimum-norm
+    solution of the full least squares problem. If the bin features are
+    collinear the coefficients may differ from the statsmodels fit, but the
+    fitted values agree.
+
+    Returns a tuple of ``(model_params, predicted_value)``, where
+    ``predicted_value`` covers the rows with weight 1 and complete data.
+    """
+    hour_of_week = segment_data["hour_of_week"].cat
+    categories = hour_of_week.categories
+    codes = hour_of_week.codes.values
+    meter_value = segment_data["meter_value"].values.astype(float)
+    bins = segment_data[bin_columns].values.astype(float).reshape(-1, len(bin_columns))
+    weight = segment_data["weight"].values.astype(float)
+
+    complete = (
+        (codes >= 0)
+        & ~np.isnan(meter_value)
+        & ~np.isnan(bins).any(axis=1)
+        & ~np.isnan(weight)
+    )
+    codes, meter_value, bins, weight = (
+        codes[complete],
+        meter_value[complete],
+        bins[complete],
+        weight[complete],
+    )
+
+    n_groups = len(categories)
+    group_weight = np.bincount(codes, weights=weight, minlength=n_groups)
+    has_weight = group_weight > 0
+    safe_group_weight = np.where(has_weight, group_weight, 1.0)
+    meter_value_means = (
+        np.bincount(codes, weights=weight * meter_value, minlength=n_groups)
+        / safe_group_weight
+    )
+    bin_means = np.column_stack(
+        [
+            np.bincount(codes, weights=weight * bins[:, i], minlength=n_groups)
+            / safe_group_weight
+            for i in range(len(bin_columns))
+        ]
+    ).reshape(n_groups, len(bin_columns))
+
+    sqrt_weight = np.sqrt(weight)
+    demeaned_bins = sqrt_weight[:, None] * (bins - bin_means[codes])
+    demeaned_meter_value = sqrt_weight * (meter_value - meter_value_means[codes])
+    slopes = np.linalg.pinv(demeaned_bins, rcond=1e-15).dot(demeaned_meter_value)
+    intercepts = np.where(has_weight, meter_value_means - bin_means.dot(slopes), 0.0)
+
+    model_params = {
+        "C(hour_of_week)[{}]".format(category): intercept
+        for category, intercept in zip(categories, intercepts)
+    }
+    model_params.update(zip(bin_columns, slopes))
+
+    predicted = weight == 1
+    predicted_value = pd.Series(
+        intercepts[codes[predicted]] + bins[predicted].dot(slopes),
+        index=segment_data.index[complete][predicted],
+    )
+    return model_params, predicted_value
+
+
+def fit_caltrack_hourly_model_segment(
+    segment_name, segment_data, fit_engine="statsmodels"
+):
     """Fit a model for a single segment.
 
     Parameters
@@ -478,6 +541,10 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
     segment_data : :any:`pandas.DataFrame`
         A design matrix for caltrack hourly, of the form returned by
         :any:`eemeter.caltrack_hourly_prediction_feature_processor`.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        absorbs the hour of week intercepts by demeaning within each hour of
+        week and only solves for the temperature bin coefficients.
 
     Returns
     -------
@@ -485,7 +552,11 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
         A model that represents the fitted model.
     """
 
+    if fit_engine not in ("statsmodels", "numpy"):
+        raise ValueError("fit_engine not supported: {}".format(fit_engine))
+
     warnings = []
+    predicted_value = None
     if segment_data.dropna().empty:
         model = None
         formula = None
@@ -502,15 +573,10 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
         )
 
     else:
-
-        def _get_hourly_model_formula(data):
-            return "meter_value ~ C(hour_of_week) - 1{}".format(
-                "".join(
-                    [" + {}".format(c) for c in data.columns if c.startswith("bin")]
-                )
-            )
-
-        formula = _get_hourly_model_formula(segment_data)
+        bin_columns = [c for c in segment_data.columns if c.startswith("bin")]
+        formula = "meter_value ~ C(hour_of_week) - 1{}".format(
+            "".join([" + {}".format(c) for c in bin_columns])
+        )
 
         # remove categories that only have null or missing entries
         # this ensures that predictions will predict null
@@ -519,8 +585,20 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
             categories=segment_data["hour_of_week"].dropna().unique(),
             ordered=False,
         )
-        model = smf.wls(formula=formula, data=segment_data, weights=segment_data.weight)
-        model_params = {coeff: value for coeff, value in model.fit().params.items()}
+        if fit_engine == "numpy":
+            model = None
+            model_params, predicted_value = _fit_hourly_segment_absorbed(
+                segment_data, bin_columns
+            )
+        else:
+            model = smf.wls(
+                formula=formula, data=segment_data, weights=segment_data.weight
+            )
+            model_fit = model.fit()
+            model_params = {coeff: value for coeff, value in model_fit.params.items()}
+            predicted_value = pd.Series(
+                model_fit.predict(segment_data[segment_data.weight == 1])
+            )
 
     segment_model = CalTRACKSegmentModel(
         segment_name=segment_name,
@@ -529,9 +607,8 @@ def fit_caltrack_hourly_model_segment(segment_name, segment_data):
         model_params=model_params,
         warnings=warnings,
     )
-    if model:
+    if predicted_value is not None:
         this_segment_data = segment_data[segment_data.weight == 1]
-        predicted_value = pd.Series(model.fit().predict(this_segment_data))
         segment_model.totals_metrics = ModelMetrics(
             this_segment_data.meter_value, predicted_value, len(model_params)
         )
@@ -546,6 +623,7 @@ def fit_caltrack_hourly_model(
     occupancy_lookup,
     occupied_temperature_bins,
     unoccupied_temperature_bins,
+    fit_engine="statsmodels",
 ):
     """Fit a CalTRACK hourly model
 
@@ -561,6 +639,9 @@ def fit_caltrack_hourly_model(
         A dataframe of bin endpoint flags for each segment. Segment names are columns.
     unoccupied_temperature_bins : :any:`pandas.DataFrame`
         Ditto for the unoccupied mode.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit each segment. See
+        :any:`eemeter.fit_caltrack_hourly_model_segment`.
 
     Returns
     -------
@@ -569,7 +650,8 @@ def fit_caltrack_hourly_model(
         using this model.
     """
     segment_models = fit_model_segments(
-        segmented_design_matrices, fit_caltrack_hourly_model_segment
+        segmented_design_matrices,
+        partial(fit_caltrack_hourly_model_segment, fit_engine=fit_engine),
     )
     all_warnings = [
         warning
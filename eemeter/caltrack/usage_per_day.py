@@ -18,11 +18,14 @@
 
 """
 from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import traceback
 
 import numpy as np
 import pandas as pd
 import pytz
+from scipy import special
 import statsmodels.formula.api as smf
 
 from ..exceptions import MissingModelParameterError, UnrecognizedModelTypeError
@@ -35,9 +38,11 @@ from ..warnings import EEMeterWarning
 __all__ = (
     "CalTRACKUsagePerDayCandidateModel",
     "CalTRACKUsagePerDayModelResults",
+    "CalTRACKUsagePerDayModelState",
     "DataSufficiency",
     "ModelPrediction",
     "fit_caltrack_usage_per_day_model",
+    "fit_caltrack_usage_per_day_models",
     "caltrack_sufficiency_criteria",
     "caltrack_usage_per_day_predict",
     "plot_caltrack_candidate",
@@ -317,13 +322,24 @@ class CalTRACKUsagePerDayCandidateModel(object):
         A flat dictionary of model parameters which must be serializable
         using the :any:`json.dumps` method.
     model : :any:`object`
-        The raw model (if any) used in fitting. Not serialized.
+        The raw model (if any) used in fitting. Not serialized. If not given
+        directly, this is rebuilt from ``fit_data`` on first access.
     result : :any:`object`
         The raw modeling result (if any) returned by the `model`. Not serialized.
+        If not given directly, this is rebuilt from ``fit_data`` on first access.
     r_squared_adj : :any:`float`
         The adjusted r-squared of the candidate model.
     warnings : :any:`list` of :any:`eemeter.EEMeterWarning`
         A list of any warnings reported during creation of the candidate model.
+    p_values : :any:`dict`
+        The p-values of the fitted parameters, keyed by parameter name as used in
+        ``formula`` (e.g., ``'Intercept'``, ``'cdd_65'``). Not serialized.
+    fit_data : :any:`pandas.DataFrame` or :any:`None`
+        The data the candidate was fitted on, used to rebuild ``model`` and
+        ``result`` on demand. This is a reference shared between candidates, not
+        a copy. Not serialized.
+    weights_col : :any:`str` or None
+        The name of the column (if any) in ``fit_data`` used as weights.
     """
 
     def __init__(
@@ -336,13 +352,22 @@ class CalTRACKUsagePerDayCandidateModel(object):
         result=None,
         r_squared_adj=None,
         warnings=None,
+        p_values=None,
+        fit_data=None,
+        weights_col=None,
     ):
         self.model_type = model_type
         self.formula = formula
         self.status = status  # NOT ATTEMPTED | ERROR | QUALIFIED | DISQUALIFIED
-        self.model = model
-        self.result = result
+        self._model = model
+        self._result = result
         self.r_squared_adj = r_squared_adj
+        self.fit_data = fit_data
+        self.weights_col = weights_col
+
+        if p_values is None:
+            p_values = {}
+        self.p_values = p_values
 
         if model_params is None:
             model_params = {}
@@ -352,6 +377,34 @@ class CalTRACKUsagePerDayCandidateModel(object):
             warnings = []
         self.warnings = warnings
 
+    def _fit_statsmodels(self):
+        if self.weights_col is None:
+            weights = 1
+        else:
+            weights = self.fit_data[self.weights_col]
+        self._model = smf.wls(formula=self.formula, data=self.fit_data, weights=weights)
+        self._result = self._model.fit()
+
+    @property
+    def model(self):
+        if self._model is None and self.fit_data is not None:
+            self._fit_statsmodels()
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    @property
+    def result(self):
+        if self._result is None and self.fit_data is not None:
+            self._fit_statsmodels()
+        return self._result
+
+    @result.setter
+    def result(self, result):
+        self._result = result
+
     def __repr__(self):
         return (
             "CalTRACKUsagePerDayCandidateModel(model_type='{}', formula='{}', status='{}',"
@@ -645,6 +698,7 @@ def caltrack_usage_per_day_predict(
     degree_day_method="daily",
     with_disaggregated=False,
     with_design_matrix=False,
+    period_index=None,
 ):
     """CalTRACK predict method.
 
@@ -672,6 +726,10 @@ def caltrack_usage_per_day_predict(
         If True, return results as a :any:`pandas.DataFrame` with columns
         ``'n_days'``, ``'n_days_dropped'``, ``n_days_kept``, and
         ``temperature_mean``.
+    period_index : :any:`eemeter.TemperaturePeriodIndex`, optional
+        A precomputed assignment of ``temperature_data`` to the periods of
+        ``prediction_index``, reused across predictions. See
+        :any:`eemeter.compute_temperature_features`.
 
     Returns
     -------
@@ -710,6 +768,7 @@ def caltrack_usage_per_day_predict(
         cooling_balance_points=cooling_balance_points,
         degree_day_method=degree_day_method,
         use_mean_daily_values=False,
+        period_index=period_index,
     )
 
     if degree_day_method == "daily":
@@ -802,8 +861,16 @@ def get_too_few_non_zero_degree_day_warning(
     warnings : :any:`list` of :any:`eemeter.EEMeterWarning`
         Empty list or list of single warning.
     """
-    warnings = []
     n_non_zero = int((degree_days > 0).sum())
+    return _get_too_few_non_zero_degree_day_warning(
+        model_type, balance_point, degree_day_type, n_non_zero, minimum_non_zero
+    )
+
+
+def _get_too_few_non_zero_degree_day_warning(
+    model_type, balance_point, degree_day_type, n_non_zero, minimum_non_zero
+):
+    warnings = []
     if n_non_zero < minimum_non_zero:
         warnings.append(
             EEMeterWarning(
@@ -866,8 +933,16 @@ def get_total_degree_day_too_low_warning(
         Empty list or list of single warning.
     """
 
-    warnings = []
     total_degree_days = (avg_degree_days * period_days).sum()
+    return _get_total_degree_day_too_low_warning(
+        model_type, balance_point, degree_day_type, total_degree_days, minimum_total
+    )
+
+
+def _get_total_degree_day_too_low_warning(
+    model_type, balance_point, degree_day_type, total_degree_days, minimum_total
+):
+    warnings = []
     if total_degree_days < minimum_total:
         warnings.append(
             EEMeterWarning(
@@ -898,6 +973,91 @@ def get_total_degree_day_too_low_warning(
     return warnings
 
 
+# number of rows of a design matrix read at once when computing statistics
+# over all degree day columns, which bounds the memory used for wide (e.g.,
+# lazy) design matrices.
+_ROW_CHUNK_SIZE = 128
+
+
+def _iter_row_chunks(data, columns):
+    """Yield the first row position and the values of ``columns`` of
+    consecutive chunks of rows of ``data`` as 2-D float arrays."""
+    for start in range(0, len(data), _ROW_CHUNK_SIZE):
+        stop = min(start + _ROW_CHUNK_SIZE, len(data))
+        if isinstance(data, pd.DataFrame):
+            rows = data.iloc[start:stop]
+        else:
+            # e.g., a LazyDegreeDayDesignMatrix, which then only computes
+            # degree days for these rows.
+            rows = data.reindex(data.index[start:stop])
+        yield start, rows[columns].to_numpy(dtype=float).reshape(
+            stop - start, len(columns)
+        )
+
+
+def _get_degree_day_statistics(data, weights_col, columns=None):
+    """Compute the statistics used by the degree day sufficiency checks for
+    many degree day columns in one vectorized reduction.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame`
+        A DataFrame containing degree day columns.
+    weights_col : :any:`str` or None
+        The name of the column (if any) in ``data`` containing the number of
+        days in each period.
+    columns : :any:`list` of :any:`str`, optional
+        The degree day columns to check. Defaults to all columns of the form
+        ``cdd_<balance_point>`` or ``hdd_<balance_point>``.
+
+    Returns
+    -------
+    degree_day_statistics : :any:`dict`
+        A dict of ``(total_degree_days, n_non_zero)`` tuples keyed by column,
+        as used by :any:`eemeter.get_total_degree_day_too_low_warning` and
+        :any:`eemeter.get_too_few_non_zero_degree_day_warning`.
+    """
+    if columns is None:
+        columns = [
+            col
+            for col in data.columns
+            if col.startswith("cdd_") or col.startswith("hdd_")
+        ]
+    columns = list(columns)
+
+    if weights_col is None:
+        period_days = np.ones(len(data))
+    else:
+        period_days = data[weights_col].to_numpy(dtype=float)
+
+    totals = np.zeros(len(columns))
+    n_non_zero = np.zeros(len(columns), dtype=int)
+    for start, degree_days in _iter_row_chunks(data, columns):
+        chunk_period_days = period_days[start : start + len(degree_days), None]
+        totals += np.nansum(degree_days * chunk_period_days, axis=0)
+        n_non_zero += (degree_days > 0).sum(axis=0)
+    return {
+        column: (float(total), int(count))
+        for column, total, count in zip(columns, totals, n_non_zero)
+    }
+
+
+def _get_degree_day_warnings(
+    model_type,
+    balance_point,
+    degree_day_type,
+    degree_day_statistics,
+    minimum_total,
+    minimum_non_zero,
+):
+    total_degree_days, n_non_zero = degree_day_statistics
+    return _get_total_degree_day_too_low_warning(
+        model_type, balance_point, degree_day_type, total_degree_days, minimum_total
+    ) + _get_too_few_non_zero_degree_day_warning(
+        model_type, balance_point, degree_day_type, n_non_zero, minimum_non_zero
+    )
+
+
 def get_parameter_negative_warning(model_type, model_params, parameter):
     """Return an empty list or a single warning wrapped in a list indicating
     whether model parameter is negative.
@@ -1015,7 +1175,392 @@ def get_fit_failed_candidate_model(model_type, formula):
     )
 
 
-def get_intercept_only_candidate_models(data, weights_col):
+def _get_wls_values(data, weights_col, columns):
+    """Return ``meter_value`` followed by ``columns`` as a 2-D array, and
+    the weights (ones if ``weights_col`` is None)."""
+    y = data["meter_value"].to_numpy(dtype=float)
+    exog = data[columns].to_numpy(dtype=float).reshape(len(data), len(columns))
+    if weights_col is None:
+        weights = np.ones(len(data))
+    else:
+        weights = data[weights_col].to_numpy(dtype=float)
+    return np.column_stack([y, exog]), weights
+
+
+def _get_wls_moments(values, weights):
+    """Weighted moments of a stack of meters.
+
+    ``values`` has shape ``(n_meters, n_rows, 1 + n_columns)`` with
+    ``meter_value`` first and ``weights`` has shape ``(n_meters, n_rows)``.
+    Rows of different meters need not be aligned; padding rows should be NaN.
+
+    Returns arrays (one entry per meter) of the number of observations, the
+    sum of weights, the weighted means, the centered weighted cross-products,
+    and whether rows are shared by all candidates and by the intercept-only
+    candidate.
+    """
+    finite = np.isfinite(values)
+    # same as the missing="drop" behavior of the formula api: a row is
+    # dropped if any of the values used in the fit are missing.
+    valid_yw = finite[:, :, 0] & np.isfinite(weights)
+    exog_finite = finite[:, :, 1:]
+    valid = valid_yw & exog_finite.all(axis=2)
+
+    # if some rows are only partially missing, the rows dropped depend on
+    # which columns a candidate uses and the shared table does not apply.
+    partial = valid_yw & exog_finite.any(axis=2) & ~exog_finite.all(axis=2)
+    shared_rows = ~partial.any(axis=1)
+    shared_intercept_rows = (valid == valid_yw).all(axis=1)
+
+    nobs = valid.sum(axis=1)
+    weights = np.where(valid, weights, 0.0)
+    values = np.where(valid[:, :, None], values, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sum_weights = weights.sum(axis=1)
+        means = np.einsum("mn,mnk->mk", weights, values) / sum_weights[:, None]
+        centered = np.where(valid[:, :, None], values - means[:, None, :], 0.0)
+        cross_products = np.matmul(
+            (centered * weights[:, :, None]).transpose(0, 2, 1), centered
+        )
+    return nobs, sum_weights, means, cross_products, shared_rows, shared_intercept_rows
+
+
+def _get_chunked_wls_moments(data, weights_col, columns):
+    """Weighted moments of ``meter_value`` and ``columns`` of a single meter,
+    as returned (per meter) by ``_get_wls_moments``, reading ``columns`` a
+    chunk of rows at a time."""
+    y = data["meter_value"].to_numpy(dtype=float)
+    if weights_col is None:
+        weights = np.ones(len(data))
+    else:
+        weights = data[weights_col].to_numpy(dtype=float)
+    valid_yw = np.isfinite(y) & np.isfinite(weights)
+    valid = valid_yw.copy()
+    partial = np.zeros(len(data), dtype=bool)
+
+    # first pass: rows dropped by the fits (which only depends on the row)
+    # and weighted sums.
+    sums = np.zeros(1 + len(columns))
+    for start, exog in _iter_row_chunks(data, columns):
+        rows = slice(start, start + len(exog))
+        exog_finite = np.isfinite(exog)
+        all_finite = exog_finite.all(axis=1)
+        partial[rows] = valid_yw[rows] & exog_finite.any(axis=1) & ~all_finite
+        valid[rows] &= all_finite
+        chunk_weights = np.where(valid[rows], weights[rows], 0.0)
+        values = np.where(valid[rows, None], np.column_stack([y[rows], exog]), 0.0)
+        sums += chunk_weights.dot(values)
+
+    nobs = valid.sum()
+    weights = np.where(valid, weights, 0.0)
+    sum_weights = weights.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / sum_weights
+
+    # second pass: centered weighted cross-products.
+    cross_products = np.zeros((1 + len(columns), 1 + len(columns)))
+    for start, exog in _iter_row_chunks(data, columns):
+        rows = slice(start, start + len(exog))
+        values = np.column_stack([y[rows], exog])
+        with np.errstate(invalid="ignore"):
+            centered = np.where(valid[rows, None], values - means, 0.0)
+        cross_products += (centered * weights[rows, None]).T.dot(centered)
+
+    shared_rows = not partial.any()
+    shared_intercept_rows = (valid == valid_yw).all()
+    return nobs, sum_weights, means, cross_products, shared_rows, shared_intercept_rows
+
+
+class _WLSSufficientStatistics(object):
+    """Weighted cross-products of ``meter_value`` and a set of degree day
+    columns from which any ``meter_value ~ <column> [+ <column>]`` weighted
+    least squares candidate can be solved without revisiting the data.
+
+    The cross-products are computed with a single matrix multiply over
+    weighted-mean-centered columns, so fitting each candidate afterwards
+    only requires solving a 1x1 or 2x2 system. Results match the ``params``,
+    ``pvalues`` and ``rsquared_adj`` attributes of the equivalent statsmodels
+    ``RegressionResults``.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame`
+        A DataFrame containing at least the column ``meter_value``.
+    weights_col : :any:`str` or None
+        The name of the column (if any) in ``data`` to use as weights.
+    columns : :any:`list` of :any:`str`, optional
+        The regressor columns to include. Defaults to all columns of the form
+        ``cdd_<balance_point>`` or ``hdd_<balance_point>``.
+    moments : :any:`tuple`, optional
+        Precomputed moments of ``data`` for one meter, as returned (per
+        meter) by ``_get_wls_moments``. Computed from ``data`` if not given.
+    """
+
+    def __init__(self, data, weights_col, columns=None, moments=None):
+        if columns is None:
+            columns = [
+                col
+                for col in data.columns
+                if col.startswith("cdd_") or col.startswith("hdd_")
+            ]
+        self.data = data
+        self.weights_col = weights_col
+        self.columns = list(columns)
+        self.column_index = {col: i for i, col in enumerate(self.columns)}
+
+        if moments is None:
+            moments = _get_chunked_wls_moments(data, weights_col, self.columns)
+        (
+            nobs,
+            self.sum_weights,
+            self.means,
+            self.cross_products,
+            shared_rows,
+            shared_intercept_rows,
+        ) = moments
+        self.nobs = int(nobs)
+        self.shared_rows = bool(shared_rows)
+        self.shared_intercept_rows = bool(shared_intercept_rows)
+        self._fits = {}
+
+    def fit(self, columns):
+        """Solve the candidate ``meter_value ~ 1 [+ <column> ...]``.
+
+        Parameters
+        ----------
+        columns : :any:`list` of :any:`str`
+            Regressor columns of the candidate (empty for intercept only).
+
+        Returns
+        -------
+        params, pvalues, r_squared_adj : :any:`tuple` of :any:`dict`, :any:`dict`, :any:`float`
+            Parameter estimates and p-values keyed by ``'Intercept'`` and
+            ``columns``, and the adjusted r-squared.
+        """
+        if tuple(columns) in self._fits:
+            return self._fits[tuple(columns)]
+
+        shared_rows = self.shared_rows if columns else self.shared_intercept_rows
+        if not shared_rows and sorted(columns) != sorted(self.columns):
+            return _WLSSufficientStatistics(
+                self.data, self.weights_col, columns=columns
+            ).fit(columns)
+
+        if self.nobs == 0:
+            raise ValueError("No valid observations to fit.")
+
+        ix = [self.column_index[col] + 1 for col in columns]
+        sxx = self.cross_products[np.ix_(ix, ix)]
+        sxy = self.cross_products[ix, 0]
+        syy = self.cross_products[0, 0]
+        x_means = self.means[ix]
+
+        sxx_inv = np.linalg.pinv(sxx)
+        beta = sxx_inv.dot(sxy)
+        intercept = self.means[0] - beta.dot(x_means)
+
+        rank = (np.linalg.matrix_rank(sxx) if len(ix) > 0 else 0) + 1
+        df_resid = self.nobs - rank
+        ssr = max(syy - 2 * beta.dot(sxy) + beta.dot(sxx).dot(beta), 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = ssr / df_resid
+            var_beta = np.diag(sxx_inv) * scale
+            var_intercept = (
+                1.0 / self.sum_weights + x_means.dot(sxx_inv).dot(x_means)
+            ) * scale
+            params = np.concatenate([[intercept], beta])
+            bse = np.sqrt(np.concatenate([[var_intercept], var_beta]))
+            pvalues = special.stdtr(df_resid, -np.abs(params / bse)) * 2
+            r_squared = 1 - ssr / syy
+            r_squared_adj = 1 - (self.nobs - 1) / df_resid * (1 - r_squared)
+
+        names = ["Intercept"] + list(columns)
+        return (
+            dict(zip(names, params.tolist())),
+            dict(zip(names, pvalues.tolist())),
+            float(r_squared_adj),
+        )
+
+    def fit_many(self, candidate_columns):
+        """Solve many one- or two-column candidates with stacked linear algebra
+        and keep the results, so later calls to :any:`fit` for these
+        candidates are lookups.
+
+        Candidates are grouped by number of columns and each group is solved
+        with a single batched pseudo-inverse, which gives the same results as
+        solving them one at a time. Nothing is precomputed if the shared table
+        does not apply (partially missing rows) or there are no observations.
+
+        Parameters
+        ----------
+        candidate_columns : :any:`list` of :any:`list` of :any:`str`
+            Regressor columns of each candidate.
+        """
+        if not self.shared_rows or self.nobs == 0:
+            return
+        cp = self.cross_products
+        syy = cp[0, 0]
+
+        for n_columns in (1, 2):
+            group = [
+                tuple(columns)
+                for columns in candidate_columns
+                if len(columns) == n_columns and tuple(columns) not in self._fits
+            ]
+            if len(group) == 0:
+                continue
+            ix = np.array(
+                [[self.column_index[col] + 1 for col in columns] for columns in group]
+            )
+            sxx = cp[ix[:, :, None], ix[:, None, :]]
+            sxy = cp[ix, 0]
+            x_means = self.means[ix]
+
+            sxx_inv = np.linalg.pinv(sxx)
+            beta = np.einsum("cij,cj->ci", sxx_inv, sxy)
+            intercept = self.means[0] - (beta * x_means).sum(axis=1)
+
+            rank = np.linalg.matrix_rank(sxx) + 1
+            df_resid = self.nobs - rank
+            ssr = np.maximum(
+                syy
+                - 2 * (beta * sxy).sum(axis=1)
+                + np.einsum("ci,cij,cj->c", beta, sxx, beta),
+                0.0,
+            )
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = ssr / df_resid
+                var_beta = np.diagonal(sxx_inv, axis1=1, axis2=2) * scale[:, None]
+                var_intercept = (
+                    1.0 / self.sum_weights
+                    + np.einsum("ci,cij,cj->c", x_means, sxx_inv, x_means)
+                ) * scale
+                params = np.column_stack([intercept, beta])
+                bse = np.sqrt(np.column_stack([var_intercept, var_beta]))
+                pvalues = special.stdtr(df_resid[:, None], -np.abs(params / bse)) * 2
+                r_squared = 1 - ssr / syy
+                r_squared_adj = 1 - (self.nobs - 1) / df_resid * (1 - r_squared)
+
+            for columns, params_i, pvalues_i, r_squared_adj_i in zip(
+                group, params.tolist(), pvalues.tolist(), r_squared_adj.tolist()
+            ):
+                names = ["Intercept"] + list(columns)
+                self._fits[columns] = (
+                    dict(zip(names, params_i)),
+                    dict(zip(names, pvalues_i)),
+                    r_squared_adj_i,
+                )
+
+    def r_squared_adj(self, candidate_columns):
+        """Compute the adjusted r-squared of many candidates at once, without
+        parameter estimates or p-values.
+
+        Parameters
+        ----------
+        candidate_columns : :any:`list` of :any:`list` of :any:`str`
+            Regressor columns of each candidate (zero, one or two columns).
+
+        Returns
+        -------
+        r_squared_adj : :any:`numpy.ndarray`
+            Adjusted r-squared of each candidate. Values are NaN where they
+            can't be computed from the shared table, e.g., because of partially
+            missing rows, or where the regressors are linearly dependent, in
+            which case the fit uses fewer residual degrees of freedom.
+        """
+        r_squared_adj = np.full(len(candidate_columns), np.nan)
+        cp = self.cross_products
+        syy = cp[0, 0]
+
+        for n_columns in (0, 1, 2):
+            positions = [
+                i
+                for i, columns in enumerate(candidate_columns)
+                if len(columns) == n_columns
+            ]
+            if len(positions) == 0:
+                continue
+            if n_columns == 0:
+                # intercept only models are always reported with zero r-squared
+                r_squared_adj[positions] = 0
+                continue
+            if not self.shared_rows:
+                continue
+
+            ix = np.array(
+                [
+                    [self.column_index[col] + 1 for col in candidate_columns[i]]
+                    for i in positions
+                ]
+            )
+            # the closed forms below assume full rank, as does df_resid.
+            rank = np.linalg.matrix_rank(cp[ix[:, :, None], ix[:, None, :]])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if n_columns == 1:
+                    a = ix[:, 0]
+                    explained = cp[a, 0] ** 2 / cp[a, a]
+                else:
+                    a, b = ix[:, 0], ix[:, 1]
+                    s11, s22, s12 = cp[a, a], cp[b, b], cp[a, b]
+                    s1y, s2y = cp[a, 0], cp[b, 0]
+                    explained = (
+                        s22 * s1y**2 - 2 * s12 * s1y * s2y + s11 * s2y**2
+                    ) / (s11 * s22 - s12**2)
+                r_squared = explained / syy
+                df_resid = self.nobs - n_columns - 1
+                values = 1 - (self.nobs - 1) / df_resid * (1 - r_squared)
+            values[~np.isfinite(values) | (rank < n_columns)] = np.nan
+            r_squared_adj[positions] = values
+
+        return r_squared_adj
+
+
+def _get_formula_columns(formula):
+    return [
+        column.strip()
+        for column in formula.split("~", 1)[1].split("+")
+        if column.strip() != "1"
+    ]
+
+
+def _fit_candidate_wls(
+    data, formula, weights_col, fit_engine, sufficient_statistics=None
+):
+    """Fit a single candidate model with the requested engine.
+
+    Returns a tuple of ``(params, pvalues, r_squared_adj)``. The statsmodels
+    model and result objects, if any, are not kept. Raises if the fit could
+    not be attempted.
+    """
+    if fit_engine == "numpy":
+        columns = _get_formula_columns(formula)
+        if sufficient_statistics is None:
+            sufficient_statistics = _WLSSufficientStatistics(
+                data, weights_col, columns=columns
+            )
+        params, pvalues, r_squared_adj = sufficient_statistics.fit(columns)
+        return params, pvalues, r_squared_adj
+    elif fit_engine == "statsmodels":
+        if weights_col is None:
+            weights = 1
+        else:
+            weights = data[weights_col]
+        result = smf.wls(formula=formula, data=data, weights=weights).fit()
+        return (
+            result.params.to_dict(),
+            result.pvalues.to_dict(),
+            result.rsquared_adj,
+        )
+    else:
+        raise ValueError("fit_engine not supported: {}".format(fit_engine))
+
+
+def get_intercept_only_candidate_models(
+    data, weights_col, fit_engine="statsmodels", sufficient_statistics=None
+):
     """Return a list of a single candidate intercept-only model.
 
     Parameters
@@ -1027,6 +1572,13 @@ def get_intercept_only_candidate_models(data, weights_col):
         :any:`eemeter.create_caltrack_billing_design_matrix` methods.
     weights_col : :any:`str` or None
         The name of the column (if any) in ``data`` to use as weights.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
 
     Returns
     -------
@@ -1036,20 +1588,15 @@ def get_intercept_only_candidate_models(data, weights_col):
     model_type = "intercept_only"
     formula = "meter_value ~ 1"
 
-    if weights_col is None:
-        weights = 1
-    else:
-        weights = data[weights_col]
-
     try:
-        model = smf.wls(formula=formula, data=data, weights=weights)
+        params, pvalues, r_squared_adj = _fit_candidate_wls(
+            data, formula, weights_col, fit_engine, sufficient_statistics
+        )
     except Exception as e:
         return [get_fit_failed_candidate_model(model_type, formula)]
 
-    result = model.fit()
-
     # CalTrack 3.3.1.3
-    model_params = {"intercept": result.params["Intercept"]}
+    model_params = {"intercept": params["Intercept"]}
 
     model_warnings = []
 
@@ -1071,9 +1618,10 @@ def get_intercept_only_candidate_models(data, weights_col):
             status=status,
             warnings=model_warnings,
             model_params=model_params,
-            model=model,
-            result=result,
             r_squared_adj=0,
+            p_values=pvalues,
+            fit_data=data,
+            weights_col=weights_col,
         )
     ]
 
@@ -1085,6 +1633,9 @@ def get_single_cdd_only_candidate_model(
     beta_cdd_maximum_p_value,
     weights_col,
     balance_point,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
 ):
     """Return a single candidate cdd-only model for a particular balance
     point.
@@ -1107,6 +1658,16 @@ def get_single_cdd_only_candidate_model(
         The name of the column (if any) in ``data`` to use as weights.
     balance_point : :any:`float`
         The cooling balance point for this model.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
 
     Returns
     -------
@@ -1117,28 +1678,18 @@ def get_single_cdd_only_candidate_model(
     cdd_column = "cdd_%s" % balance_point
     formula = "meter_value ~ %s" % cdd_column
 
-    if weights_col is None:
-        weights = 1
-    else:
-        weights = data[weights_col]
-
-    period_days = weights
-
-    degree_day_warnings = []
-    degree_day_warnings.extend(
-        get_total_degree_day_too_low_warning(
-            model_type,
-            balance_point,
-            "cdd",
-            data[cdd_column],
-            period_days,
-            minimum_total_cdd,
-        )
-    )
-    degree_day_warnings.extend(
-        get_too_few_non_zero_degree_day_warning(
-            model_type, balance_point, "cdd", data[cdd_column], minimum_non_zero_cdd
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(
+            data, weights_col, columns=[cdd_column]
         )
+
+    degree_day_warnings = _get_degree_day_warnings(
+        model_type,
+        balance_point,
+        "cdd",
+        degree_day_statistics[cdd_column],
+        minimum_total_cdd,
+        minimum_non_zero_cdd,
     )
 
     if len(degree_day_warnings) > 0:
@@ -1150,18 +1701,18 @@ def get_single_cdd_only_candidate_model(
         )
 
     try:
-        model = smf.wls(formula=formula, data=data, weights=weights)
+        params, pvalues, r_squared_adj = _fit_candidate_wls(
+            data, formula, weights_col, fit_engine, sufficient_statistics
+        )
     except Exception as e:
         return get_fit_failed_candidate_model(model_type, formula)
 
-    result = model.fit()
-    r_squared_adj = result.rsquared_adj
-    beta_cdd_p_value = result.pvalues[cdd_column]
+    beta_cdd_p_value = pvalues[cdd_column]
 
     # CalTrack 3.3.1.3
     model_params = {
-        "intercept": result.params["Intercept"],
-        "beta_cdd": result.params[cdd_column],
+        "intercept": params["Intercept"],
+        "beta_cdd": params[cdd_column],
         "cooling_balance_point": balance_point,
     }
 
@@ -1193,14 +1744,24 @@ def get_single_cdd_only_candidate_model(
         status=status,
         warnings=model_warnings,
         model_params=model_params,
-        model=model,
-        result=result,
         r_squared_adj=r_squared_adj,
+        p_values=pvalues,
+        fit_data=data,
+        weights_col=weights_col,
     )
 
 
 def get_cdd_only_candidate_models(
-    data, minimum_non_zero_cdd, minimum_total_cdd, beta_cdd_maximum_p_value, weights_col
+    data,
+    minimum_non_zero_cdd,
+    minimum_total_cdd,
+    beta_cdd_maximum_p_value,
+    weights_col,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
+    n_jobs=None,
+    executor=None,
 ):
     """Return a list of all possible candidate cdd-only models.
 
@@ -1221,24 +1782,55 @@ def get_cdd_only_candidate_models(
         The maximum allowable p-value of the beta cdd parameter.
     weights_col : :any:`str` or None
         The name of the column (if any) in ``data`` to use as weights.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
+    n_jobs : :any:`int`, optional
+        Number of threads used to fit candidates concurrently. ``None`` or
+        ``1`` fits candidates sequentially; ``-1`` uses the
+        default number of threads of :any:`concurrent.futures.ThreadPoolExecutor`.
+        Ignored if ``executor`` is given.
+    executor : :any:`concurrent.futures.Executor`, optional
+        An existing executor on which to fit candidates concurrently.
 
     Returns
     -------
     candidate_models : :any:`list` of :any:`CalTRACKUsagePerDayCandidateModel`
         A list of cdd-only candidate models, with any associated warnings.
     """
+    _validate_n_jobs(n_jobs)
+
     balance_points = [int(col[4:]) for col in data.columns if col.startswith("cdd")]
-    candidate_models = [
-        get_single_cdd_only_candidate_model(
+    if fit_engine == "numpy" and sufficient_statistics is None:
+        sufficient_statistics = _WLSSufficientStatistics(data, weights_col)
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(data, weights_col)
+
+    candidate_fitters = [
+        partial(
+            get_single_cdd_only_candidate_model,
             data,
             minimum_non_zero_cdd,
             minimum_total_cdd,
             beta_cdd_maximum_p_value,
             weights_col,
             balance_point,
+            fit_engine=fit_engine,
+            sufficient_statistics=sufficient_statistics,
+            degree_day_statistics=degree_day_statistics,
         )
         for balance_point in balance_points
     ]
+    candidate_models = _evaluate_candidate_fitters(
+        candidate_fitters, n_jobs=n_jobs, executor=executor
+    )
     return candidate_models
 
 
@@ -1249,6 +1841,9 @@ def get_single_hdd_only_candidate_model(
     beta_hdd_maximum_p_value,
     weights_col,
     balance_point,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
 ):
     """Return a single candidate hdd-only model for a particular balance
     point.
@@ -1271,6 +1866,16 @@ def get_single_hdd_only_candidate_model(
         The name of the column (if any) in ``data`` to use as weights.
     balance_point : :any:`float`
         The heating balance point for this model.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
 
     Returns
     -------
@@ -1281,28 +1886,18 @@ def get_single_hdd_only_candidate_model(
     hdd_column = "hdd_%s" % balance_point
     formula = "meter_value ~ %s" % hdd_column
 
-    if weights_col is None:
-        weights = 1
-    else:
-        weights = data[weights_col]
-
-    period_days = weights
-
-    degree_day_warnings = []
-    degree_day_warnings.extend(
-        get_total_degree_day_too_low_warning(
-            model_type,
-            balance_point,
-            "hdd",
-            data[hdd_column],
-            period_days,
-            minimum_total_hdd,
-        )
-    )
-    degree_day_warnings.extend(
-        get_too_few_non_zero_degree_day_warning(
-            model_type, balance_point, "hdd", data[hdd_column], minimum_non_zero_hdd
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(
+            data, weights_col, columns=[hdd_column]
         )
+
+    degree_day_warnings = _get_degree_day_warnings(
+        model_type,
+        balance_point,
+        "hdd",
+        degree_day_statistics[hdd_column],
+        minimum_total_hdd,
+        minimum_non_zero_hdd,
     )
 
     if len(degree_day_warnings) > 0:
@@ -1314,18 +1909,18 @@ def get_single_hdd_only_candidate_model(
         )
 
     try:
-        model = smf.wls(formula=formula, data=data, weights=weights)
+        params, pvalues, r_squared_adj = _fit_candidate_wls(
+            data, formula, weights_col, fit_engine, sufficient_statistics
+        )
     except Exception as e:
         return get_fit_failed_candidate_model(model_type, formula)
 
-    result = model.fit()
-    r_squared_adj = result.rsquared_adj
-    beta_hdd_p_value = result.pvalues[hdd_column]
+    beta_hdd_p_value = pvalues[hdd_column]
 
     # CalTrack 3.3.1.3
     model_params = {
-        "intercept": result.params["Intercept"],
-        "beta_hdd": result.params[hdd_column],
+        "intercept": params["Intercept"],
+        "beta_hdd": params[hdd_column],
         "heating_balance_point": balance_point,
     }
 
@@ -1357,14 +1952,24 @@ def get_single_hdd_only_candidate_model(
         status=status,
         warnings=model_warnings,
         model_params=model_params,
-        model=model,
-        result=result,
         r_squared_adj=r_squared_adj,
+        p_values=pvalues,
+        fit_data=data,
+        weights_col=weights_col,
     )
 
 
 def get_hdd_only_candidate_models(
-    data, minimum_non_zero_hdd, minimum_total_hdd, beta_hdd_maximum_p_value, weights_col
+    data,
+    minimum_non_zero_hdd,
+    minimum_total_hdd,
+    beta_hdd_maximum_p_value,
+    weights_col,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
+    n_jobs=None,
+    executor=None,
 ):
     """
     Parameters
@@ -1384,26 +1989,56 @@ def get_hdd_only_candidate_models(
         The maximum allowable p-value of the beta hdd parameter.
     weights_col : :any:`str` or None
         The name of the column (if any) in ``data`` to use as weights.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
+    n_jobs : :any:`int`, optional
+        Number of threads used to fit candidates concurrently. ``None`` or
+        ``1`` fits candidates sequentially; ``-1`` uses the
+        default number of threads of :any:`concurrent.futures.ThreadPoolExecutor`.
+        Ignored if ``executor`` is given.
+    executor : :any:`concurrent.futures.Executor`, optional
+        An existing executor on which to fit candidates concurrently.
 
     Returns
     -------
     candidate_models : :any:`list` of :any:`CalTRACKUsagePerDayCandidateModel`
         A list of hdd-only candidate models, with any associated warnings.
     """
+    _validate_n_jobs(n_jobs)
 
     balance_points = [int(col[4:]) for col in data.columns if col.startswith("hdd")]
 
-    candidate_models = [
-        get_single_hdd_only_candidate_model(
+    if fit_engine == "numpy" and sufficient_statistics is None:
+        sufficient_statistics = _WLSSufficientStatistics(data, weights_col)
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(data, weights_col)
+
+    candidate_fitters = [
+        partial(
+            get_single_hdd_only_candidate_model,
             data,
             minimum_non_zero_hdd,
             minimum_total_hdd,
             beta_hdd_maximum_p_value,
             weights_col,
             balance_point,
+            fit_engine=fit_engine,
+            sufficient_statistics=sufficient_statistics,
+            degree_day_statistics=degree_day_statistics,
         )
         for balance_point in balance_points
     ]
+    candidate_models = _evaluate_candidate_fitters(
+        candidate_fitters, n_jobs=n_jobs, executor=executor
+    )
     return candidate_models
 
 
@@ -1418,6 +2053,9 @@ def get_single_cdd_hdd_candidate_model(
     weights_col,
     cooling_balance_point,
     heating_balance_point,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
 ):
     """Return and fit a single candidate cdd_hdd model for a particular selection
     of cooling balance point and heating balance point
@@ -1448,6 +2086,16 @@ def get_single_cdd_hdd_candidate_model(
         The cooling balance point for this model.
     heating_balance_point : :any:`float`
         The heating balance point for this model.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
 
     Returns
     -------
@@ -1460,51 +2108,25 @@ def get_single_cdd_hdd_candidate_model(
     formula = "meter_value ~ %s + %s" % (cdd_column, hdd_column)
     n_days_column = None
 
-    if weights_col is None:
-        weights = 1
-    else:
-        weights = data[weights_col]
-
-    period_days = weights
-
-    degree_day_warnings = []
-    degree_day_warnings.extend(
-        get_total_degree_day_too_low_warning(
-            model_type,
-            cooling_balance_point,
-            "cdd",
-            data[cdd_column],
-            period_days,
-            minimum_total_cdd,
-        )
-    )
-    degree_day_warnings.extend(
-        get_too_few_non_zero_degree_day_warning(
-            model_type,
-            cooling_balance_point,
-            "cdd",
-            data[cdd_column],
-            minimum_non_zero_cdd,
-        )
-    )
-    degree_day_warnings.extend(
-        get_total_degree_day_too_low_warning(
-            model_type,
-            heating_balance_point,
-            "hdd",
-            data[hdd_column],
-            period_days,
-            minimum_total_hdd,
-        )
-    )
-    degree_day_warnings.extend(
-        get_too_few_non_zero_degree_day_warning(
-            model_type,
-            heating_balance_point,
-            "hdd",
-            data[hdd_column],
-            minimum_non_zero_hdd,
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(
+            data, weights_col, columns=[cdd_column, hdd_column]
         )
+
+    degree_day_warnings = _get_degree_day_warnings(
+        model_type,
+        cooling_balance_point,
+        "cdd",
+        degree_day_statistics[cdd_column],
+        minimum_total_cdd,
+        minimum_non_zero_cdd,
+    ) + _get_degree_day_warnings(
+        model_type,
+        heating_balance_point,
+        "hdd",
+        degree_day_statistics[hdd_column],
+        minimum_total_hdd,
+        minimum_non_zero_hdd,
     )
 
     if len(degree_day_warnings) > 0:
@@ -1513,20 +2135,20 @@ def get_single_cdd_hdd_candidate_model(
         )
 
     try:
-        model = smf.wls(formula=formula, data=data, weights=weights)
+        params, pvalues, r_squared_adj = _fit_candidate_wls(
+            data, formula, weights_col, fit_engine, sufficient_statistics
+        )
     except Exception as e:
         return get_fit_failed_candidate_model(model_type, formula)
 
-    result = model.fit()
-    r_squared_adj = result.rsquared_adj
-    beta_cdd_p_value = result.pvalues[cdd_column]
-    beta_hdd_p_value = result.pvalues[hdd_column]
+    beta_cdd_p_value = pvalues[cdd_column]
+    beta_hdd_p_value = pvalues[hdd_column]
 
     # CalTrack 3.3.1.3
     model_params = {
-        "intercept": result.params["Intercept"],
-        "beta_cdd": result.params[cdd_column],
-        "beta_hdd": result.params[hdd_column],
+        "intercept": params["Intercept"],
+        "beta_cdd": params[cdd_column],
+        "beta_hdd": params[hdd_column],
         "cooling_balance_point": cooling_balance_point,
         "heating_balance_point": heating_balance_point,
     }
@@ -1568,9 +2190,10 @@ def get_single_cdd_hdd_candidate_model(
         status=status,
         warnings=model_warnings,
         model_params=model_params,
-        model=model,
-        result=result,
         r_squared_adj=r_squared_adj,
+        p_values=pvalues,
+        fit_data=data,
+        weights_col=weights_col,
     )
 
 
@@ -1583,6 +2206,11 @@ def get_cdd_hdd_candidate_models(
     beta_cdd_maximum_p_value,
     beta_hdd_maximum_p_value,
     weights_col,
+    fit_engine="statsmodels",
+    sufficient_statistics=None,
+    degree_day_statistics=None,
+    n_jobs=None,
+    executor=None,
 ):
     """Return a list of candidate cdd_hdd models for a particular selection
     of cooling balance point and heating balance point
@@ -1610,12 +2238,30 @@ def get_cdd_hdd_candidate_models(
         The maximum allowable p-value of the beta hdd parameter.
     weights_col : :any:`str` or None
         The name of the column (if any) in ``data`` to use as weights.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit the weighted least squares model. ``'numpy'``
+        solves the normal equations directly.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``. Computed from ``data`` if not
+        given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
+    n_jobs : :any:`int`, optional
+        Number of threads used to fit candidates concurrently. ``None`` or
+        ``1`` fits candidates sequentially; ``-1`` uses the
+        default number of threads of :any:`concurrent.futures.ThreadPoolExecutor`.
+        Ignored if ``executor`` is given.
+    executor : :any:`concurrent.futures.Executor`, optional
+        An existing executor on which to fit candidates concurrently.
 
     Returns
     -------
     candidate_models : :any:`list` of :any:`CalTRACKUsagePerDayCandidateModel`
         A list of cdd_hdd candidate models, with any associated warnings.
     """
+    _validate_n_jobs(n_jobs)
 
     cooling_balance_points = [
         int(col[4:]) for col in data.columns if col.startswith("cdd")
@@ -1624,10 +2270,18 @@ def get_cdd_hdd_candidate_models(
         int(col[4:]) for col in data.columns if col.startswith("hdd")
     ]
 
+    if fit_engine == "numpy" and sufficient_statistics is None:
+        sufficient_statistics = _WLSSufficientStatistics(data, weights_col)
+    if degree_day_statistics is None:
+        degree_day_statistics = _get_degree_day_statistics(data, weights_col)
+
     # CalTrack 3.2.2.1
-    candidate_models = [
-        get_single_cdd_hdd_candidate_model(
+    candidate_fitters = [
+        fitter
+        for _, _, fitter in _get_cdd_hdd_candidate_fitters(
             data,
+            cooling_balance_points,
+            heating_balance_points,
             minimum_non_zero_cdd,
             minimum_non_zero_hdd,
             minimum_total_cdd,
@@ -1635,16 +2289,398 @@ def get_cdd_hdd_candidate_models(
             beta_cdd_maximum_p_value,
             beta_hdd_maximum_p_value,
             weights_col,
-            cooling_balance_point,
-            heating_balance_point,
+            fit_engine,
+            sufficient_statistics,
+            degree_day_statistics,
         )
-        for cooling_balance_point in cooling_balance_points
-        for heating_balance_point in heating_balance_points
-        if heating_balance_point <= cooling_balance_point
     ]
+    candidate_models = _evaluate_candidate_fitters(
+        candidate_fitters, n_jobs=n_jobs, executor=executor
+    )
     return candidate_models
 
 
+def _get_cdd_hdd_candidate_fitters(
+    data,
+    cooling_balance_points,
+    heating_balance_points,
+    minimum_non_zero_cdd,
+    minimum_non_zero_hdd,
+    minimum_total_cdd,
+    minimum_total_hdd,
+    beta_cdd_maximum_p_value,
+    beta_hdd_maximum_p_value,
+    weights_col,
+    fit_engine,
+    sufficient_statistics,
+    degree_day_statistics,
+):
+    """Return a list of ``(cooling_balance_point, heating_balance_point,
+    fit_candidate)`` tuples, one for each cdd_hdd candidate model. The degree
+    day sufficiency of each balance point is checked once, and candidates with
+    an insufficient balance point are NOT ATTEMPTED without further checks.
+    """
+    model_type = "cdd_hdd"
+    cdd_warnings = {
+        balance_point: _get_degree_day_warnings(
+            model_type,
+            balance_point,
+            "cdd",
+            degree_day_statistics["cdd_%s" % balance_point],
+            minimum_total_cdd,
+            minimum_non_zero_cdd,
+        )
+        for balance_point in cooling_balance_points
+    }
+    hdd_warnings = {
+        balance_point: _get_degree_day_warnings(
+            model_type,
+            balance_point,
+            "hdd",
+            degree_day_statistics["hdd_%s" % balance_point],
+            minimum_total_hdd,
+            minimum_non_zero_hdd,
+        )
+        for balance_point in heating_balance_points
+    }
+
+    candidate_fitters = []
+    for cooling_balance_point in cooling_balance_points:
+        for heating_balance_point in heating_balance_points:
+            if heating_balance_point > cooling_balance_point:
+                continue
+            degree_day_warnings = (
+                cdd_warnings[cooling_balance_point]
+                + hdd_warnings[heating_balance_point]
+            )
+            if len(degree_day_warnings) > 0:
+                formula = "meter_value ~ cdd_%s + hdd_%s" % (
+                    cooling_balance_point,
+                    heating_balance_point,
+                )
+                fitter = partial(
+                    CalTRACKUsagePerDayCandidateModel,
+                    model_type,
+                    formula,
+                    "NOT ATTEMPTED",
+                    warnings=degree_day_warnings,
+                )
+            else:
+                fitter = partial(
+                    get_single_cdd_hdd_candidate_model,
+                    data,
+                    minimum_non_zero_cdd,
+                    minimum_non_zero_hdd,
+                    minimum_total_cdd,
+                    minimum_total_hdd,
+                    beta_cdd_maximum_p_value,
+                    beta_hdd_maximum_p_value,
+                    weights_col,
+                    cooling_balance_point,
+                    heating_balance_point,
+                    fit_engine=fit_engine,
+                    sufficient_statistics=sufficient_statistics,
+                    degree_day_statistics=degree_day_statistics,
+                )
+            candidate_fitters.append(
+                (cooling_balance_point, heating_balance_point, fitter)
+            )
+    return candidate_fitters
+
+
+def _validate_n_jobs(n_jobs):
+    if n_jobs is not None and (
+        not isinstance(n_jobs, (int, np.integer)) or not (n_jobs == -1 or n_jobs >= 1)
+    ):
+        raise ValueError("n_jobs must be None, -1 or at least 1: {}".format(n_jobs))
+
+
+def _call(fitter):
+    # module-level so that process pool executors can pickle it
+    return fitter()
+
+
+def _evaluate_candidate_fitters(fitters, n_jobs=None, executor=None):
+    """Call each candidate fitter and return the candidates in the order of
+    ``fitters``, optionally on a thread pool. The heavy parts of fitting
+    (BLAS and LAPACK calls) release the GIL.
+    """
+    if executor is not None:
+        return list(executor.map(_call, fitters))
+    if n_jobs is None or n_jobs == 1 or len(fitters) < 2:
+        return [fitter() for fitter in fitters]
+    if n_jobs == -1:
+        n_jobs = None  # as many as ThreadPoolExecutor allows
+    with ThreadPoolExecutor(max_workers=n_jobs) as thread_pool:
+        return list(thread_pool.map(_call, fitters))
+
+
+def _get_candidate_fitters(
+    data,
+    fit_intercept_only,
+    fit_hdd_only,
+    fit_cdd_only,
+    fit_cdd_hdd,
+    minimum_non_zero_cdd,
+    minimum_non_zero_hdd,
+    minimum_total_cdd,
+    minimum_total_hdd,
+    beta_cdd_maximum_p_value,
+    beta_hdd_maximum_p_value,
+    weights_col,
+    fit_engine,
+    sufficient_statistics,
+    degree_day_statistics,
+):
+    """Return a list of ``(columns, fit_candidate)`` tuples, one for each
+    candidate model, in the order used for model selection. Calling
+    ``fit_candidate()`` returns the fitted
+    :any:`eemeter.CalTRACKUsagePerDayCandidateModel`.
+    """
+    cooling_balance_points = [
+        int(col[4:]) for col in data.columns if col.startswith("cdd")
+    ]
+    heating_balance_points = [
+        int(col[4:]) for col in data.columns if col.startswith("hdd")
+    ]
+    fit_kwargs = {
+        "fit_engine": fit_engine,
+        "sufficient_statistics": sufficient_statistics,
+    }
+    degree_day_fit_kwargs = dict(
+        fit_kwargs, degree_day_statistics=degree_day_statistics
+    )
+
+    candidate_fitters = []
+
+    if fit_intercept_only:
+        candidate_fitters.append(
+            (
+                [],
+                lambda: get_intercept_only_candidate_models(
+                    data, weights_col, **fit_kwargs
+                )[0],
+            )
+        )
+
+    if fit_hdd_only:
+        candidate_fitters.extend(
+            (
+                ["hdd_%s" % balance_point],
+                partial(
+                    get_single_hdd_only_candidate_model,
+                    data,
+                    minimum_non_zero_hdd,
+                    minimum_total_hdd,
+                    beta_hdd_maximum_p_value,
+                    weights_col,
+                    balance_point,
+                    **degree_day_fit_kwargs
+                ),
+            )
+            for balance_point in heating_balance_points
+        )
+
+    if fit_cdd_only:
+        candidate_fitters.extend(
+            (
+                ["cdd_%s" % balance_point],
+                partial(
+                    get_single_cdd_only_candidate_model,
+                    data,
+                    minimum_non_zero_cdd,
+                    minimum_total_cdd,
+                    beta_cdd_maximum_p_value,
+                    weights_col,
+                    balance_point,
+                    **degree_day_fit_kwargs
+                ),
+            )
+            for balance_point in cooling_balance_points
+        )
+
+    if fit_cdd_hdd:
+        # CalTrack 3.2.2.1
+        candidate_fitters.extend(
+            (
+                ["cdd_%s" % cooling_balance_point, "hdd_%s" % heating_balance_point],
+                fitter,
+            )
+            for (
+                cooling_balance_point,
+                heating_balance_point,
+                fitter,
+            ) in _get_cdd_hdd_candidate_fitters(
+                data,
+                cooling_balance_points,
+                heating_balance_points,
+                minimum_non_zero_cdd,
+                minimum_non_zero_hdd,
+                minimum_total_cdd,
+                minimum_total_hdd,
+                beta_cdd_maximum_p_value,
+                beta_hdd_maximum_p_value,
+                weights_col,
+                fit_engine,
+                sufficient_statistics,
+                degree_day_statistics,
+            )
+        )
+
+    return candidate_fitters
+
+
+def _bounded_candidate_search(candidate_fitters, sufficient_statistics):
+    """Fit candidates in order of decreasing attainable adjusted r-squared,
+    stopping once no remaining candidate can be selected by
+    :any:`eemeter.select_best_candidate`.
+
+    Returns the fitted candidates (in their original order) and a dict
+    describing the search.
+    """
+    bounds = sufficient_statistics.r_squared_adj(
+        [columns for columns, _ in candidate_fitters]
+    )
+    # NaN bounds can't be used to rule anything out.
+    bounds[np.isnan(bounds)] = np.inf
+
+    # ties keep original order, which is how select_best_candidate breaks ties.
+    order = np.argsort(-bounds, kind="stable")
+
+    best_r_squared_adj = -np.inf
+    fitted = {}
+    for i in order:
+        if bounds[i] <= best_r_squared_adj:
+            break
+        _, fit_candidate = candidate_fitters[i]
+        candidate = fit_candidate()
+        fitted[i] = candidate
+        if (
+            candidate.status == "QUALIFIED"
+            and candidate.r_squared_adj > best_r_squared_adj
+        ):
+            best_r_squared_adj = candidate.r_squared_adj
+
+    candidates = [fitted[i] for i in sorted(fitted)]
+    search_metadata = {
+        "method": "bounded",
+        "n_candidates": len(candidate_fitters),
+        "n_fitted": len(candidates),
+        "n_skipped": len(candidate_fitters) - len(candidates),
+    }
+    return candidates, search_metadata
+
+
+def _coarse_to_fine_candidate_search(
+    candidate_fitters,
+    coarse_balance_point_step,
+    n_refined_candidates,
+    n_jobs=None,
+    executor=None,
+):
+    """Fit candidates on a coarse balance point grid, then fit the remaining
+    candidates whose balance points are fewer than ``coarse_balance_point_step``
+    grid positions away from those of one of the ``n_refined_candidates`` best
+    qualified coarse candidates of the same model type. Each model type is
+    refined around its own best coarse candidates. If no coarse candidate
+    qualifies, all remaining candidates are fitted.
+
+    Returns the fitted candidates (in their original order) and a dict
+    describing the search, including which balance points were evaluated.
+    """
+
+    def _balance_points(columns):
+        return {col[:3]: int(col[4:]) for col in columns}
+
+    balance_points = [_balance_points(columns) for columns, _ in candidate_fitters]
+
+    grid = {
+        degree_day_type: sorted(
+            set(
+                bps[degree_day_type] for bps in balance_points if degree_day_type in bps
+            )
+        )
+        for degree_day_type in ("cdd", "hdd")
+    }
+    coarse_grid = {
+        degree_day_type: set(points[::coarse_balance_point_step])
+        for degree_day_type, points in grid.items()
+    }
+
+    def _is_coarse(bps):
+        return all(bp in coarse_grid[dd_type] for dd_type, bp in bps.items())
+
+    def _fit(positions):
+        candidates = _evaluate_candidate_fitters(
+            [candidate_fitters[i][1] for i in positions],
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+        fitted.update(zip(positions, candidates))
+
+    fitted = {}
+    _fit([i for i, bps in enumerate(balance_points) if _is_coarse(bps)])
+
+    qualified_by_model_type = {}
+    for i in sorted(
+        (
+            i
+            for i, candidate in fitted.items()
+            if candidate.status == "QUALIFIED" and not np.isnan(candidate.r_squared_adj)
+        ),
+        key=lambda i: -fitted[i].r_squared_adj,
+    ):
+        qualified_by_model_type.setdefault(fitted[i].model_type, []).append(i)
+    qualified = [
+        i
+        for positions in qualified_by_model_type.values()
+        for i in positions[:n_refined_candidates]
+    ]
+
+    grid_position = {
+        degree_day_type: {bp: i for i, bp in enumerate(points)}
+        for degree_day_type, points in grid.items()
+    }
+
+    def _is_near(bps, best_bps):
+        return set(bps) == set(best_bps) and all(
+            abs(grid_position[dd_type][bp] - grid_position[dd_type][best_bps[dd_type]])
+            < coarse_balance_point_step
+            for dd_type, bp in bps.items()
+        )
+
+    _fit(
+        [
+            i
+            for i, bps in enumerate(balance_points)
+            if i not in fitted
+            and (
+                len(qualified) == 0
+                or any(_is_near(bps, balance_points[j]) for j in qualified)
+            )
+        ]
+    )
+
+    candidates = [fitted[i] for i in sorted(fitted)]
+    search_metadata = {
+        "method": "coarse_to_fine",
+        "coarse_balance_point_step": coarse_balance_point_step,
+        "n_refined_candidates": n_refined_candidates,
+        "n_candidates": len(candidate_fitters),
+        "n_fitted": len(candidates),
+        "n_skipped": len(candidate_fitters) - len(candidates),
+        "coarse_cooling_balance_points": sorted(coarse_grid["cdd"]),
+        "coarse_heating_balance_points": sorted(coarse_grid["hdd"]),
+        "evaluated_cooling_balance_points": sorted(
+            set(balance_points[i]["cdd"] for i in fitted if "cdd" in balance_points[i])
+        ),
+        "evaluated_heating_balance_points": sorted(
+            set(balance_points[i]["hdd"] for i in fitted if "hdd" in balance_points[i])
+        ),
+    }
+    return candidates, search_metadata
+
+
 def select_best_candidate(candidate_models):
     """Select and return the best candidate model based on r-squared and
     qualification.
@@ -1706,6 +2742,14 @@ def fit_caltrack_usage_per_day_model(
     fit_cdd_only=True,
     fit_hdd_only=True,
     fit_cdd_hdd=True,
+    fit_engine="statsmodels",
+    candidate_search="exhaustive",
+    coarse_balance_point_step=3,
+    n_refined_candidates=3,
+    sufficient_statistics=None,
+    degree_day_statistics=None,
+    n_jobs=None,
+    executor=None,
 ):
     """CalTRACK daily and billing methods using a usage-per-day modeling
     strategy.
@@ -1754,6 +2798,52 @@ def fit_caltrack_usage_per_day_model(
     fit_cdd_hdd : :any:`bool`, optional
         If True, fit and consider cdd_hdd model candidates. Ignored if
         ``fit_cdd=False``.
+    fit_engine : :any:`str`, ``'statsmodels'`` or ``'numpy'``, optional
+        The engine used to fit candidate models. ``'numpy'`` computes
+        parameters, p-values and adjusted r-squared for each candidate
+        directly from the weighted normal equations, which is much faster
+        than building a statsmodels model per candidate and yields the same
+        candidate statuses and parameters.
+    candidate_search : :any:`str`, ``'exhaustive'``, ``'bounded'`` or ``'coarse_to_fine'``, optional
+        If ``'exhaustive'``, fit every candidate model. If ``'bounded'``,
+        candidates are fitted in order of decreasing adjusted r-squared as
+        computed from shared weighted cross-products, and the search stops once
+        no remaining candidate can beat the best qualified candidate. Skipped
+        candidates are not included in ``candidates``; counts are reported in
+        ``metadata['candidate_search']``. The selected model is the same.
+        If ``'coarse_to_fine'``, candidates are first fitted using every
+        ``coarse_balance_point_step``-th balance point, then refined around the
+        ``n_refined_candidates`` best qualified coarse candidates of each model
+        type. The
+        evaluated balance points are reported in ``metadata['candidate_search']``.
+        This is much faster, but unlike the other options, it is not guaranteed
+        to select the same model.
+    coarse_balance_point_step : :any:`int`, optional
+        Step (in balance point columns) of the coarse grid used if
+        ``candidate_search='coarse_to_fine'``. Candidates fewer than this many
+        balance point columns away from a refined candidate are also fitted.
+    n_refined_candidates : :any:`int`, optional
+        Number of best qualified coarse candidates of each model type to
+        refine around if ``candidate_search='coarse_to_fine'``.
+    sufficient_statistics : :any:`object`, optional
+        Precomputed weighted cross-products of ``data`` shared between
+        candidates when ``fit_engine='numpy'``, as computed for many meters at
+        once by :any:`eemeter.fit_caltrack_usage_per_day_models`. Computed from
+        ``data`` if not given.
+    degree_day_statistics : :any:`dict`, optional
+        Precomputed degree day totals and non-zero counts for the degree day
+        sufficiency checks, keyed by column. Computed from ``data`` if not given.
+    n_jobs : :any:`int`, optional
+        Number of threads used to fit candidates concurrently. ``None`` or
+        ``1`` fits candidates sequentially; ``-1`` uses the
+        default number of threads of :any:`concurrent.futures.ThreadPoolExecutor`.
+        Ignored if ``executor`` is given. Candidates are always returned in
+        the same order. Has no effect if ``candidate_search='bounded'``,
+        which fits candidates one at a time.
+    executor : :any:`concurrent.futures.Executor`, optional
+        An existing executor on which to fit candidates concurrently, e.g., a
+        :any:`concurrent.futures.ThreadPoolExecutor` shared between calls or a
+        :any:`concurrent.futures.ProcessPoolExecutor`.
 
     Returns
     -------
@@ -1777,6 +2867,23 @@ def fit_caltrack_usage_per_day_model(
     else:
         interval = "daily"
 
+    if fit_engine not in ("statsmodels", "numpy"):
+        raise ValueError("fit_engine not supported: {}".format(fit_engine))
+
+    if candidate_search not in ("exhaustive", "bounded", "coarse_to_fine"):
+        raise ValueError("candidate_search not supported: {}".format(candidate_search))
+
+    for name, value in [
+        ("coarse_balance_point_step", coarse_balance_point_step),
+        ("n_refined_candidates", n_refined_candidates),
+    ]:
+        if not isinstance(value, (int, np.integer)) or value < 1:
+            raise ValueError(
+                "{} must be an integer of at least 1: {}".format(name, value)
+            )
+
+    _validate_n_jobs(n_jobs)
+
     # cleans data to fully NaN rows that have missing temp or meter data
     data = overwrite_partial_rows_with_nan(data)
 
@@ -1793,52 +2900,63 @@ def fit_caltrack_usage_per_day_model(
             ],
         )
 
-    # collect all candidate results, then validate all at once
-    # CalTrack 3.4.3.1
-    candidates = []
-
-    if fit_intercept_only:
-        candidates.extend(
-            get_intercept_only_candidate_models(data, weights_col=weights_col)
-        )
+    # weighted cross-products for all degree day columns, shared by all
+    # candidates fitted with the numpy engine.
+    if fit_engine != "numpy":
+        sufficient_statistics = None
+    elif sufficient_statistics is None:
+        sufficient_statistics = _WLSSufficientStatistics(data, weights_col)
+
+    if degree_day_statistics is None:
+        # degree day sufficiency checks for all balance points at once, so
+        # that NOT ATTEMPTED candidates are known before any fit.
+        degree_day_statistics = _get_degree_day_statistics(data, weights_col)
+    candidate_fitters = _get_candidate_fitters(
+        data,
+        fit_intercept_only=fit_intercept_only,
+        fit_hdd_only=fit_hdd_only,
+        fit_cdd_only=fit_cdd and fit_cdd_only,  # cdd models ignored for gas
+        fit_cdd_hdd=fit_cdd and fit_cdd_hdd,
+        minimum_non_zero_cdd=minimum_non_zero_cdd,
+        minimum_non_zero_hdd=minimum_non_zero_hdd,
+        minimum_total_cdd=minimum_total_cdd,
+        minimum_total_hdd=minimum_total_hdd,
+        beta_cdd_maximum_p_value=beta_cdd_maximum_p_value,
+        beta_hdd_maximum_p_value=beta_hdd_maximum_p_value,
+        weights_col=weights_col,
+        fit_engine=fit_engine,
+        sufficient_statistics=sufficient_statistics,
+        degree_day_statistics=degree_day_statistics,
+    )
 
-    if fit_hdd_only:
-        candidates.extend(
-            get_hdd_only_candidate_models(
-                data=data,
-                minimum_non_zero_hdd=minimum_non_zero_hdd,
-                minimum_total_hdd=minimum_total_hdd,
-                beta_hdd_maximum_p_value=beta_hdd_maximum_p_value,
-                weights_col=weights_col,
+    if candidate_search == "exhaustive":
+        # collect all candidate results, then validate all at once
+        # CalTrack 3.4.3.1
+        if sufficient_statistics is not None:
+            # solve all candidates with stacked linear algebra up front
+            sufficient_statistics.fit_many(
+                [columns for columns, _ in candidate_fitters]
             )
+        candidates = _evaluate_candidate_fitters(
+            [fit_candidate for _, fit_candidate in candidate_fitters],
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+        search_metadata = None
+    elif candidate_search == "bounded":
+        if sufficient_statistics is None:
+            sufficient_statistics = _WLSSufficientStatistics(data, weights_col)
+        candidates, search_metadata = _bounded_candidate_search(
+            candidate_fitters, sufficient_statistics
+        )
+    else:
+        candidates, search_metadata = _coarse_to_fine_candidate_search(
+            candidate_fitters,
+            coarse_balance_point_step,
+            n_refined_candidates,
+            n_jobs=n_jobs,
+            executor=executor,
         )
-
-    # cdd models ignored for gas
-    if fit_cdd:
-        if fit_cdd_only:
-            candidates.extend(
-                get_cdd_only_candidate_models(
-                    data=data,
-                    minimum_non_zero_cdd=minimum_non_zero_cdd,
-                    minimum_total_cdd=minimum_total_cdd,
-                    beta_cdd_maximum_p_value=beta_cdd_maximum_p_value,
-                    weights_col=weights_col,
-                )
-            )
-
-        if fit_cdd_hdd:
-            candidates.extend(
-                get_cdd_hdd_candidate_models(
-                    data=data,
-                    minimum_non_zero_cdd=minimum_non_zero_cdd,
-                    minimum_non_zero_hdd=minimum_non_zero_hdd,
-                    minimum_total_cdd=minimum_total_cdd,
-                    minimum_total_hdd=minimum_total_hdd,
-                    beta_cdd_maximum_p_value=beta_cdd_maximum_p_value,
-                    beta_hdd_maximum_p_value=beta_hdd_maximum_p_value,
-                    weights_col=weights_col,
-                )
-            )
 
     # find best candidate result
     best_candidate, candidate_warnings = select_best_candidate(candidates)
@@ -1868,9 +2986,16 @@ def fit_caltrack_usage_per_day_model(
             "minimum_total_hdd": minimum_total_hdd,
             "beta_cdd_maximum_p_value": beta_cdd_maximum_p_value,
             "beta_hdd_maximum_p_value": beta_hdd_maximum_p_value,
+            "fit_engine": fit_engine,
+            "candidate_search": candidate_search,
+            "coarse_balance_point_step": coarse_balance_point_step,
+            "n_refined_candidates": n_refined_candidates,
         },
     )
 
+    if search_metadata is not None:
+        model_result.metadata["candidate_search"] = search_metadata
+
     if best_candidate is not None:
         if best_candidate.model_type in ["cdd_hdd"]:
             num_parameters = 2
@@ -1907,6 +3032,340 @@ def fit_caltrack_usage_per_day_model(
     return model_result
 
 
+def fit_caltrack_usage_per_day_models(
+    data,
+    meter_id_col="meter_id",
+    index=None,
+    columns=None,
+    weights_col=None,
+    chunk_size=100,
+    **kwargs
+):
+    """Fit CalTRACK usage-per-day models for many meters at once.
+
+    The weighted cross-products used to fit every candidate are computed for
+    a whole chunk of meters with stacked linear algebra. Each meter is then
+    fitted separately by :any:`eemeter.fit_caltrack_usage_per_day_model` with
+    the numpy fit engine, which solves its candidates one by one from the
+    shared cross-products. Results are the same as fitting each meter
+    separately with ``fit_engine='numpy'``.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame` or :any:`numpy.ndarray`
+        Either a long-format DataFrame containing the columns of a usage per
+        day design matrix for all meters, plus a ``meter_id_col`` column
+        identifying the meter of each row, or a 3-D array with shape
+        ``(n_meters, n_periods, n_features)`` of aligned design matrices. In the
+        latter case, ``index`` and ``columns`` must be given. DataFrames of
+        this form can be made by concatenating the outputs of
+        :any:`eemeter.create_caltrack_daily_design_matrix` or
+        :any:`eemeter.create_caltrack_billing_design_matrix`.
+    meter_id_col : :any:`str`, optional
+        The column of a long-format ``data`` identifying meters. Meters are
+        fitted in order of first appearance.
+    index : :any:`pandas.DatetimeIndex`, optional
+        The periods of a 3-D array ``data``.
+    columns : :any:`list` of :any:`str`, optional
+        The feature names of a 3-D array ``data``, e.g., ``meter_value``,
+        ``cdd_65``, ``hdd_60``.
+    weights_col : :any:`str` or None, optional
+        The name of the column (if any) in ``data`` to use as weights.
+    chunk_size : :any:`int`, optional
+        Number of meters for which cross-products are computed at once. Limits
+        memory usage.
+    **kwargs
+        Passed on to :any:`eemeter.fit_caltrack_usage_per_day_model` for each
+        meter. Only ``fit_engine='numpy'`` is supported, and
+        ``sufficient_statistics`` cannot be given.
+
+    Returns
+    -------
+    model_results : :any:`list` of :any:`eemeter.CalTRACKUsagePerDayModelResults`
+        Results for each meter, in order.
+    """
+    fit_engine = kwargs.pop("fit_engine", "numpy")
+    if fit_engine != "numpy":
+        raise ValueError(
+            "fit_engine not supported by fit_caltrack_usage_per_day_models: {}".format(
+                fit_engine
+            )
+        )
+    if "sufficient_statistics" in kwargs:
+        raise ValueError(
+            "sufficient_statistics cannot be given to"
+            " fit_caltrack_usage_per_day_models."
+        )
+
+    if isinstance(data, pd.DataFrame):
+        meter_data = [
+            meter.drop(columns=[meter_id_col])
+            for _, meter in data.groupby(meter_id_col, sort=False)
+        ]
+    else:
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 3:
+            raise ValueError(
+                "data must be a DataFrame or a 3-D array, got {} dimensions".format(
+                    data.ndim
+                )
+            )
+        if index is None or columns is None:
+            raise ValueError("index and columns are required if data is an array.")
+        meter_data = [
+            pd.DataFrame(values, index=index, columns=columns) for values in data
+        ]
+
+    model_results = []
+    for start in range(0, len(meter_data), chunk_size):
+        chunk = [
+            overwrite_partial_rows_with_nan(meter)
+            for meter in meter_data[start : start + chunk_size]
+        ]
+        if len(chunk) == 0:
+            continue
+        degree_day_columns = [
+            col
+            for col in chunk[0].columns
+            if col.startswith("cdd_") or col.startswith("hdd_")
+        ]
+
+        # stack meters, padding shorter ones with NaN rows, which are dropped.
+        n_rows = max(len(meter) for meter in chunk)
+        values = np.full((len(chunk), n_rows, 1 + len(degree_day_columns)), np.nan)
+        weights = np.full((len(chunk), n_rows), np.nan)
+        for i, meter in enumerate(chunk):
+            values[i, : len(meter)], weights[i, : len(meter)] = _get_wls_values(
+                meter, weights_col, degree_day_columns
+            )
+        moments = _get_wls_moments(values, weights)
+
+        for i, meter in enumerate(chunk):
+            sufficient_statistics = _WLSSufficientStatistics(
+                meter,
+                weights_col,
+                columns=degree_day_columns,
+                moments=[moment[i] for moment in moments],
+            )
+            model_results.append(
+                fit_caltrack_usage_per_day_model(
+                    meter,
+                    weights_col=weights_col,
+                    fit_engine=fit_engine,
+                    sufficient_statistics=sufficient_statistics,
+                    **kwargs
+                )
+            )
+    return model_results
+
+
+def _merge_wls_moments(a, b):
+    """Moments of the union of the rows of ``a`` and ``b``."""
+    nobs_a, sum_weights_a, means_a, cross_products_a = a
+    nobs_b, sum_weights_b, means_b, cross_products_b = b
+    if nobs_b == 0:
+        return a
+    if nobs_a == 0:
+        return b
+    sum_weights = sum_weights_a + sum_weights_b
+    delta = means_b - means_a
+    means = means_a + delta * (sum_weights_b / sum_weights)
+    cross_products = (
+        cross_products_a
+        + cross_products_b
+        + np.outer(delta, delta) * (sum_weights_a * sum_weights_b / sum_weights)
+    )
+    return nobs_a + nobs_b, sum_weights, means, cross_products
+
+
+def _remove_wls_moments(total, b):
+    """Moments of the rows of ``total`` that are not rows of ``b``."""
+    nobs, sum_weights, means, cross_products = total
+    nobs_b, sum_weights_b, means_b, cross_products_b = b
+    if nobs_b == 0:
+        return total
+    if nobs_b >= nobs:
+        return (
+            0,
+            0.0,
+            np.full_like(means, np.nan),
+            np.zeros_like(cross_products),
+        )
+    sum_weights_a = sum_weights - sum_weights_b
+    means_a = (means * sum_weights - means_b * sum_weights_b) / sum_weights_a
+    delta = means_b - means_a
+    cross_products_a = (
+        cross_products
+        - cross_products_b
+        - np.outer(delta, delta) * (sum_weights_a * sum_weights_b / sum_weights)
+    )
+    return nobs - nobs_b, sum_weights_a, means_a, cross_products_a
+
+
+_RESERVED_STATE_FIT_KWARGS = (
+    "weights_col",
+    "fit_engine",
+    "sufficient_statistics",
+    "degree_day_statistics",
+)
+
+
+class CalTRACKUsagePerDayModelState(object):
+    """Incrementally updatable state for refitting CalTRACK usage per day
+    models over a growing or sliding window of data.
+
+    The weighted cross-products from which every candidate is solved, and
+    the degree day totals and counts used for sufficiency checks, are
+    updated when periods are appended or dropped, so that :any:`fit` only
+    needs to solve the candidates and select a model, instead of
+    recomputing these over the whole window.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame`
+        A design matrix as accepted by
+        :any:`eemeter.fit_caltrack_usage_per_day_model`, e.g., the output of
+        :any:`eemeter.create_caltrack_daily_design_matrix` or
+        :any:`eemeter.create_caltrack_billing_design_matrix`. Rows must be
+        sorted by index.
+    weights_col : :any:`str` or None, optional
+        The name of the column (if any) in ``data`` to use as weights.
+
+    Attributes
+    ----------
+    data : :any:`pandas.DataFrame`
+        The design matrix of the current window.
+    columns : :any:`list` of :any:`str`
+        The degree day columns of the design matrix.
+    """
+
+    def __init__(self, data, weights_col=None):
+        self.weights_col = weights_col
+        self.columns = [
+            col
+            for col in data.columns
+            if col.startswith("cdd_") or col.startswith("hdd_")
+        ]
+        self.data = data.iloc[:0]
+        self._moments = self._get_moments(self.data)
+        self.degree_day_statistics = {col: (0.0, 0) for col in self.columns}
+        self.append(data)
+
+    def __repr__(self):
+        return "CalTRACKUsagePerDayModelState(n_periods={}, nobs={})".format(
+            len(self.data), self._moments[0]
+        )
+
+    def _get_moments(self, rows):
+        values, weights = _get_wls_values(rows, self.weights_col, self.columns)
+        nobs, sum_weights, means, cross_products, _, _ = _get_wls_moments(
+            values[None], weights[None]
+        )
+        return int(nobs[0]), sum_weights[0], means[0], cross_products[0]
+
+    def _update_degree_day_statistics(self, rows, sign):
+        for col, (total, n_non_zero) in _get_degree_day_statistics(
+            rows, self.weights_col, columns=self.columns
+        ).items():
+            current_total, current_n_non_zero = self.degree_day_statistics[col]
+            self.degree_day_statistics[col] = (
+                current_total + sign * total,
+                current_n_non_zero + sign * n_non_zero,
+            )
+
+    def _remove_rows(self, rows):
+        if len(rows) == 0:
+            return
+        self._moments = _remove_wls_moments(self._moments, self._get_moments(rows))
+        self._update_degree_day_statistics(rows, -1)
+
+    def append(self, data):
+        """Append periods to the window.
+
+        Rows of the current window at or after the first index of ``data``
+        are replaced, e.g., the trailing null row marking the end of the last
+        billing period.
+
+        Parameters
+        ----------
+        data : :any:`pandas.DataFrame`
+            Design matrix rows with the same columns as the window, sorted by
+            index.
+
+        Returns
+        -------
+        state : :any:`eemeter.CalTRACKUsagePerDayModelState`
+            This object, updated.
+        """
+        if data.empty:
+            return self
+        # same cleaning as fit_caltrack_usage_per_day_model
+        data = overwrite_partial_rows_with_nan(data[self.data.columns])
+        replaced = self.data.index >= data.index[0]
+        self._remove_rows(self.data[replaced])
+        self._moments = _merge_wls_moments(self._moments, self._get_moments(data))
+        self._update_degree_day_statistics(data, 1)
+        self.data = pd.concat([self.data[~replaced], data])
+        return self
+
+    def drop_oldest(self, n_periods=1):
+        """Drop the oldest periods from the window.
+
+        Parameters
+        ----------
+        n_periods : :any:`int`, optional
+            The number of rows to drop from the start of the window.
+
+        Returns
+        -------
+        state : :any:`eemeter.CalTRACKUsagePerDayModelState`
+            This object, updated.
+        """
+        self._remove_rows(self.data.iloc[:n_periods])
+        self.data = self.data.iloc[n_periods:]
+        return self
+
+    def fit(self, **kwargs):
+        """Solve all candidates from the current state and select a model.
+
+        Parameters
+        ----------
+        **kwargs
+            Passed on to :any:`eemeter.fit_caltrack_usage_per_day_model`.
+            ``weights_col``, ``fit_engine``, ``sufficient_statistics`` and
+            ``degree_day_statistics`` are set from the state and cannot be
+            overridden; ``fit_engine`` is always ``'numpy'``.
+
+        Returns
+        -------
+        model_results : :any:`eemeter.CalTRACKUsagePerDayModelResults`
+            Results of fitting the current window.
+        """
+        reserved = sorted(set(kwargs) & set(_RESERVED_STATE_FIT_KWARGS))
+        if reserved:
+            raise ValueError(
+                "{} cannot be passed to CalTRACKUsagePerDayModelState.fit: they are"
+                " set from the state.".format(", ".join(reserved))
+            )
+        nobs, sum_weights, means, cross_products = self._moments
+        sufficient_statistics = _WLSSufficientStatistics(
+            self.data,
+            self.weights_col,
+            columns=self.columns,
+            # partially missing rows are fully nulled on append, so rows are
+            # always shared by all candidates.
+            moments=(nobs, sum_weights, means, cross_products, True, True),
+        )
+        return fit_caltrack_usage_per_day_model(
+            self.data,
+            weights_col=self.weights_col,
+            fit_engine="numpy",
+            sufficient_statistics=sufficient_statistics,
+            degree_day_statistics=dict(self.degree_day_statistics),
+            **kwargs
+        )
+
+
 def caltrack_sufficiency_criteria(
     data_quality,
     requested_start,
@@ -19,11 +19,13 @@
 """
 from .warnings import EEMeterWarning
 from .transform import day_counts, overwrite_partial_rows_with_nan
-from .segmentation import iterate_segmented_dataset
+
+from collections import OrderedDict
+import hashlib
+import threading
 
 import numpy as np
 import pandas as pd
-import statsmodels.formula.api as smf
 
 
 __all__ = (
@@ -33,9 +35,14 @@ __all__ = (
     "compute_temperature_bin_features",
     "compute_time_features",
     "estimate_hour_of_week_occupancy",
+    "estimate_hour_of_week_residual_ratios",
     "fit_temperature_bins",
     "get_missing_hours_of_week_warning",
+    "iterate_temperature_features",
     "merge_features",
+    "HourOfWeekResidualRatios",
+    "TemperatureFeatureCache",
+    "TemperaturePeriodIndex",
 )
 
 
@@ -117,7 +124,62 @@ def get_missing_hours_of_week_warning(hours_of_week):
         )
 
 
-def compute_time_features(index, hour_of_week=True, day_of_week=True, hour_of_day=True):
+_time_feature_codes = OrderedDict()
+_time_feature_codes_lock = threading.Lock()
+_TIME_FEATURE_CODES_CACHE_SIZE = 16
+
+
+def _get_time_feature_codes(index):
+    # an hourly index is determined by its start, length, frequency and time
+    # zone, so repeated fits and predictions over the same horizon can reuse
+    # the codes. Indexes without a frequency are not memoized.
+    key = None
+    if index.freq is not None:
+        start = index[0].value if len(index) > 0 else None
+        key = (start, len(index), index.freqstr, str(index.tz))
+        with _time_feature_codes_lock:
+            codes = _time_feature_codes.get(key)
+            if codes is not None:
+                _time_feature_codes.move_to_end(key)
+                return codes
+
+    if index.tz is not None:
+        index = index.tz_localize(None)  # local wall time
+    hours = index.asi8 // pd.Timedelta("1H").value
+    # 1970-01-01 was a Thursday (day 3)
+    day_of_week = ((hours // 24 + 3) % 7).astype(np.int8)
+    hour_of_day = (hours % 24).astype(np.int8)
+    hour_of_week = day_of_week.astype(np.int16) * 24 + hour_of_day
+    codes = {
+        "day_of_week": day_of_week,
+        "hour_of_day": hour_of_day,
+        "hour_of_week": hour_of_week,
+    }
+    for values in codes.values():
+        values.setflags(write=False)
+
+    if key is None:
+        return codes
+    with _time_feature_codes_lock:
+        _time_feature_codes[key] = codes
+        _time_feature_codes.move_to_end(key)
+        while len(_time_feature_codes) > _TIME_FEATURE_CODES_CACHE_SIZE:
+            _time_feature_codes.popitem(last=False)
+    return codes
+
+
+def _codes_to_categorical(codes):
+    # categories are the values present, as with .astype("category")
+    present = np.bincount(codes, minlength=1) > 0
+    categories = np.flatnonzero(present)
+    return pd.Categorical.from_codes(
+        (np.cumsum(present) - 1)[codes], categories=categories
+    )
+
+
+def compute_time_features(
+    index, hour_of_week=True, day_of_week=True, hour_of_day=True, compact=False
+):
     """Compute hour of week, day of week, or hour of day features.
 
     Parameters
@@ -130,6 +192,9 @@ def compute_time_features(index, hour_of_week=True, day_of_week=True, hour_of_da
         Include the `day_of_week` feature.
     hour_of_day : :any:`bool`
         Include the `hour_of_day` feature.
+    compact : :any:`bool`
+        If True, return integer columns (``int8``, or ``int16`` for
+        `hour_of_week`) instead of categoricals.
 
     Returns
     -------
@@ -146,155 +211,730 @@ def compute_time_features(index, hour_of_week=True, day_of_week=True, hour_of_da
             " Found: {}".format(index.freq)
         )
 
-    dow_feature = pd.Series(index.dayofweek, index=index, name="day_of_week")
-    hod_feature = pd.Series(index.hour, index=index, name="hour_of_day")
-    how_feature = (dow_feature * 24 + hod_feature).rename("hour_of_week")
+    columns = [
+        column
+        for column, include in [
+            ("day_of_week", day_of_week),
+            ("hour_of_day", hour_of_day),
+            ("hour_of_week", hour_of_week),
+        ]
+        if include
+    ]
+    if len(columns) == 0:
+        raise ValueError("No features selected.")
 
-    features = []
-    warnings = []
+    codes = _get_time_feature_codes(index)
+    if compact:
+        data = {column: codes[column].copy() for column in columns}
+    else:
+        data = {column: _codes_to_categorical(codes[column]) for column in columns}
+    return pd.DataFrame(data, index=index, columns=columns)
 
-    if day_of_week:
-        features.append(dow_feature.astype("category"))
-    if hour_of_day:
-        features.append(hod_feature.astype("category"))
-    if hour_of_week:
-        how_feature = how_feature.astype("category")
-        features.append(how_feature)
-        warning = get_missing_hours_of_week_warning(how_feature)
-        if warning is not None:
-            warnings.append(warning)
 
-    if len(features) == 0:
-        raise ValueError("No features selected.")
+def _get_default_tolerance(meter_data_index):
+    # the frequency of the meter data, if it can be converted to a timedelta
+    if meter_data_index.freq is not None:
+        try:
+            return pd.Timedelta(meter_data_index.freq)
+        except ValueError:  # freq cannot be converted to timedelta
+            return None
+    return None
+
+
+class TemperaturePeriodIndex(object):
+    """Assignment of hourly temperatures to the periods of a meter data index.
+
+    Each temperature is assigned to the latest period starting at or before
+    it, if that period start is no more than ``tolerance`` before it. The
+    assignment is computed once with a binary search and can be passed to
+    :any:`eemeter.compute_temperature_features` (and the functions built on
+    it, such as :any:`eemeter.create_caltrack_daily_design_matrix` and
+    :any:`eemeter.caltrack_usage_per_day_predict`) for every computation with
+    the same meter data index, temperature index and tolerance.
+
+    Parameters
+    ----------
+    meter_data_index : :any:`pandas.DatetimeIndex`
+        Sorted, timezone-aware index of the meter data periods.
+    temperature_index : :any:`pandas.DatetimeIndex`
+        Sorted, timezone-aware index of the hourly temperature data.
+    tolerance : :any:`pandas.Timedelta`, optional
+        Do not assign temperatures to a period more than this amount of time
+        after its start. Defaults to the frequency of ``meter_data_index``, as
+        in :any:`eemeter.compute_temperature_features`.
+
+    Attributes
+    ----------
+    codes : :any:`numpy.ndarray` of :any:`int`
+        For each temperature, the position in ``meter_data_index`` of its
+        period, or -1 if it has none.
+    mask : :any:`numpy.ndarray` of :any:`bool`
+        For each temperature, whether it is assigned to a period.
+    period_positions : :any:`numpy.ndarray` of :any:`int`
+        Positions in ``meter_data_index`` of the periods with at least one
+        temperature.
+    starts, lengths : :any:`numpy.ndarray` of :any:`int`
+        Offset and number of the temperatures of each of these periods among
+        the assigned temperatures (``temperatures[mask]``).
+    offsets : :any:`numpy.ndarray` of :any:`int`
+        Position in ``temperature_index`` of the first temperature of each of
+        these periods.
+    """
+
+    def __init__(self, meter_data_index, temperature_index, tolerance=None):
+        if tolerance is None:
+            tolerance = _get_default_tolerance(meter_data_index)
+        self.meter_data_index = meter_data_index
+        self.temperature_index = temperature_index
+        self.tolerance = tolerance
+
+        # compare instants (UTC nanoseconds), regardless of timezone
+        period_starts = meter_data_index.tz_convert("UTC").asi8
+        timestamps = temperature_index.tz_convert("UTC").asi8
+        if len(period_starts) > 1 and (np.diff(period_starts) < 0).any():
+            raise ValueError("meter_data_index must be sorted.")
+
+        codes = np.searchsorted(period_starts, timestamps, side="right") - 1
+        if tolerance is not None and len(period_starts) > 0:
+            too_far = (
+                timestamps - period_starts[np.maximum(codes, 0)]
+                > pd.Timedelta(tolerance).value
+            )
+            codes[too_far] = -1
+        self.codes = codes
+        self.mask = codes >= 0
+
+        # temperatures of each period are contiguous since both indexes are
+        # sorted.
+        self.period_positions, self.starts, self.lengths = np.unique(
+            codes[self.mask], return_index=True, return_counts=True
+        )
+        self.offsets = np.flatnonzero(self.mask)[self.starts]
+
+    def __repr__(self):
+        return "TemperaturePeriodIndex(n_periods={}, n_temperatures={})".format(
+            len(self.meter_data_index), len(self.temperature_index)
+        )
+
+    def matches(self, meter_data_index, temperature_index, tolerance=None):
+        """Whether this assignment applies to the given indexes and tolerance.
+
+        Parameters
+        ----------
+        meter_data_index : :any:`pandas.DatetimeIndex`
+            Index of the meter data periods.
+        temperature_index : :any:`pandas.DatetimeIndex`
+            Index of the hourly temperature data.
+        tolerance : :any:`pandas.Timedelta`, optional
+            Tolerance, with the same default as :any:`TemperaturePeriodIndex`.
+
+        Returns
+        -------
+        matches : :any:`bool`
+            True if the same assignment would be computed.
+        """
+        if tolerance is None:
+            tolerance = _get_default_tolerance(meter_data_index)
+        if (tolerance is None) != (self.tolerance is None):
+            return False
+        if tolerance is not None and pd.Timedelta(tolerance) != pd.Timedelta(
+            self.tolerance
+        ):
+            return False
+        return (
+            meter_data_index is self.meter_data_index
+            or meter_data_index.equals(self.meter_data_index)
+        ) and (
+            temperature_index is self.temperature_index
+            or temperature_index.equals(self.temperature_index)
+        )
+
+
+class _CachedTemperatures(object):
+    """Aggregates of one hourly temperature series, kept by a
+    :any:`TemperatureFeatureCache`. Days are consecutive blocks of 24 hours
+    starting at ``offset`` (0 to 23) hours into the series."""
+
+    def __init__(
+        self,
+        temperature_index,
+        temperatures,
+        max_period_indexes,
+        not_null=None,
+        filled=None,
+    ):
+        self.temperature_index = temperature_index
+        self.temperatures = temperatures
+        if not_null is None or filled is None:
+            not_null = ~np.isnan(temperatures)
+            filled = np.where(not_null, temperatures, 0.0)
+        self.not_null = not_null
+        self.filled = filled
+        self.max_period_indexes = max_period_indexes
+        self.period_index_hits = 0
+        self.period_index_misses = 0
+        self._tables = {}
+        self._period_indexes = OrderedDict()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_temperature_data(cls, temperature_data, max_period_indexes):
+        return cls(
+            temperature_data.index,
+            temperature_data.to_numpy(dtype=float),
+            max_period_indexes,
+        )
+
+    def _get_table(self, name, compute):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = compute()
+            return self._tables[name]
+
+    def get_daily_values(self, offset):
+        """Mean temperature and number of non-null hours of each full day."""
+        n_days = max((len(self.temperatures) - offset) // 24, 0)
+        day_starts = offset + 24 * np.arange(n_days)
+        lengths = np.full(n_days, 24)
+
+        n_not_null = self._get_table(
+            "daily_n_not_null_{:02d}".format(offset),
+            lambda: _get_segment_totals(self.not_null, day_starts, lengths),
+        )
+
+        def _compute_means():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (
+                    _get_segment_totals(self.filled, day_starts, lengths) / n_not_null
+                )
+
+        means = self._get_table("daily_means_{:02d}".format(offset), _compute_means)
+        return means, n_not_null
+
+    def get_daily_degree_days(
+        self, offset, cooling_balance_points, heating_balance_points
+    ):
+        """Cooling and heating degree days of each full day, with one column
+        per balance point."""
+        cooling_balance_points = np.asarray(cooling_balance_points, dtype=float)
+        heating_balance_points = np.asarray(heating_balance_points, dtype=float)
+        balance_points_hash = hashlib.sha1(cooling_balance_points.tobytes())
+        balance_points_hash.update(b"|" + heating_balance_points.tobytes())
+        means, _ = self.get_daily_values(offset)
+
+        def _compute_degree_days():
+            return np.column_stack(
+                [
+                    np.maximum(means[:, None] - cooling_balance_points, 0),
+                    np.maximum(heating_balance_points - means[:, None], 0),
+                ]
+            )
+
+        return self._get_table(
+            "daily_degree_days_{:02d}_{}".format(
+                offset, balance_points_hash.hexdigest()[:16]
+            ),
+            _compute_degree_days,
+        )
+
+    def get_period_index(self, meter_data_index, tolerance):
+        """A :any:`TemperaturePeriodIndex` for ``meter_data_index``, reused
+        for recently seen meter data indexes."""
+        key = (
+            hashlib.sha1(meter_data_index.asi8.tobytes()).hexdigest(),
+            None if tolerance is None else pd.Timedelta(tolerance).value,
+        )
+        with self._lock:
+            period_index = self._period_indexes.get(key)
+            if period_index is not None and period_index.matches(
+                meter_data_index, self.temperature_index, tolerance
+            ):
+                self._period_indexes.move_to_end(key)
+                self.period_index_hits += 1
+                return period_index
+        period_index = TemperaturePeriodIndex(
+            meter_data_index, self.temperature_index, tolerance
+        )
+        with self._lock:
+            self.period_index_misses += 1
+            self._period_indexes[key] = period_index
+            while len(self._period_indexes) > self.max_period_indexes:
+                self._period_indexes.popitem(last=False)
+        return period_index
+
+
+class TemperatureFeatureCache(object):
+    """In-process cache of hourly temperature aggregates shared by all meters
+    that use the same temperature data, e.g., of one weather station.
+
+    For each temperature series it keeps the hourly coverage, the mean
+    temperature and number of non-null hours of each day, daily degree days
+    for each set of balance points requested, and the
+    :any:`eemeter.TemperaturePeriodIndex` of recently seen meter data indexes.
+    When passed as ``temperature_cache`` to
+    :any:`eemeter.compute_temperature_features` (or to
+    :any:`eemeter.create_caltrack_daily_design_matrix` and
+    :any:`eemeter.create_caltrack_billing_design_matrix`), the degree days of
+    each full day of a meter period are looked up and only the reductions to
+    meter periods are computed for each meter. The least recently used
+    series are evicted when the cache is full.
+
+    Series are identified by the ``key`` passed to :any:`get` (e.g., a weather
+    station id) or else by a hash of their contents. A key must always refer
+    to the same temperature values; if its index changes, its entry is
+    replaced.
+
+    Parameters
+    ----------
+    max_size : :any:`int`, optional
+        Maximum number of temperature series to keep.
+    max_period_indexes : :any:`int`, optional
+        Maximum number of period indexes to keep for each temperature series.
+
+    Attributes
+    ----------
+    hits, misses, evictions : :any:`int`
+        Number of lookups of temperature series that were found or not found
+        in the cache, and number of series evicted.
+    """
+
+    def __init__(self, max_size=128, max_period_indexes=32):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1: {}".format(max_size))
+        self.max_size = max_size
+        self.max_period_indexes = max_period_indexes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            "TemperatureFeatureCache(size={}, max_size={}, hits={}, misses={})".format(
+                len(self), self.max_size, self.hits, self.misses
+            )
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """Lookup counts and size of the cache, as a :any:`dict`."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(entries),
+            "max_size": self.max_size,
+            "period_index_hits": sum(entry.period_index_hits for entry in entries),
+            "period_index_misses": sum(entry.period_index_misses for entry in entries),
+        }
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def get(self, temperature_data, key=None):
+        """Get the cache entry of a temperature series, creating it if needed.
+
+        Parameters
+        ----------
+        temperature_data : :any:`pandas.Series`
+            Hourly temperature data in eemeter format.
+        key : hashable, optional
+            Key identifying ``temperature_data``, e.g., a weather station id.
+            Defaults to a hash of its index and values.
+
+        Returns
+        -------
+        entry : :any:`object`
+            The cached aggregates, for use by
+            :any:`eemeter.compute_temperature_features`.
+        """
+        if key is None:
+            key = _get_content_hash(temperature_data)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.temperature_index is temperature_data.index
+                or entry.temperature_index.equals(temperature_data.index)
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._create_entry(temperature_data, key)
+        self._insert(key, entry)
+        return entry
+
+    def _create_entry(self, temperature_data, key):
+        return _CachedTemperatures.from_temperature_data(
+            temperature_data, self.max_period_indexes
+        )
+
+    def _insert(self, key, entry):
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+def _get_degree_day_totals(
+    values, groups, n_groups, cooling_balance_points, heating_balance_points
+):
+    """Totals of cooling and heating degree days of ``values`` within each
+    group, for all balance points at once.
+
+    Instead of evaluating ``max(value - bp, 0)`` for every pair of value and
+    balance point, values are counted and summed into the intervals between
+    sorted balance points, and cumulative sums over those intervals give, for
+    each balance point, the count and sum of values above (or below) it:
+    ``cdd = sum_above - bp * count_above``, ``hdd = bp * count_below -
+    sum_below``. This takes O(n log(points) + groups * points) time.
+
+    Parameters
+    ----------
+    values : :any:`numpy.ndarray`
+        Temperatures. NaN values make the totals of their group NaN.
+    groups : :any:`numpy.ndarray` of :any:`int`
+        Group (0 to ``n_groups - 1``) of each value.
+    n_groups : :any:`int`
+        Number of groups.
+    cooling_balance_points, heating_balance_points : :any:`list` of :any:`float`
+        Balance points.
+
+    Returns
+    -------
+    cdd, hdd : :any:`tuple` of :any:`numpy.ndarray`
+        Degree day totals with shape ``(n_groups, n_balance_points)``.
+    """
+    cooling_balance_points = np.asarray(cooling_balance_points, dtype=float)
+    heating_balance_points = np.asarray(heating_balance_points, dtype=float)
+    balance_points = np.unique(
+        np.concatenate([cooling_balance_points, heating_balance_points])
+    )
+    n_bins = len(balance_points) + 1
 
-    time_features = merge_features(features)
-    return time_features
+    is_nan = np.isnan(values)
+    values, nan_groups, groups = values[~is_nan], groups[is_nan], groups[~is_nan]
 
+    # bin k holds values with balance_points[k - 1] < value <= balance_points[k]
+    bins = groups * n_bins + np.searchsorted(balance_points, values, side="left")
+    counts = np.bincount(bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+    sums = np.bincount(bins, weights=values, minlength=n_groups * n_bins).reshape(
+        n_groups, n_bins
+    )
 
-def _matching_groups(index, df, tolerance):
-    # convert index to df for use with merge_asof
-    index_df = pd.DataFrame({"index_col": index}, index=index)
+    # values above balance point j are in bins j + 1 and higher; values equal
+    # to a balance point contribute zero either way.
+    count_above = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    sum_above = np.cumsum(sums[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    count_below = np.cumsum(counts, axis=1)[:, :-1]
+    sum_below = np.cumsum(sums, axis=1)[:, :-1]
 
-    # get a dataframe containing mean temperature
-    #   1) merge by matching temperature to closest previous meter start date,
-    #      up to tolerance limit, using merge_asof.
-    #   2) group by meter_index, and take the mean, ignoring all columns except
-    #      the temperature column.
-    groups = pd.merge_asof(
-        left=df, right=index_df, left_index=True, right_index=True, tolerance=tolerance
-    ).groupby("index_col")
-    return groups
+    cdd = np.maximum(sum_above - balance_points * count_above, 0)
+    hdd = np.maximum(balance_points * count_below - sum_below, 0)
+
+    has_nan = np.bincount(nan_groups, minlength=n_groups) > 0
+    cdd[has_nan] = np.nan
+    hdd[has_nan] = np.nan
+
+    return (
+        cdd[:, np.searchsorted(balance_points, cooling_balance_points)],
+        hdd[:, np.searchsorted(balance_points, heating_balance_points)],
+    )
 
 
-def _degree_day_columns(
+def _get_content_hash(temperature_data):
+    """Hash of the index and values of a temperature series."""
+    content_hash = hashlib.sha1(temperature_data.index.asi8.tobytes())
+    content_hash.update(temperature_data.to_numpy(dtype=float).tobytes())
+    return content_hash.hexdigest()
+
+
+def _get_segment_totals(values, starts, lengths):
+    """Totals of the contiguous segments ``values[start:start + length]``,
+    which must be sorted and must not overlap."""
+    boundaries = np.column_stack([starts, starts + lengths]).ravel()
+    # appending an int also promotes boolean values, e.g., not_null, to int.
+    return np.add.reduceat(np.append(values, 0), boundaries)[::2]
+
+
+def _reduce_rows(rows, groups, n_groups):
+    """Column totals of ``rows`` within each of ``n_groups`` groups. Rows
+    must be sorted by group."""
+    if (np.diff(groups) > 0).all():
+        # at most one row per group, e.g., daily meter periods
+        totals = np.zeros((n_groups, rows.shape[1]))
+        totals[groups] = rows
+        return totals
+    first_rows = np.searchsorted(groups, np.arange(n_groups))
+    # a zero row makes reduceat well defined for empty trailing groups.
+    totals = np.add.reduceat(
+        np.vstack([rows, np.zeros((1, rows.shape[1]))]), first_rows, axis=0
+    )
+    totals[np.bincount(groups, minlength=n_groups) == 0] = 0
+    return totals
+
+
+def _get_day_blocks(
+    not_null,
+    filled,
+    starts,
+    lengths,
+    n_not_null,
+    percent_hourly_coverage_per_day,
+    percent_hourly_coverage_per_billing_period,
+    cached_temperatures=None,
+):
+    """Split periods into consecutive blocks of (up to) 24 hours, compute the
+    mean temperature of each block and apply the CalTRACK coverage rules.
+
+    Returns the number of blocks of each period, and the period, start,
+    length, mean temperature and whether it is kept for each block, and the
+    number of kept blocks of each period.
+    """
+    n_periods = len(lengths)
+    # split each period into consecutive blocks of (up to) 24 hours.
+    n_blocks = -(-lengths // 24)
+    block_period = np.repeat(np.arange(n_periods), n_blocks)
+    first_blocks = np.cumsum(n_blocks) - n_blocks
+    block_starts = starts[block_period] + 24 * (
+        np.arange(n_blocks.sum()) - first_blocks[block_period]
+    )
+    block_lengths = np.minimum((starts + lengths)[block_period] - block_starts, 24)
+
+    if cached_temperatures is None:
+        on_grid = np.zeros(len(block_starts), dtype=bool)
+    else:
+        on_grid = block_lengths == 24
+    off_grid = ~on_grid
+    block_n_not_null = np.empty(len(block_starts), dtype=int)
+    block_means = np.empty(len(block_starts))
+    block_n_not_null[off_grid] = _get_segment_totals(
+        not_null, block_starts[off_grid], block_lengths[off_grid]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        block_means[off_grid] = (
+            _get_segment_totals(filled, block_starts[off_grid], block_lengths[off_grid])
+            / block_n_not_null[off_grid]
+        )
+    offsets = block_starts % 24
+    days = block_starts // 24
+    for offset in np.unique(offsets[on_grid]):
+        is_offset = on_grid & (offsets == offset)
+        daily_means, daily_n_not_null = cached_temperatures.get_daily_values(offset)
+        block_means[is_offset] = daily_means[days[is_offset]]
+        block_n_not_null[is_offset] = daily_n_not_null[days[is_offset]]
+
+    # CalTRACK 2.2.2.3
+    n_limit_daily = 24 * percent_hourly_coverage_per_day
+    # CalTrack 2.2.3.2
+    period_coverage_ok = (
+        n_not_null >= percent_hourly_coverage_per_billing_period * lengths
+    )
+    multi_day = lengths > 24
+    keep = np.where(
+        multi_day[block_period],
+        (block_n_not_null > n_limit_daily) & period_coverage_ok[block_period],
+        # single day periods: no period coverage check and the limit
+        # applies to the number of hours in the period.
+        (lengths > n_limit_daily)[block_period],
+    )
+    n_days_kept = np.add.reduceat(keep.astype(int), first_blocks)
+
+    return (
+        n_blocks,
+        block_period,
+        block_starts,
+        block_lengths,
+        block_means,
+        keep,
+        n_days_kept,
+    )
+
+
+def _compute_degree_day_columns(
+    temperatures,
+    starts,
+    lengths,
     heating_balance_points,
     cooling_balance_points,
     degree_day_method,
     percent_hourly_coverage_per_day,
     percent_hourly_coverage_per_billing_period,
     use_mean_daily_values,
+    cached_temperatures=None,
 ):
-    # TODO(philngo): can this be refactored to be a more general without losing
-    # on performance?
+    """Compute count and degree day columns for many periods at once.
+
+    The hourly temperatures of period ``i`` are the contiguous slice of
+    ``lengths[i]`` values of ``temperatures`` starting at ``starts[i]``. If
+    ``cached_temperatures`` (an entry of a :any:`TemperatureFeatureCache` for
+    the same temperatures) is given, the means, coverage and degree days of
+    full 24 hour days are looked up instead of computed. Returns a list of
+    column names, a 2-D array with one row per period and, for the daily
+    method, the period and mean temperature of each kept day (otherwise
+    None).
+    """
+    if cached_temperatures is None:
+        not_null = ~np.isnan(temperatures)
+        filled = np.where(not_null, temperatures, 0.0)
+    else:
+        not_null, filled = cached_temperatures.not_null, cached_temperatures.filled
+    n_not_null = _get_segment_totals(not_null, starts, lengths)
+    n_periods = len(lengths)
+    degree_day_column_names = ["cdd_%s" % bp for bp in cooling_balance_points] + [
+        "hdd_%s" % bp for bp in heating_balance_points
+    ]
+
+    def _degree_day_totals(values, groups):
+        cdd, hdd = _get_degree_day_totals(
+            values, groups, n_periods, cooling_balance_points, heating_balance_points
+        )
+        return np.column_stack([cdd, hdd])
 
     # Not used in CalTRACK 2.0
     if degree_day_method == "hourly":
+        if use_mean_daily_values:
+            n_days = np.ones(n_periods)
+        else:
+            n_days = lengths / 24.0
+        # missing hours are ignored
+        temperature_periods = np.repeat(np.arange(n_periods), lengths)
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        positions += np.arange(len(positions))
+        is_kept = not_null[positions] > 0
+        totals = _degree_day_totals(
+            temperatures[positions][is_kept], temperature_periods[is_kept]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            degree_days = totals / n_not_null[:, None] * n_days[:, None]
+        count_column_names = ["n_hours_kept", "n_hours_dropped"]
+        counts = [n_not_null, lengths - n_not_null]
+        kept_days = None
+
+    elif degree_day_method == "daily":
+        (
+            n_blocks,
+            block_period,
+            block_starts,
+            block_lengths,
+            block_means,
+            keep,
+            n_days_kept,
+        ) = _get_day_blocks(
+            not_null,
+            filled,
+            starts,
+            lengths,
+            n_not_null,
+            percent_hourly_coverage_per_day,
+            percent_hourly_coverage_per_billing_period,
+            cached_temperatures=cached_temperatures,
+        )
 
-        def _compute_columns(temps):
-            n_temps = temps.shape[0]
-            n_temps_kept = temps.count()
-            count_cols = {
-                "n_hours_kept": n_temps_kept,
-                "n_hours_dropped": n_temps - n_temps_kept,
-            }
-            if use_mean_daily_values:
-                n_days = 1
-            else:
-                n_days = n_temps / 24.0
-            cdd_cols = {
-                "cdd_%s" % bp: np.maximum(temps - bp, 0).mean() * n_days
-                for bp in cooling_balance_points
-            }
-            hdd_cols = {
-                "hdd_%s" % bp: np.maximum(bp - temps, 0).mean() * n_days
-                for bp in heating_balance_points
-            }
-
-            columns = count_cols
-            columns.update(cdd_cols)
-            columns.update(hdd_cols)
-            return columns
+        if use_mean_daily_values:
+            n_days = np.ones(n_periods)
+        else:
+            n_days = n_blocks
 
-    # CalTRACK 2.2.2.3
-    n_limit_daily = 24 * percent_hourly_coverage_per_day
+        # CalTrack 3.3.4.1.1, 3.3.5.1.1
+        if cached_temperatures is None:
+            totals = _degree_day_totals(block_means[keep], block_period[keep])
+        else:
+            offsets = block_starts % 24
+            days = block_starts // 24
+            kept_on_grid = keep & (block_lengths == 24)
+            kept_off_grid = keep & (block_lengths != 24)
+            block_degree_days = np.empty(
+                (len(block_starts), len(degree_day_column_names))
+            )
+            block_degree_days[kept_off_grid] = np.column_stack(
+                [
+                    np.maximum(
+                        block_means[kept_off_grid, None]
+                        - np.asarray(cooling_balance_points, dtype=float),
+                        0,
+                    ),
+                    np.maximum(
+                        np.asarray(heating_balance_points, dtype=float)
+                        - block_means[kept_off_grid, None],
+                        0,
+                    ),
+                ]
+            )
+            for offset in np.unique(offsets[kept_on_grid]):
+                is_offset = kept_on_grid & (offsets == offset)
+                daily_degree_days = cached_temperatures.get_daily_degree_days(
+                    offset, cooling_balance_points, heating_balance_points
+                )
+                block_degree_days[is_offset] = daily_degree_days[days[is_offset]]
+            totals = _reduce_rows(
+                block_degree_days[keep], block_period[keep], n_periods
+            )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            degree_days = totals / n_days_kept[:, None] * n_days[:, None]
+        count_column_names = ["n_days_kept", "n_days_dropped"]
+        counts = [n_days_kept, n_blocks - n_days_kept]
+        kept_days = (block_period[keep], block_means[keep])
+
+    else:
+        raise ValueError("method not supported: {}".format(degree_day_method))
 
-    if degree_day_method == "daily":
-
-        def _compute_columns(temps):
-            count = temps.shape[0]
-            if count > 24:
-                day_groups = np.floor(np.arange(count) / 24)
-                daily_temps = temps.groupby(day_groups).agg(["mean", "count"])
-                n_limit_period = percent_hourly_coverage_per_billing_period * count
-                n_days_total = daily_temps.shape[0]
-
-                # CalTrack 2.2.3.2
-                if temps.notnull().sum() < n_limit_period:
-                    daily_temps = daily_temps["mean"].iloc[0:0]
-                else:
-                    # CalTRACK 2.2.2.3
-                    daily_temps = daily_temps["mean"][
-                        daily_temps["count"] > n_limit_daily
-                    ]
-                n_days_kept = daily_temps.shape[0]
-                count_cols = {
-                    "n_days_kept": n_days_kept,
-                    "n_days_dropped": n_days_total - n_days_kept,
-                }
-
-                if use_mean_daily_values:
-                    n_days = 1
-                else:
-                    n_days = n_days_total
-
-                cdd_cols = {
-                    "cdd_%s" % bp: np.maximum(daily_temps - bp, 0).mean() * n_days
-                    for bp in cooling_balance_points
-                }
-                hdd_cols = {
-                    "hdd_%s" % bp: np.maximum(bp - daily_temps, 0).mean() * n_days
-                    for bp in heating_balance_points
-                }
-            else:  # faster route for daily case, should have same effect.
-                if count > n_limit_daily:
-                    count_cols = {"n_days_kept": 1, "n_days_dropped": 0}
-                    # CalTRACK 2.2.2.3
-                    mean_temp = temps.mean()
-                else:
-                    count_cols = {"n_days_kept": 0, "n_days_dropped": 1}
-                    mean_temp = np.nan
-
-                # CalTrack 3.3.4.1.1
-                cdd_cols = {
-                    "cdd_%s" % bp: np.maximum(mean_temp - bp, 0)
-                    for bp in cooling_balance_points
-                }
-
-                # CalTrack 3.3.5.1.1
-                hdd_cols = {
-                    "hdd_%s" % bp: np.maximum(bp - mean_temp, 0)
-                    for bp in heating_balance_points
-                }
-
-            columns = count_cols
-            columns.update(cdd_cols)
-            columns.update(hdd_cols)
-            return columns
-
-    # TODO(philngo): option to ignore the count columns?
-
-    agg_funcs = [("degree_day_columns", _compute_columns)]
-    return agg_funcs
+    columns = count_column_names + degree_day_column_names
+    values = np.column_stack([np.column_stack(counts), degree_days])
+    return columns, values, kept_days
+
+
+def _get_period_temperatures(
+    meter_data_index,
+    temperature_data,
+    tolerance,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
+):
+    """Get the period index and the hourly temperature arrays (values,
+    non-null indicator and values with nulls as zeros) for daily or billing
+    temperature features, from the cache if given."""
+    cached_temperatures = None
+    if temperature_cache is not None:
+        cached_temperatures = temperature_cache.get(
+            temperature_data, key=temperature_cache_key
+        )
+        if period_index is None:
+            period_index = cached_temperatures.get_period_index(
+                meter_data_index, tolerance
+            )
+    if period_index is None:
+        period_index = TemperaturePeriodIndex(
+            meter_data_index, temperature_data.index, tolerance
+        )
+    elif not period_index.matches(meter_data_index, temperature_data.index, tolerance):
+        raise ValueError(
+            "period_index does not match meter_data_index, the index of"
+            " temperature_data or tolerance."
+        )
+    if cached_temperatures is None:
+        temperatures = temperature_data.to_numpy(dtype=float)
+        not_null = ~np.isnan(temperatures)
+        filled = np.nan_to_num(temperatures)
+    else:
+        temperatures = cached_temperatures.temperatures
+        not_null = cached_temperatures.not_null
+        filled = cached_temperatures.filled
+    return period_index, temperatures, not_null, filled, cached_temperatures
 
 
 def compute_temperature_features(
@@ -310,6 +950,9 @@ def compute_temperature_features(
     use_mean_daily_values=True,
     tolerance=None,
     keep_partial_nan_rows=False,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
 ):
     """Compute temperature features from hourly temperature data using the
     :any:`pandas.DatetimeIndex` meter data..
@@ -377,12 +1020,87 @@ def compute_temperature_features(
         If True, keeps data in resultant :any:`pandas.DataFrame` that has
         missing temperature or meter data. Otherwise, these rows are overwritten
         entirely with ``numpy.nan`` values.
+    period_index : :any:`eemeter.TemperaturePeriodIndex`, optional
+        A precomputed assignment of ``temperature_data`` to the periods of
+        ``meter_data_index`` (with the same ``tolerance``), to be reused
+        across calls. Not used for hourly meter data.
+    temperature_cache : :any:`eemeter.TemperatureFeatureCache`, optional
+        A cache of daily temperature aggregates shared by all meters using
+        the same ``temperature_data``, e.g., of a weather station. Not used
+        for hourly meter data.
+    temperature_cache_key : hashable, optional
+        Key of ``temperature_data`` in ``temperature_cache``, e.g., a weather
+        station id. Defaults to a hash of the contents of ``temperature_data``.
 
     Returns
     -------
     data : :any:`pandas.DataFrame`
         A dataset with the specified parameters.
     """
+    data, _ = _compute_temperature_features(
+        meter_data_index,
+        temperature_data,
+        heating_balance_points=heating_balance_points,
+        cooling_balance_points=cooling_balance_points,
+        data_quality=data_quality,
+        temperature_mean=temperature_mean,
+        degree_day_method=degree_day_method,
+        percent_hourly_coverage_per_day=percent_hourly_coverage_per_day,
+        percent_hourly_coverage_per_billing_period=percent_hourly_coverage_per_billing_period,
+        use_mean_daily_values=use_mean_daily_values,
+        tolerance=tolerance,
+        keep_partial_nan_rows=keep_partial_nan_rows,
+        period_index=period_index,
+        temperature_cache=temperature_cache,
+        temperature_cache_key=temperature_cache_key,
+    )
+    return data
+
+
+def _compute_temperature_features_with_day_temperatures(
+    meter_data_index, temperature_data, **kwargs
+):
+    """Compute temperature features of daily or billing meter data with
+    :any:`compute_temperature_features` (``kwargs`` are passed on), together
+    with the mean temperature and the row of the period of each day kept for
+    degree days, in row order. The kept days are None if no period has
+    temperature data.
+    """
+    if kwargs.get("degree_day_method", "daily") != "daily":
+        raise ValueError("method not supported: {}".format(kwargs["degree_day_method"]))
+    if _get_default_tolerance(meter_data_index) == pd.Timedelta("1H"):
+        raise ValueError("meter_data_index must not have hourly frequency.")
+    data, kept_days = _compute_temperature_features(
+        meter_data_index, temperature_data, **kwargs
+    )
+    if kept_days is None:
+        return data, None, None
+    day_rows, day_temperatures = kept_days
+    return data, day_temperatures, day_rows
+
+
+def _compute_temperature_features(
+    meter_data_index,
+    temperature_data,
+    heating_balance_points=None,
+    cooling_balance_points=None,
+    data_quality=False,
+    temperature_mean=True,
+    degree_day_method="daily",
+    percent_hourly_coverage_per_day=0.5,
+    percent_hourly_coverage_per_billing_period=0.9,
+    use_mean_daily_values=True,
+    tolerance=None,
+    keep_partial_nan_rows=False,
+    period_index=None,
+    temperature_cache=None,
+    temperature_cache_key=None,
+):
+    """Compute temperature features, see :any:`compute_temperature_features`.
+
+    Also returns the row and mean temperature of each kept day for daily or
+    billing meter data with the daily degree day method, otherwise None.
+    """
     if temperature_data.index.freq != "H":
         raise ValueError(
             "temperature_data.index must have hourly frequency (freq='H')."
@@ -412,21 +1130,12 @@ def compute_temperature_features(
     if meter_data_index.duplicated().any():
         raise ValueError("Duplicates found in input meter trace index.")
 
-    temp_agg_funcs = []
-    temp_agg_column_renames = {}
-
     if heating_balance_points is None:
         heating_balance_points = []
     if cooling_balance_points is None:
         cooling_balance_points = []
 
-    if meter_data_index.freq is not None:
-        try:
-            freq_timedelta = pd.Timedelta(meter_data_index.freq)
-        except ValueError:  # freq cannot be converted to timedelta
-            freq_timedelta = None
-    else:
-        freq_timedelta = None
+    freq_timedelta = _get_default_tolerance(meter_data_index)
 
     if tolerance is None:
         tolerance = freq_timedelta
@@ -443,141 +1152,413 @@ def compute_temperature_features(
         else:
             raise ValueError("method not supported: {}".format(degree_day_method))
 
+    kept_days = None
     if freq_timedelta == pd.Timedelta("1H"):
-        # special fast route for hourly data.
-        df = temperature_data.to_frame("temperature_mean").reindex(meter_data_index)
+        # special fast route for hourly data: fill one preallocated array.
+        temperatures = temperature_data.reindex(meter_data_index).to_numpy(dtype=float)
+        index = meter_data_index
 
         if use_mean_daily_values:
             n_days = 1
         else:
             n_days = 1.0 / 24.0
 
-        df = df.assign(
-            **{
-                "cdd_{}".format(bp): np.maximum(df.temperature_mean - bp, 0) * n_days
-                for bp in cooling_balance_points
-            }
+        cooling_columns = {"cdd_{}".format(bp): bp for bp in cooling_balance_points}
+        heating_columns = {"hdd_{}".format(bp): bp for bp in heating_balance_points}
+        count_columns = ["n_hours_dropped", "n_hours_kept"]
+        if data_quality:
+            # TODO(philngo): bad interface or maybe this is just wrong for some reason?
+            count_columns.extend(["temperature_null", "temperature_not_null"])
+        columns = (
+            (["temperature_mean"] if temperature_mean else [])
+            + list(cooling_columns)
+            + list(heating_columns)
+            + count_columns
         )
-        df = df.assign(
-            **{
-                "hdd_{}".format(bp): np.maximum(bp - df.temperature_mean, 0) * n_days
-                for bp in heating_balance_points
-            }
+        data = np.empty((len(temperatures), len(columns)))
+        column = 0
+        if temperature_mean:
+            data[:, column] = temperatures
+            column += 1
+        cooling_degree_days = data[:, column : column + len(cooling_columns)]
+        np.subtract(
+            temperatures[:, None],
+            np.asarray(list(cooling_columns.values()), dtype=float),
+            out=cooling_degree_days,
         )
-        df = df.assign(
-            n_hours_dropped=df.temperature_mean.isnull().astype(int),
-            n_hours_kept=df.temperature_mean.notnull().astype(int),
+        column += len(cooling_columns)
+        heating_degree_days = data[:, column : column + len(heating_columns)]
+        np.subtract(
+            np.asarray(list(heating_columns.values()), dtype=float),
+            temperatures[:, None],
+            out=heating_degree_days,
         )
-        # TODO(philngo): bad interface or maybe this is just wrong for some reason?
-        if data_quality:
-            df = df.assign(
-                temperature_null=df.n_hours_dropped,
-                temperature_not_null=df.n_hours_kept,
-            )
-        if not temperature_mean:
-            del df["temperature_mean"]
+        column += len(heating_columns)
+        degree_days = data[
+            :, column - len(cooling_columns) - len(heating_columns) : column
+        ]
+        np.maximum(degree_days, 0, out=degree_days)
+        degree_days *= n_days
+        is_null = np.isnan(temperatures)
+        data[:, column::2] = is_null[:, None]
+        data[:, column + 1 :: 2] = ~is_null[:, None]
     else:
         # daily/billing route
-        # heating/cooling degree day aggregations. Needed for n_days fields as well.
-        temp_agg_funcs.extend(
-            _degree_day_columns(
+        (
+            period_index,
+            temperatures,
+            not_null,
+            filled,
+            cached_temperatures,
+        ) = _get_period_temperatures(
+            meter_data_index,
+            temperature_data,
+            tolerance,
+            period_index,
+            temperature_cache,
+            temperature_cache_key,
+        )
+        # only periods with at least one temperature are aggregated.
+        period_positions = period_index.period_positions
+        starts, lengths = period_index.offsets, period_index.lengths
+
+        columns = []
+        values = []
+        if len(period_positions) > 0:
+            n_not_null = _get_segment_totals(not_null, starts, lengths)
+            if data_quality:
+                columns.extend(["temperature_not_null", "temperature_null"])
+                values.extend([n_not_null, lengths - n_not_null])
+            if temperature_mean:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    means = _get_segment_totals(filled, starts, lengths) / n_not_null
+                columns.append("temperature_mean")
+                values.append(means)
+
+            # heating/cooling degree day aggregations. Needed for n_days
+            # fields as well.
+            (
+                degree_day_columns,
+                degree_day_values,
+                kept_days,
+            ) = _compute_degree_day_columns(
+                temperatures,
+                starts,
+                lengths,
                 heating_balance_points=heating_balance_points,
                 cooling_balance_points=cooling_balance_points,
                 degree_day_method=degree_day_method,
                 percent_hourly_coverage_per_day=percent_hourly_coverage_per_day,
                 percent_hourly_coverage_per_billing_period=percent_hourly_coverage_per_billing_period,
                 use_mean_daily_values=use_mean_daily_values,
+                cached_temperatures=cached_temperatures,
             )
-        )
-        temp_agg_column_renames.update(
-            {("temp", "degree_day_columns"): "degree_day_columns"}
-        )
-
-        if data_quality:
-            temp_agg_funcs.extend(
-                [("not_null", "count"), ("null", lambda x: x.isnull().sum())]
-            )
-            temp_agg_column_renames.update(
-                {
-                    ("temp", "not_null"): "temperature_not_null",
-                    ("temp", "null"): "temperature_null",
-                }
-            )
-
-        if temperature_mean:
-            temp_agg_funcs.extend([("mean", "mean")])
-            temp_agg_column_renames.update({("temp", "mean"): "temperature_mean"})
-
-        # aggregate temperatures
-        temp_df = temperature_data.to_frame("temp")
-        temp_groups = _matching_groups(meter_data_index, temp_df, tolerance)
-        temp_aggregations = temp_groups.agg({"temp": temp_agg_funcs})
-
-        # expand temp aggregations by faking and deleting the `meter_value` column.
-        # I haven't yet figured out a way to avoid this and get the desired
-        # structure and behavior. (philngo)
-        meter_value = pd.DataFrame({"meter_value": 0}, index=meter_data_index)
-        df = pd.concat([meter_value, temp_aggregations], axis=1).rename(
-            columns=temp_agg_column_renames
-        )
-        del df["meter_value"]
-
-        if "degree_day_columns" in df:
-            if df["degree_day_columns"].dropna().empty:
-                column_defaults = {
-                    column: np.full(df["degree_day_columns"].shape, np.nan)
-                    for column in ["n_days_dropped", "n_days_kept"]
-                }
-                df = df.drop(["degree_day_columns"], axis=1).assign(**column_defaults)
-            else:
-                df = pd.concat(
-                    [
-                        df.drop(["degree_day_columns"], axis=1),
-                        df["degree_day_columns"].dropna().apply(pd.Series),
-                    ],
-                    axis=1,
-                )
+            columns.extend(degree_day_columns)
+            values = np.column_stack(values + [degree_day_values])
+            if kept_days is not None:
+                kept_day_periods, kept_day_temperatures = kept_days
+                kept_days = (period_positions[kept_day_periods], kept_day_temperatures)
+        else:
+            # no temperature data in any period
+            if data_quality:
+                columns.extend(["temperature_not_null", "temperature_null"])
+            if temperature_mean:
+                columns.append("temperature_mean")
+            columns.extend(["n_days_dropped", "n_days_kept"])
+            values = np.empty((0, len(columns)))
+
+        data = np.full((len(meter_data_index), len(columns)), np.nan)
+        data[period_positions] = values
+        index = meter_data_index.rename(None)
 
     if not keep_partial_nan_rows:
-        df = overwrite_partial_rows_with_nan(df)
+        data[np.isnan(data).any(axis=1)] = np.nan
 
     # nan last row
-    df = df.iloc[:-1].reindex(df.index)
-    return df
+    data[-1:] = np.nan
+    df = pd.DataFrame(data, index=index, columns=columns)
+    if len(df) == 0 and freq_timedelta == pd.Timedelta("1H"):
+        df = df.astype(dict.fromkeys(count_columns, int))
+    return df, kept_days
 
 
-def _estimate_hour_of_week_occupancy(model_data, threshold):
-    index = pd.CategoricalIndex(range(168))
-    if model_data.dropna().empty:
-        return pd.Series(np.nan, index=index, name="occupancy")
+def iterate_temperature_features(
+    meter_data_index, temperature_data, chunk_size=8760, **kwargs
+):
+    """Compute temperature features for consecutive chunks of the meter data
+    periods, so that only the temperature data of one chunk is processed at
+    a time.
 
-    usage_model = smf.wls(
-        formula="meter_value ~ cdd_65 + hdd_50",
-        data=model_data,
-        weights=model_data.weight,
-    )
+    Each chunk also includes the start of the next period, which is where the
+    last period of the chunk ends, so periods at chunk boundaries are
+    computed exactly as in :any:`eemeter.compute_temperature_features`. With
+    temperature data memory-mapped from a :any:`eemeter.TemperatureFeatureStore`
+    (see :any:`eemeter.TemperatureFeatureStore.load_temperature_data`), peak
+    memory depends on ``chunk_size`` rather than on the length of the data.
 
-    model_data_with_residuals = model_data.merge(
-        pd.DataFrame({"residuals": usage_model.fit().resid}),
-        left_index=True,
-        right_index=True,
+    Parameters
+    ----------
+    meter_data_index : :any:`pandas.DatetimeIndex`
+        A sorted :any:`pandas.DatetimeIndex` corresponding to the index over
+        which to compute temperature features.
+    temperature_data : :any:`pandas.Series`
+        Series with :any:`pandas.DatetimeIndex` with hourly (``'H'``) frequency
+        and a set of temperature values.
+    chunk_size : :any:`int`, optional
+        Number of meter data periods in each chunk.
+    **kwargs
+        Extra keyword arguments to pass to
+        :any:`eemeter.compute_temperature_features`, except ``period_index``,
+        ``temperature_cache`` and ``temperature_cache_key``.
+
+    Yields
+    ------
+    data : :any:`pandas.DataFrame`
+        Temperature features of the periods of each chunk. Concatenated, these
+        are the same as the output of
+        :any:`eemeter.compute_temperature_features`.
+    """
+    for name in ["period_index", "temperature_cache", "temperature_cache_key"]:
+        if name in kwargs:
+            raise ValueError(
+                "{} is not supported by iterate_temperature_features.".format(name)
+            )
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1: {}".format(chunk_size))
+    if meter_data_index.duplicated().any():
+        raise ValueError("Duplicates found in input meter trace index.")
+    if not meter_data_index.is_monotonic_increasing:
+        raise ValueError("meter_data_index must be sorted.")
+
+    hourly = _get_default_tolerance(meter_data_index) == pd.Timedelta("1H")
+    n_periods = len(meter_data_index)
+    columns = None
+    empty_chunks = []
+    for start in range(0, max(n_periods, 1), chunk_size):
+        stop = min(start + chunk_size, n_periods)
+        # the start of the next period ends the last period of the chunk
+        chunk_index = meter_data_index[start : stop + 1]
+        if len(chunk_index) > 0:
+            chunk_temperature_data = temperature_data[chunk_index[0] : chunk_index[-1]]
+        else:
+            chunk_temperature_data = temperature_data[:0]
+
+        period_index = None
+        if not hourly:
+            period_index = TemperaturePeriodIndex(
+                chunk_index,
+                chunk_temperature_data.index,
+                tolerance=kwargs.get("tolerance"),
+            )
+        features = compute_temperature_features(
+            chunk_index, chunk_temperature_data, period_index=period_index, **kwargs
+        ).iloc[: stop - start]
+
+        if period_index is not None and len(period_index.period_positions) == 0:
+            # chunks without temperature data have fewer columns, so hold
+            # them back until the columns of a chunk with data are known.
+            if columns is None:
+                empty_chunks.append(features)
+                continue
+            features = features.reindex(columns=columns)
+        elif columns is None:
+            columns = features.columns
+            for empty_features in empty_chunks:
+                yield empty_features.reindex(columns=columns)
+            empty_chunks = []
+        yield features
+
+    # no temperature data in any chunk
+    for empty_features in empty_chunks:
+        yield empty_features
+
+
+def _get_segment_weights(data, segmentation):
+    # weights of each row in each segment, zero outside of the segment
+    if segmentation is None:
+        return ["occupancy"], np.ones((len(data), 1))
+    if not segmentation.index.equals(data.index):
+        segmentation = segmentation.reindex(data.index)
+    weights = segmentation.values.astype(float)
+    return list(segmentation.columns), np.where(weights > 0, weights, 0.0)
+
+
+def _get_hour_of_week_residual_counts(data, segmentation):
+    # numbers of positive residuals and of all residuals of the weighted least
+    # squares "meter_value ~ cdd_65 + hdd_50" of each segment in each hour of
+    # the week, with all segments solved from their weighted cross-products.
+    segment_names, weights = _get_segment_weights(data, segmentation)
+    # segments without any complete rows are not fit
+    has_data = (weights[data.notnull().all(axis=1).values] > 0).any(axis=0)
+
+    y = np.asarray(data.meter_value, dtype=float)
+    X = np.column_stack(
+        [
+            np.ones(len(data)),
+            np.asarray(data.cdd_65, dtype=float),
+            np.asarray(data.hdd_50, dtype=float),
+        ]
+    )
+    valid = ~np.isnan(y) & ~np.isnan(X).any(axis=1)
+    weights[~valid] = 0
+    y, X = np.where(valid, y, 0), np.where(valid[:, None], X, 0)
+
+    n_params = X.shape[1]
+    XtWX = (
+        weights.T @ (X[:, :, None] * X[:, None, :]).reshape(len(X), n_params**2)
+    ).reshape(len(segment_names), n_params, n_params)
+    XtWy = weights.T @ (X * y[:, None])
+    # scale to unit diagonal before the pseudo-inverse, which gives the same
+    # least squares solution as statsmodels if a column is all zeros
+    scale = np.sqrt(np.einsum("sii->si", XtWX))
+    scale[scale == 0] = 1
+    params = (
+        np.einsum(
+            "sij,sj->si",
+            np.linalg.pinv(XtWX / scale[:, :, None] / scale[:, None, :]),
+            XtWy / scale,
+        )
+        / scale
     )
 
-    def _is_high_usage(df):
-        if df.empty:
-            return np.nan
-        n_positive_residuals = sum(df.residuals > 0)
-        n_residuals = float(len(df.residuals))
-        ratio_positive_residuals = n_positive_residuals / n_residuals
-        return int(ratio_positive_residuals > threshold)
+    rows, segments = np.nonzero(weights)
+    hours = np.asarray(data.hour_of_week, dtype=float)[rows]
+    is_hour = _is_hour_of_week(hours)
+    rows, segments, hours = rows[is_hour], segments[is_hour], hours[is_hour]
+    residuals = y[rows] - (X[rows] * params[segments]).sum(axis=1)
 
+    groups = segments * 168 + hours.astype(int)
+    n_groups = len(segment_names) * 168
+    n_positive = np.bincount(groups[residuals > 0], minlength=n_groups)
+    n_residuals = np.bincount(groups, minlength=n_groups)
     return (
-        model_data_with_residuals.groupby(["hour_of_week"])
-        .apply(_is_high_usage)
-        .rename("occupancy")
-        .reindex(index)
-        .astype(bool)
-    )  # guarantee an index value for all hours
+        segment_names,
+        n_positive.reshape(len(segment_names), 168),
+        n_residuals.reshape(len(segment_names), 168),
+        has_data,
+    )
+
+
+class HourOfWeekResidualRatios(object):
+    """Ratios of positive residuals of the weighted least squares used to
+    estimate occupancy, for each hour of the week and segment.
+
+    Occupancy lookups for any threshold can be derived from these ratios
+    without refitting, e.g., to evaluate several thresholds.
+
+    Parameters
+    ----------
+    n_positive_residuals : :any:`pandas.DataFrame`
+        Number of positive residuals for each hour of the week (index) and
+        segment (columns).
+    n_residuals : :any:`pandas.DataFrame`
+        Number of residuals for each hour of the week and segment.
+    has_data : :any:`pandas.Series`
+        Whether each segment has any complete rows of data. Segments without
+        data have null occupancy.
+
+    Attributes
+    ----------
+    ratios : :any:`pandas.DataFrame`
+        Ratio of positive residuals for each hour of the week and segment, or
+        null if there are no residuals for that hour of the week or if the
+        segment has no data.
+    """
+
+    def __init__(self, n_positive_residuals, n_residuals, has_data):
+        self.n_positive_residuals = n_positive_residuals
+        self.n_residuals = n_residuals
+        self.has_data = has_data
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = n_positive_residuals.values / n_residuals.values
+        ratios[:, ~has_data.values] = np.nan
+        self.ratios = pd.DataFrame(
+            ratios, index=n_residuals.index, columns=n_residuals.columns
+        )
+
+    def __repr__(self):
+        return "HourOfWeekResidualRatios(segments={})".format(list(self.ratios.columns))
+
+    def get_occupancy_lookup(self, threshold=0.65):
+        """Get the occupancy lookup for a threshold.
+
+        Parameters
+        ----------
+        threshold : :any:`float`, default 0.65
+            Hours of week with a ratio of positive residuals greater than
+            ``threshold`` are marked as occupied, as are hours of week
+            without residuals. See :any:`eemeter.estimate_hour_of_week_occupancy`.
+
+        Returns
+        -------
+        occupancy_lookup : :any:`pandas.DataFrame`
+            The occupancy lookup, as returned by
+            :any:`eemeter.estimate_hour_of_week_occupancy`.
+        """
+        with np.errstate(invalid="ignore"):
+            occupancy = ~(self.ratios.values <= threshold)
+        has_data = self.has_data.values
+        # as in earlier versions of estimate_hour_of_week_occupancy, where the
+        # unnamed index of the all-null column of a segment without data
+        # replaced the "hour_of_week" name of the others on concatenation.
+        return pd.DataFrame(
+            {
+                segment_name: occupancy[:, i] if has_data[i] else np.full(168, np.nan)
+                for i, segment_name in enumerate(self.ratios.columns)
+            },
+            index=pd.CategoricalIndex(
+                range(168), name="hour_of_week" if has_data.all() else None
+            ),
+            columns=self.ratios.columns,
+        )
+
+    def get_occupancy_lookups(self, thresholds):
+        """Get the occupancy lookups for several thresholds.
+
+        Parameters
+        ----------
+        thresholds : iterable of :any:`float`
+            Thresholds, as in :any:`get_occupancy_lookup`.
+
+        Returns
+        -------
+        occupancy_lookups : :any:`dict`
+            Occupancy lookups keyed by threshold.
+        """
+        return {
+            threshold: self.get_occupancy_lookup(threshold) for threshold in thresholds
+        }
+
+
+def estimate_hour_of_week_residual_ratios(data, segmentation=None):
+    """Compute the ratios of positive residuals of the weighted least squares
+    used to estimate occupancy for each hour of the week and segment.
+
+    Parameters
+    ----------
+    data : :any:`pandas.DataFrame`
+        Input data, as in :any:`eemeter.estimate_hour_of_week_occupancy`.
+    segmentation : :any:`pandas.DataFrame`, default None
+        A segmentation, as in :any:`eemeter.estimate_hour_of_week_occupancy`.
+
+    Returns
+    -------
+    residual_ratios : :any:`eemeter.HourOfWeekResidualRatios`
+        Residual counts and ratios from which occupancy lookups can be derived
+        for any threshold.
+    """
+    (
+        segment_names,
+        n_positive,
+        n_residuals,
+        has_data,
+    ) = _get_hour_of_week_residual_counts(data, segmentation)
+    index = pd.CategoricalIndex(range(168), name="hour_of_week")
+    return HourOfWeekResidualRatios(
+        pd.DataFrame(n_positive.T, index=index, columns=segment_names),
+        pd.DataFrame(n_residuals.T, index=index, columns=segment_names),
+        pd.Series(has_data, index=segment_names),
+    )
 
 
 def estimate_hour_of_week_occupancy(data, segmentation=None, threshold=0.65):
@@ -608,74 +1589,51 @@ def estimate_hour_of_week_occupancy(data, segmentation=None, threshold=0.65):
         or unoccupied (0, False) for each of the segments. Each segment has a column
         labeled by its segment name.
     """
-    occupancy_lookups = {}
-    segmented_datasets = iterate_segmented_dataset(data, segmentation)
-    for segment_name, segmented_data in segmented_datasets:
-        hour_of_week_occupancy = _estimate_hour_of_week_occupancy(
-            segmented_data, threshold
-        )
-        column = "occupancy" if segment_name is None else segment_name
-        occupancy_lookups[column] = hour_of_week_occupancy
-    # make sure columns stay in same order
-    columns = ["occupancy"] if segmentation is None else segmentation.columns
-    return pd.DataFrame(occupancy_lookups, columns=columns)
-
-
-def _fit_temperature_bins(temperature_data, default_bins, min_temperature_count):
-    def _compute_temp_summary(bins):
-        bins = [-np.inf] + bins + [np.inf]
-        bin_intervals = [
-            pd.Interval(bin_left, bin_right, closed="right")
-            for bin_left, bin_right in zip(bins, bins[1:])
-        ]
-        temp_bins = pd.cut(temperature_data, bins=bins).cat.set_categories(
-            bin_intervals
-        )
-        return (
-            pd.DataFrame({"temp": temperature_data, "bin": temp_bins})
-            .groupby("bin")["temp"]
-            .count()
-            .rename("count")
-            .sort_index()
-        )
+    residual_ratios = estimate_hour_of_week_residual_ratios(data, segmentation)
+    return residual_ratios.get_occupancy_lookup(threshold)
 
-    def _find_endpoints_to_remove(temp_summary):
-        if len(temp_summary) == 1:
-            return set()
 
-        def _bin_count_invalid(i):
-            count = temp_summary.iloc[i]
-            return count < min_temperature_count or np.isnan(count)
+def _get_temperature_bin_counts(temperatures, groups, n_groups, endpoints):
+    # counts of non-null temperatures of each group in each of the bins
+    # (-inf, e_0], (e_0, e_1], ..., (e_n-1, inf] of the sorted endpoints
+    valid = temperatures > -np.inf
+    n_bins = len(endpoints) + 1
+    bins = np.searchsorted(endpoints, temperatures[valid], side="left")
+    return np.bincount(
+        groups[valid] * n_bins + bins, minlength=n_groups * n_bins
+    ).reshape(n_groups, n_bins)
 
-        # work from outside in assuming less density at distribution edges
-        endpoints = set()
 
-        if _bin_count_invalid(0):  # first
-            endpoints.add(temp_summary.index[0].right)
+def _fit_temperature_bins(bin_counts, endpoints, min_temperature_count):
+    # endpoints are only ever removed, so the counts of the remaining bins
+    # are sums of consecutive counts of the bins between all endpoints.
+    cumulative_counts = np.concatenate([[0], np.cumsum(bin_counts)])
+    keep = np.ones(len(endpoints), dtype=bool)
 
-        if _bin_count_invalid(-1):  # last
-            endpoints.add(temp_summary.index[-1].left)
+    while True:
+        kept = np.flatnonzero(keep)
+        if len(kept) == 0:  # a single bin
+            break
+        counts = np.diff(
+            cumulative_counts[np.concatenate([[0], kept + 1, [len(endpoints) + 1]])]
+        )
+        invalid = counts < min_temperature_count
 
-        if len(endpoints) == 0:
+        # work from outside in assuming less density at distribution edges
+        remove = []
+        if invalid[0]:  # first
+            remove.append(kept[0])
+        if invalid[-1]:  # last
+            remove.append(kept[-1])
+        if len(remove) == 0:
             # try points in middle
-            for i in range(1, len(temp_summary) - 1):
-                if _bin_count_invalid(i):
-                    endpoints.add(temp_summary.index[i].right)
+            remove = kept[1:][invalid[1:-1]]
 
-        return endpoints
-
-    test_bins = set(default_bins)
-
-    while True:
-        temp_summary = _compute_temp_summary(sorted(test_bins))
-        endpoints_to_remove = _find_endpoints_to_remove(temp_summary)
-
-        if len(endpoints_to_remove) == 0:
+        if len(remove) == 0:
             break
-        for endpoint in endpoints_to_remove:
-            test_bins.discard(endpoint)
+        keep[remove] = False
 
-    return sorted(test_bins)
+    return [endpoint for endpoint, k in zip(endpoints, keep) if k]
 
 
 def fit_temperature_bins(
@@ -713,103 +1671,76 @@ def fit_temperature_bins(
         A dataframe with boolean values indicating whether or not a bin was kept, with a
         categorical index for each candidate bin endpoint and a column for each segment.
     """
+    endpoints = sorted(set(default_bins))
+    temperatures = np.asarray(data.temperature_mean, dtype=float)
+
+    # rows of each segment, i.e., with positive weight
+    if segmentation is None:
+        segment_names = [None]
+        rows = np.arange(len(data))
+        segments = np.zeros(len(data), dtype=int)
+    else:
+        segment_names = list(segmentation.columns)
+        if not segmentation.index.equals(data.index):
+            segmentation = segmentation.reindex(data.index)
+        rows, segments = np.nonzero(segmentation.values > 0)
+
     if occupancy_lookup is None:
-        segmented_bins = {}
-        segmented_datasets = iterate_segmented_dataset(data, segmentation)
-        for segment_name, segmented_data in segmented_datasets:
-            segmented_bins[segment_name] = _fit_temperature_bins(
-                segmented_data.temperature_mean, default_bins, min_temperature_count
+        groups = segments
+    else:
+        # occupancy of each hour of the week for each segment
+        occupancy = np.empty((len(segment_names), 168), dtype=bool)
+        unknown = np.empty((len(segment_names), 168), dtype=bool)
+        for i, segment_name in enumerate(segment_names):
+            hour_occupancy = compute_occupancy_feature(
+                pd.Series(np.arange(168)),
+                occupancy_lookup["occupancy" if segment_name is None else segment_name],
+            ).values
+            unknown[i] = pd.isnull(hour_occupancy)
+            occupancy[i] = np.where(unknown[i], False, hour_occupancy)
+        hours_of_week = _get_time_feature_codes(data.index)["hour_of_week"][rows]
+        if unknown[segments, hours_of_week].any():
+            raise ValueError(
+                "occupancy_lookup is missing the occupancy of some hours of the week."
             )
+        occupied = occupancy[segments, hours_of_week]
+        # occupied, then unoccupied group of each segment
+        groups = 2 * segments + ~occupied
+
+    bin_counts = _get_temperature_bin_counts(
+        temperatures[rows],
+        groups,
+        len(segment_names) * (1 if occupancy_lookup is None else 2),
+        endpoints,
+    )
+    segmented_bins = [
+        _fit_temperature_bins(counts, endpoints, min_temperature_count)
+        for counts in bin_counts
+    ]
 
+    def _to_frame(segmented_bins):
         if segmentation is None:
-            bins = segmented_bins[None]
+            (bins,) = segmented_bins
             return pd.DataFrame(
                 {"keep_bin_endpoint": [endpoint in bins for endpoint in default_bins]},
                 index=pd.Series(default_bins, name="bin_endpoints"),
             )
-
         return pd.DataFrame(
             {
                 segment_name: [endpoint in bins for endpoint in default_bins]
-                for segment_name, bins in segmented_bins.items()
+                for segment_name, bins in zip(segment_names, segmented_bins)
             },
             columns=segmentation.columns,
             index=pd.Series(default_bins, name="bin_endpoints"),
         )
-    else:
-        occupied_segmented_bins = {}
-        unoccupied_segmented_bins = {}
-        segmented_datasets = iterate_segmented_dataset(data, segmentation)
-        for segment_name, segmented_data in segmented_datasets:
-            hourly_segmented_data = segmented_data.resample("H").mean()
-            time_features = compute_time_features(
-                hourly_segmented_data.index,
-                hour_of_week=True,
-                day_of_week=False,
-                hour_of_day=False,
-            )
-            if segment_name is None:
-                occupancy = occupancy_lookup["occupancy"]
-            else:
-                occupancy = occupancy_lookup[segment_name]
-            occupancy_features = compute_occupancy_feature(
-                time_features.hour_of_week, occupancy
-            )
-            occupied_temperatures = segmented_data.temperature_mean[occupancy_features]
-            unoccupied_temperatures = segmented_data.temperature_mean[
-                ~occupancy_features
-            ]
-            occupied_segmented_bins[segment_name] = _fit_temperature_bins(
-                occupied_temperatures, default_bins, min_temperature_count
-            )
-            unoccupied_segmented_bins[segment_name] = _fit_temperature_bins(
-                unoccupied_temperatures, default_bins, min_temperature_count
-            )
-
-        if segmentation is None:
-            occupied_bins = occupied_segmented_bins[None]
-            unoccupied_bins = unoccupied_segmented_bins[None]
-            return (
-                pd.DataFrame(
-                    {
-                        "keep_bin_endpoint": [
-                            endpoint in occupied_bins for endpoint in default_bins
-                        ]
-                    },
-                    index=pd.Series(default_bins, name="bin_endpoints"),
-                ),
-                pd.DataFrame(
-                    {
-                        "keep_bin_endpoint": [
-                            endpoint in unoccupied_bins for endpoint in default_bins
-                        ]
-                    },
-                    index=pd.Series(default_bins, name="bin_endpoints"),
-                ),
-            )
 
-        return (
-            pd.DataFrame(
-                {
-                    segment_name: [endpoint in bins for endpoint in default_bins]
-                    for segment_name, bins in occupied_segmented_bins.items()
-                },
-                columns=segmentation.columns,
-                index=pd.Series(default_bins, name="bin_endpoints"),
-            ),
-            pd.DataFrame(
-                {
-                    segment_name: [endpoint in bins for endpoint in default_bins]
-                    for segment_name, bins in unoccupied_segmented_bins.items()
-                },
-                columns=segmentation.columns,
-                index=pd.Series(default_bins, name="bin_endpoints"),
-            ),
-        )
+    if occupancy_lookup is None:
+        return _to_frame(segmented_bins)
+    return _to_frame(segmented_bins[::2]), _to_frame(segmented_bins[1::2])
 
 
 # TODO(philngo): combine with compute_temperature_features?
-def compute_temperature_bin_features(temperatures, bin_endpoints):
+def compute_temperature_bin_features(temperatures, bin_endpoints, out=None):
     """Compute temperature bin features.
 
     Parameters
@@ -818,6 +1749,10 @@ def compute_temperature_bin_features(temperatures, bin_endpoints):
         Hourly temperature data.
     bin_endpoints : :any:`list` of :any:`int` or :any:`float`
         List of bin endpoints to use when assigning features.
+    out : :any:`numpy.ndarray`, optional
+        Float array of shape ``(len(temperatures), len(bin_endpoints) + 1)``
+        into which to write the features, e.g., a slice of a larger design
+        matrix. The returned dataframe is backed by this array.
 
     Returns
     -------
@@ -826,39 +1761,32 @@ def compute_temperature_bin_features(temperatures, bin_endpoints):
         row (with all of the temperature bins) equals the input temperature. More
         details on this bin feature are available in the CalTRACK documentation.
     """
-    bin_endpoints = [-np.inf] + bin_endpoints + [np.inf]
-
-    bins = {}
-
-    for i, (left_bin, right_bin) in enumerate(zip(bin_endpoints, bin_endpoints[1:])):
-        bin_name = "bin_{}".format(i)
-
-        in_bin = (temperatures > left_bin) & (temperatures <= right_bin)
-        gt_bin = temperatures > right_bin
-
-        not_in_bin_index = temperatures.index[~in_bin]
-        gt_bin_index = temperatures.index[gt_bin]
-
-        def _expand_and_fill(partial_temp_series):
-            return partial_temp_series.reindex(temperatures.index, fill_value=0)
+    n_bins = len(bin_endpoints) + 1
+    shape = (len(temperatures), n_bins)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError("out must have shape {}. Found: {}".format(shape, out.shape))
+
+    # bin i holds the part of the temperature between its endpoints, i.e.,
+    # clip(T - left, 0, right - left), and the first bin holds min(T, right).
+    temperature_values = np.asarray(temperatures, dtype=float)
+    left = np.asarray(bin_endpoints, dtype=float)
+    right = np.append(left[1:], np.inf)
+    np.minimum(temperature_values, np.append(left, np.inf)[0], out=out[:, 0])
+    np.subtract(temperature_values[:, None], left, out=out[:, 1:])
+    np.clip(out[:, 1:], 0, right - left, out=out[:, 1:])
+
+    return pd.DataFrame(
+        out,
+        index=temperatures.index,
+        columns=["bin_{}".format(i) for i in range(n_bins)],
+        copy=False,
+    )
 
-        def _mask_nans(temp_series):
-            return temp_series[temperatures.notnull()].reindex(temperatures.index)
 
-        if i == 0:
-            temps_in_bin = _expand_and_fill(temperatures[in_bin])
-            temps_out_of_bin = _expand_and_fill(
-                pd.Series(right_bin, index=not_in_bin_index)
-            )
-            bin_values = temps_in_bin + temps_out_of_bin
-        else:
-            temps_in_bin = _expand_and_fill(temperatures[in_bin] - left_bin)
-            temps_gt_bin = _expand_and_fill(
-                pd.Series(right_bin - left_bin, index=gt_bin_index)
-            )
-            bin_values = temps_in_bin + temps_gt_bin
-        bins[bin_name] = _mask_nans(bin_values)
-    return pd.DataFrame(bins)
+def _is_hour_of_week(values):
+    return (values >= 0) & (values < 168) & (values == np.floor(values))
 
 
 def compute_occupancy_feature(hour_of_week, occupancy):
@@ -877,10 +1805,18 @@ def compute_occupancy_feature(hour_of_week, occupancy):
     occupancy_feature : :any:`pandas.Series`
         Occupancy labels for the timeseries.
     """
-    return pd.merge(
-        hour_of_week.dropna().to_frame(),
-        occupancy.to_frame("occupancy"),
-        how="left",
-        left_on="hour_of_week",
-        right_index=True,
-    ).occupancy.reindex(hour_of_week.index)
+    # position in occupancy of each of the 168 hours of the week, or -1
+    occupancy_hours = np.asarray(occupancy.index, dtype=float)
+    is_hour = _is_hour_of_week(occupancy_hours)
+    lookup = np.full(168, -1)
+    lookup[occupancy_hours[is_hour].astype(int)] = np.flatnonzero(is_hour)
+
+    hours = np.asarray(hour_of_week, dtype=float)
+    is_hour = _is_hour_of_week(hours)
+    positions = np.full(len(hours), -1)
+    positions[is_hour] = lookup[hours[is_hour].astype(int)]
+
+    # missing hours become NaN, upcasting like a join would
+    occupancy_feature = occupancy.reset_index(drop=True).reindex(positions)
+    occupancy_feature.index = hour_of_week.index
+    return occupancy_feature.rename("occupancy")
@@ -17,10 +17,18 @@
    limitations under the License.
 
 """
+import json
+import os
+import threading
+from urllib.parse import quote, unquote
+
 import numpy as np
 import pandas as pd
 
+from .features import TemperatureFeatureCache, _CachedTemperatures, _get_content_hash
+
 __all__ = (
+    "TemperatureFeatureStore",
     "meter_data_from_csv",
     "meter_data_from_json",
     "meter_data_to_csv",
@@ -304,3 +312,275 @@ def temperature_data_to_csv(temperature_data, path_or_buf):
     if temperature_data.name is None:
         temperature_data.name = "temperature"
     return temperature_data.to_frame().to_csv(path_or_buf, index=True)
+
+
+def _save_array(path, array):
+    # write to a temporary file and rename so that concurrent readers never
+    # see a partially written file.
+    tmp_path = "{}.{}-{}.tmp".format(path, os.getpid(), threading.get_ident())
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.asarray(array))
+    os.replace(tmp_path, path)
+
+
+class _StoredTemperatures(_CachedTemperatures):
+    """Aggregates of one hourly temperature series, memory-mapped from a
+    directory of a :any:`TemperatureFeatureStore`. Tables that are not found
+    on disk are computed and written."""
+
+    def __init__(self, path, max_period_indexes):
+        self.path = path
+        with open(os.path.join(path, "metadata.json")) as f:
+            self.metadata = json.load(f)
+        temperature_index = pd.date_range(
+            start=pd.Timestamp(self.metadata["start"]).tz_convert(self.metadata["tz"]),
+            periods=self.metadata["periods"],
+            freq="H",
+        )
+
+        def _load(name):
+            return np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+
+        super(_StoredTemperatures, self).__init__(
+            temperature_index,
+            _load("temperatures"),
+            max_period_indexes,
+            not_null=_load("not_null"),
+            filled=_load("filled"),
+        )
+
+    def _get_table(self, name, compute):
+        def _load_or_compute():
+            table_path = os.path.join(self.path, name + ".npy")
+            if os.path.exists(table_path):
+                return np.load(table_path, mmap_mode="r")
+            table = compute()
+            _save_array(table_path, table)
+            return table
+
+        return super(_StoredTemperatures, self)._get_table(name, _load_or_compute)
+
+
+class TemperatureFeatureStore(TemperatureFeatureCache):
+    """Disk-backed store of hourly temperature aggregates for each weather
+    station, shared by processes on the same machine.
+
+    Each station is a subdirectory of ``path`` holding memory-mappable
+    ``.npy`` arrays of its hourly temperatures and coverage, the mean
+    temperature and number of non-null hours of each day, and daily degree
+    day tables for each set of balance points used. Tables are written when
+    the station is added or else when they are first needed, so a fresh
+    worker process only maps them. The store can be passed as
+    ``temperature_cache`` wherever a :any:`eemeter.TemperatureFeatureCache`
+    is accepted, such as :any:`eemeter.compute_temperature_features`; stations
+    that are not yet in the store are added. Data given for a stored station
+    must match the stored data, as compared by a hash of its index and
+    values; use :any:`eemeter.TemperatureFeatureStore.add` to replace it.
+
+    Parameters
+    ----------
+    path : :any:`str`
+        Directory of the store. Created if it does not exist.
+    max_size : :any:`int`, optional
+        Maximum number of stations kept open in memory.
+    max_period_indexes : :any:`int`, optional
+        Maximum number of period indexes to keep in memory for each station.
+    """
+
+    def __init__(self, path, max_size=128, max_period_indexes=32):
+        super(TemperatureFeatureStore, self).__init__(
+            max_size=max_size, max_period_indexes=max_period_indexes
+        )
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def __repr__(self):
+        return "TemperatureFeatureStore(path={!r}, size={})".format(
+            self.path, len(self)
+        )
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self._get_path(key), "metadata.json"))
+
+    def _get_path(self, key):
+        if not isinstance(key, str) or key == "":
+            raise ValueError("key must be a non-empty string: {!r}".format(key))
+        return os.path.join(self.path, quote(key, safe=""))
+
+    def keys(self):
+        """Keys of the stations in the store.
+
+        Returns
+        -------
+        keys : :any:`list` of :any:`str`
+            Sorted station keys.
+        """
+        return sorted(
+            unquote(name)
+            for name in os.listdir(self.path)
+            if os.path.exists(os.path.join(self.path, name, "metadata.json"))
+        )
+
+    def _write(self, key, temperature_data):
+        if temperature_data.index.freq != "H":
+            raise ValueError(
+                "temperature_data.index must have hourly frequency (freq='H')."
+                " Found: {}".format(temperature_data.index.freq)
+            )
+        if not temperature_data.index.tz:
+            raise ValueError(
+                "temperature_data.index must be timezone-aware. You can set it"
+                " with temperature_data.tz_localize(...)."
+            )
+        path = self._get_path(key)
+        os.makedirs(path, exist_ok=True)
+        # tables of any previous data for this key are stale.
+        metadata_path = os.path.join(path, "metadata.json")
+        if os.path.exists(metadata_path):
+            os.remove(metadata_path)
+        for name in os.listdir(path):
+            if name.startswith("daily_"):
+                os.remove(os.path.join(path, name))
+
+        temperatures = temperature_data.to_numpy(dtype=float)
+        is_not_null = ~np.isnan(temperatures)
+        _save_array(os.path.join(path, "temperatures.npy"), temperatures)
+        _save_array(os.path.join(path, "not_null.npy"), is_not_null)
+        _save_array(
+            os.path.join(path, "filled.npy"), np.where(is_not_null, temperatures, 0.0)
+        )
+        metadata = {
+            "start": temperature_data.index[0].isoformat()
+            if len(temperature_data) > 0
+            else pd.Timestamp(0, tz="UTC").isoformat(),
+            "periods": len(temperature_data),
+            "tz": str(temperature_data.index.tz),
+            "content_hash": _get_content_hash(temperature_data),
+        }
+        tmp_path = "{}.{}-{}.tmp".format(
+            metadata_path, os.getpid(), threading.get_ident()
+        )
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, metadata_path)
+
+    def _create_entry(self, temperature_data, key):
+        if key not in self:
+            self._write(key, temperature_data)
+            return _StoredTemperatures(self._get_path(key), self.max_period_indexes)
+        entry = _StoredTemperatures(self._get_path(key), self.max_period_indexes)
+        # stores written without a content hash are also treated as stale.
+        if entry.metadata.get("content_hash") != _get_content_hash(temperature_data):
+            raise ValueError(
+                "temperature_data does not match the data stored for key {!r}."
+                " Use TemperatureFeatureStore.add to replace it.".format(key)
+            )
+        return entry
+
+    def add(
+        self,
+        key,
+        temperature_data,
+        day_start_tz=None,
+        cooling_balance_points=None,
+        heating_balance_points=None,
+    ):
+        """Write hourly temperature data of a station to the store, replacing
+        any data stored for ``key``, and precompute its daily tables.
+
+        Parameters
+        ----------
+        key : :any:`str`
+            Station key, e.g., a weather station id.
+        temperature_data : :any:`pandas.Series`
+            Hourly temperature data in eemeter format.
+        day_start_tz : :any:`str`, optional
+            Daily tables are precomputed for days starting at midnight in this
+            timezone, e.g., the timezone of the meter data. Defaults to the
+            timezone of ``temperature_data``. Days with other start times
+            are computed and written on first use.
+        cooling_balance_points, heating_balance_points : :any:`list` of :any:`float`, optional
+            Balance points of the daily degree day tables to precompute, e.g.,
+            ``range(30, 91)`` for CalTRACK design matrices.
+        """
+        self._write(key, temperature_data)
+        with self._lock:
+            self._entries.pop(key, None)
+        entry = self.get(temperature_data, key=key)
+
+        if day_start_tz is None:
+            day_start_tz = temperature_data.index.tz
+        local_index = temperature_data.index.tz_convert(day_start_tz)
+        midnights = np.flatnonzero((local_index.hour == 0) & (local_index.minute == 0))
+        for offset in np.unique(midnights % 24):
+            entry.get_daily_values(offset)
+            if cooling_balance_points is not None or heating_balance_points is not None:
+                entry.get_daily_degree_days(
+                    offset,
+                    [] if cooling_balance_points is None else cooling_balance_points,
+                    [] if heating_balance_points is None else heating_balance_points,
+                )
+
+    def add_csv(
+        self,
+        key,
+        filepath_or_buffer,
+        day_start_tz=None,
+        cooling_balance_points=None,
+        heating_balance_points=None,
+        **kwargs
+    ):
+        """Load hourly temperature data of a station with
+        :any:`eemeter.temperature_data_from_csv` and add it to the store.
+
+        Parameters
+        ----------
+        key : :any:`str`
+            Station key, e.g., a weather station id.
+        filepath_or_buffer : :any:`str` or file-handle
+            File path or object.
+        day_start_tz, cooling_balance_points, heating_balance_points
+            See :any:`add`.
+        **kwargs
+            Extra keyword arguments to pass to
+            :any:`eemeter.temperature_data_from_csv`, such as
+            ``freq='hourly'``.
+
+        Returns
+        -------
+        temperature_data : :any:`pandas.Series`
+            The loaded temperature data.
+        """
+        temperature_data = temperature_data_from_csv(filepath_or_buffer, **kwargs)
+        self.add(
+            key,
+            temperature_data,
+            day_start_tz=day_start_tz,
+            cooling_balance_points=cooling_balance_points,
+            heating_balance_points=heating_balance_points,
+        )
+        return temperature_data
+
+    def load_temperature_data(self, key):
+        """Load the hourly temperature data of a station, memory-mapped from
+        the store.
+
+        Parameters
+        ----------
+        key : :any:`str`
+            Station key.
+
+        Returns
+        -------
+        temperature_data : :any:`pandas.Series`
+            Hourly temperature data in eemeter format, which can be passed
+            with this store to :any:`eemeter.compute_temperature_features`.
+        """
+        if key not in self:
+            raise KeyError(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = _StoredTemperatures(self._get_path(key), self.max_period_indexes)
+            self._insert(key, entry)
+        return pd.Series(entry.temperatures, index=entry.temperature_index)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2023 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+"""
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import time
+import traceback
+
+from .caltrack.design_matrices import (
+    create_caltrack_billing_design_matrix,
+    create_caltrack_daily_design_matrix,
+)
+from .caltrack.usage_per_day import fit_caltrack_usage_per_day_model
+from .derivatives import metered_savings
+
+
+__all__ = ("PortfolioMeter", "PortfolioMeterResult", "CalTRACKPortfolioRunner")
+
+
+PortfolioMeter = namedtuple(
+    "PortfolioMeter",
+    ["meter_id", "baseline_meter_data", "reporting_meter_data", "temperature_data"],
+)
+PortfolioMeter.__doc__ = """Input for a single meter of a portfolio.
+
+``reporting_meter_data`` may be None, in which case savings are not computed.
+"""
+
+
+class PortfolioMeterResult(object):
+    """Contains the outcome of running the CalTRACK pipeline for one meter.
+
+    Attributes
+    ----------
+    meter_id : :any:`object`
+        The ``meter_id`` of the :any:`eemeter.PortfolioMeter`.
+    status : :any:`str`
+        A string indicating the status of this result. Possible statuses:
+
+        - ``'SUCCESS'``: The pipeline ran to completion (the model itself
+          may still have status ``'NO MODEL'`` or ``'NO DATA'``).
+        - ``'FAILED'``: An exception was raised for this meter. See
+          ``error``.
+
+    model_results : :any:`eemeter.CalTRACKUsagePerDayModelResults` or :any:`None`
+        The fitted baseline model results, if any.
+    savings : :any:`tuple` or :any:`None`
+        The output of :any:`eemeter.metered_savings`, if computed, i.e., if
+        reporting data was given and a model was selected.
+    error : :any:`str` or :any:`None`
+        The formatted traceback of the exception raised for this meter, if any.
+    elapsed_seconds : :any:`float`
+        Time spent on this meter in the worker.
+    """
+
+    def __init__(
+        self,
+        meter_id,
+        status,
+        model_results=None,
+        savings=None,
+        error=None,
+        elapsed_seconds=0.0,
+    ):
+        self.meter_id = meter_id
+        self.status = status  # SUCCESS | FAILED
+        self.model_results = model_results
+        self.savings = savings
+        self.error = error
+        self.elapsed_seconds = elapsed_seconds
+
+    def __repr__(self):
+        return "PortfolioMeterResult(meter_id={!r}, status='{}')".format(
+            self.meter_id, self.status
+        )
+
+
+def _run_portfolio_meter(meter, billing, fit_kwargs, savings_kwargs):
+    start = time.time()
+    meter_id = meter[0] if isinstance(meter, tuple) and len(meter) > 0 else None
+    try:
+        meter = PortfolioMeter(*meter)
+        if billing:
+            design_matrix = create_caltrack_billing_design_matrix(
+                meter.baseline_meter_data, meter.temperature_data
+            )
+        else:
+            design_matrix = create_caltrack_daily_design_matrix(
+                meter.baseline_meter_data, meter.temperature_data
+            )
+        model_results = fit_caltrack_usage_per_day_model(design_matrix, **fit_kwargs)
+        model_results.metadata["meter_id"] = meter_id
+
+        savings = None
+        if meter.reporting_meter_data is not None and model_results.model is not None:
+            savings = metered_savings(
+                model_results,
+                meter.reporting_meter_data,
+                meter.temperature_data,
+                **savings_kwargs
+            )
+    except Exception:
+        return PortfolioMeterResult(
+            meter_id,
+            "FAILED",
+            error=traceback.format_exc(),
+            elapsed_seconds=time.time() - start,
+        )
+    return PortfolioMeterResult(
+        meter_id,
+        "SUCCESS",
+        model_results=model_results,
+        savings=savings,
+        elapsed_seconds=time.time() - start,
+    )
+
+
+def _run_portfolio_chunk(meters, billing, fit_kwargs, savings_kwargs):
+    return [
+        _run_portfolio_meter(meter, billing, fit_kwargs, savings_kwargs)
+        for meter in meters
+    ]
+
+
+class CalTRACKPortfolioRunner(object):
+    """Runs the CalTRACK usage per day pipeline (design matrix, model fit and
+    metered savings) for many meters on a pool of worker processes.
+
+    Meters are sent to workers in chunks to amortize inter-process overhead,
+    and only a bounded number of chunks are in flight at any time so that
+    inputs can be streamed. Exceptions raised for a meter are captured in its
+    :any:`eemeter.PortfolioMeterResult` and do not affect other meters.
+
+    Parameters
+    ----------
+    n_workers : :any:`int`, optional
+        Number of worker processes. Defaults to the number of processors on
+        the machine. If ``executor`` is given, this should be its number of
+        workers; it is used for the default ``max_pending_chunks`` and for
+        ``worker_utilization``.
+    chunk_size : :any:`int`, optional
+        Number of meters sent to a worker at once.
+    max_pending_chunks : :any:`int`, optional
+        Maximum number of chunks submitted but not yet completed. Defaults to
+        twice the number of workers.
+    billing : :any:`bool`, optional
+        If True, use :any:`eemeter.create_caltrack_billing_design_matrix` and
+        billing presets (``use_billing_presets=True``,
+        ``weights_col='n_days_kept'``) unless overridden in ``fit_kwargs``.
+        Otherwise use :any:`eemeter.create_caltrack_daily_design_matrix`.
+    fit_kwargs : :any:`dict`, optional
+        Extra kwargs passed to :any:`eemeter.fit_caltrack_usage_per_day_model`.
+    savings_kwargs : :any:`dict`, optional
+        Extra kwargs passed to :any:`eemeter.metered_savings`.
+    executor : :any:`concurrent.futures.Executor`, optional
+        An existing executor to submit chunks to. It is not shut down by the
+        runner. If not given, a :any:`concurrent.futures.ProcessPoolExecutor`
+        is created for each call to :any:`run`.
+
+    Attributes
+    ----------
+    counters : :any:`dict`
+        Throughput counters of the last (or current) call to :any:`run`:
+        ``n_submitted``, ``n_completed``, ``n_succeeded``, ``n_failed``,
+        ``n_chunks``, ``elapsed_seconds`` (wall clock), ``worker_seconds``
+        (sum of per-meter time in workers), ``meters_per_second`` and
+        ``worker_utilization`` (``worker_seconds`` divided by
+        ``elapsed_seconds`` times ``n_workers``).
+    """
+
+    def __init__(
+        self,
+        n_workers=None,
+        chunk_size=10,
+        max_pending_chunks=None,
+        billing=False,
+        fit_kwargs=None,
+        savings_kwargs=None,
+        executor=None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1: {}".format(chunk_size))
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.billing = billing
+
+        if fit_kwargs is None:
+            fit_kwargs = {}
+        if billing:
+            fit_kwargs = dict(
+                {"use_billing_presets": True, "weights_col": "n_days_kept"},
+                **fit_kwargs
+            )
+        self.fit_kwargs = fit_kwargs
+
+        if savings_kwargs is None:
+            savings_kwargs = {}
+        self.savings_kwargs = savings_kwargs
+
+        self.executor = executor
+        self.counters = self._empty_counters()
+
+    def __repr__(self):
+        return "CalTRACKPortfolioRunner(n_workers={}, chunk_size={})".format(
+            self.n_workers, self.chunk_size
+        )
+
+    def _empty_counters(self):
+        return {
+            "n_submitted": 0,
+            "n_completed": 0,
+            "n_succeeded": 0,
+            "n_failed": 0,
+            "n_chunks": 0,
+            "elapsed_seconds": 0.0,
+            "worker_seconds": 0.0,
+            "meters_per_second": 0.0,
+            "worker_utilization": 0.0,
+        }
+
+    def _iter_chunks(self, meters):
+        chunk = []
+        for meter in meters:
+            chunk.append(tuple(meter))
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk
+
+    def run(self, meters):
+        """Run the pipeline for each meter, yielding results as they complete.
+
+        Parameters
+        ----------
+        meters : iterable of :any:`eemeter.PortfolioMeter`
+            Meter inputs. Plain tuples in the same order as the fields of
+            :any:`eemeter.PortfolioMeter` are also accepted. Consumed lazily.
+
+        Yields
+        ------
+        result : :any:`eemeter.PortfolioMeterResult`
+            Result of each meter, in order of completion.
+        """
+        if self.executor is None:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        else:
+            executor = self.executor
+        n_workers = self.n_workers or os.cpu_count() or 1
+        max_pending_chunks = self.max_pending_chunks or 2 * n_workers
+
+        self.counters = counters = self._empty_counters()
+        start = time.time()
+
+        def _update_counters(results):
+            for result in results:
+                counters["n_completed"] += 1
+                if result.status == "SUCCESS":
+                    counters["n_succeeded"] += 1
+                else:
+                    counters["n_failed"] += 1
+                counters["worker_seconds"] += result.elapsed_seconds
+            elapsed = time.time() - start
+            counters["elapsed_seconds"] = elapsed
+            if elapsed > 0:
+                counters["meters_per_second"] = counters["n_completed"] / elapsed
+                counters["worker_utilization"] = counters["worker_seconds"] / (
+                    elapsed * n_workers
+                )
+
+        try:
+            chunks = self._iter_chunks(meters)
+            pending = {}
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending_chunks:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(
+                        _run_portfolio_chunk,
+                        chunk,
+                        self.billing,
+                        self.fit_kwargs,
+                        self.savings_kwargs,
+                    )
+                    pending[future] = chunk
+                    counters["n_submitted"] += len(chunk)
+                    counters["n_chunks"] += 1
+                if len(pending) == 0:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception:
+                        # e.g., a worker process died; fail the whole chunk
+                        error = traceback.format_exc()
+                        results = [
+                            PortfolioMeterResult(
+                                meter[0] if len(meter) > 0 else None,
+                                "FAILED",
+                                error=error,
+                            )
+                            for meter in chunk
+                        ]
+                    _update_counters(results)
+                    for result in results:
+                        yield result
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=True)
@@ -17,6 +17,7 @@
    limitations under the License.
 
 """
+import pandas as pd
 import pytest
 
 from eemeter.caltrack.design_matrices import (
@@ -24,7 +25,9 @@ from eemeter.caltrack.design_matrices import (
     create_caltrack_hourly_segmented_design_matrices,
     create_caltrack_daily_design_matrix,
     create_caltrack_billing_design_matrix,
+    LazyDegreeDayDesignMatrix,
 )
+from eemeter.caltrack.usage_per_day import fit_caltrack_usage_per_day_model
 from eemeter.features import estimate_hour_of_week_occupancy, fit_temperature_bins
 from eemeter.segmentation import segment_time_series
 
@@ -424,3 +427,84 @@ def test_create_caltrack_billing_design_matrix_partial_empty_temp(
         meter_data[:10], temperature_data
     )
     assert "n_days_kept" in design_matrix.columns
+
+
+@pytest.mark.parametrize(
+    "create_design_matrix",
+    [create_caltrack_daily_design_matrix, create_caltrack_billing_design_matrix],
+)
+def test_create_caltrack_design_matrix_lazy_degree_days(
+    il_electricity_cdd_hdd_billing_monthly, create_design_matrix
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    if create_design_matrix is create_caltrack_daily_design_matrix:
+        meter_data = meter_data.resample("D").mean()[:200]
+    design_matrix = create_design_matrix(meter_data, temperature_data)
+    lazy_design_matrix = create_design_matrix(
+        meter_data, temperature_data, lazy_degree_days=True
+    )
+    assert isinstance(lazy_design_matrix, LazyDegreeDayDesignMatrix)
+    assert list(lazy_design_matrix.columns) == list(design_matrix.columns)
+    assert lazy_design_matrix.shape == design_matrix.shape
+    assert lazy_design_matrix.nbytes < design_matrix.memory_usage().sum()
+    pd.testing.assert_frame_equal(lazy_design_matrix.to_frame(), design_matrix)
+    pd.testing.assert_series_equal(lazy_design_matrix.cdd_65, design_matrix.cdd_65)
+    pd.testing.assert_frame_equal(
+        lazy_design_matrix[["hdd_60", "meter_value", "cdd_70"]],
+        design_matrix[["hdd_60", "meter_value", "cdd_70"]],
+    )
+    with pytest.raises(KeyError):
+        lazy_design_matrix[["cdd_100"]]
+    with pytest.raises(AttributeError):
+        lazy_design_matrix.cdd_100
+
+    index = design_matrix.index[5:20].append(pd.DatetimeIndex(["2030-01-01"], tz="UTC"))
+    pd.testing.assert_frame_equal(
+        lazy_design_matrix.reindex(index).to_frame(), design_matrix.reindex(index)
+    )
+    pd.testing.assert_frame_equal(
+        lazy_design_matrix.dropna().to_frame(), design_matrix.dropna()
+    )
+
+
+def test_fit_caltrack_usage_per_day_model_lazy_degree_days(
+    il_electricity_cdd_hdd_billing_monthly,
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    kwargs = dict(use_billing_presets=True, weights_col="n_days_kept")
+    model_results = fit_caltrack_usage_per_day_model(
+        create_caltrack_billing_design_matrix(meter_data, temperature_data), **kwargs
+    )
+    lazy_model_results = fit_caltrack_usage_per_day_model(
+        create_caltrack_billing_design_matrix(
+            meter_data, temperature_data, lazy_degree_days=True
+        ),
+        **kwargs
+    )
+    assert lazy_model_results.model.formula == model_results.model.formula
+    assert lazy_model_results.model.model_params == pytest.approx(
+        model_results.model.model_params
+    )
+    assert [c.status for c in lazy_model_results.candidates] == [
+        c.status for c in model_results.candidates
+    ]
+    assert lazy_model_results.totals_metrics.cvrmse == pytest.approx(
+        model_results.totals_metrics.cvrmse
+    )
+
+
+@pytest.mark.parametrize("n_temperatures", [0, 200])
+def test_create_caltrack_billing_design_matrix_lazy_degree_days_empty_temp(
+    il_electricity_cdd_hdd_billing_monthly, n_temperatures
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"][:10]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"][
+        :n_temperatures
+    ]
+    design_matrix = create_caltrack_billing_design_matrix(meter_data, temperature_data)
+    lazy_design_matrix = create_caltrack_billing_design_matrix(
+        meter_data, temperature_data, lazy_degree_days=True
+    )
+    pd.testing.assert_frame_equal(lazy_design_matrix.to_frame(), design_matrix)
@@ -167,6 +167,40 @@ def test_fit_caltrack_hourly_model_segment(segmented_design_matrices):
     assert round(prediction.sum(), 2) == 960.0
 
 
+def test_fit_caltrack_hourly_model_segment_numpy(segmented_design_matrices):
+    segment_name = "dec-jan-feb-weighted"
+    segment_data = segmented_design_matrices[segment_name]
+    statsmodels_model = fit_caltrack_hourly_model_segment(
+        segment_name, segment_data.copy()
+    )
+    numpy_model = fit_caltrack_hourly_model_segment(
+        segment_name, segment_data.copy(), fit_engine="numpy"
+    )
+    assert numpy_model.formula == statsmodels_model.formula
+    assert numpy_model.model is None
+    assert list(numpy_model.model_params) == list(statsmodels_model.model_params)
+    # the bins of this small dataset are collinear, so compare fitted values
+    prediction = numpy_model.predict(segment_data)
+    assert prediction.values == pytest.approx(
+        statsmodels_model.predict(segment_data).values
+    )
+    assert round(prediction.sum(), 2) == 960.0
+    assert numpy_model.totals_metrics.observed_length == (
+        statsmodels_model.totals_metrics.observed_length
+    )
+    assert numpy_model.totals_metrics.r_squared == pytest.approx(
+        statsmodels_model.totals_metrics.r_squared
+    )
+
+
+def test_fit_caltrack_hourly_model_segment_bad_fit_engine(segmented_design_matrices):
+    segment_name = "dec-jan-feb-weighted"
+    with pytest.raises(ValueError):
+        fit_caltrack_hourly_model_segment(
+            segment_name, segmented_design_matrices[segment_name], fit_engine="bad"
+        )
+
+
 @pytest.fixture
 def temps():
     index = pd.date_range(start="2017-01-01", periods=24, freq="H", tz="UTC")
@@ -17,18 +17,27 @@
    limitations under the License.
 
 """
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import json
 
 import numpy as np
 import pandas as pd
 import pytest
+import statsmodels.formula.api as smf
 
+from eemeter.caltrack import usage_per_day
 from eemeter.caltrack.usage_per_day import (
     CalTRACKUsagePerDayCandidateModel,
     CalTRACKUsagePerDayModelResults,
+    CalTRACKUsagePerDayModelState,
     DataSufficiency,
+    _WLSSufficientStatistics,
     _caltrack_predict_design_matrix,
+    _get_degree_day_statistics,
+    _get_wls_moments,
+    _get_wls_values,
     fit_caltrack_usage_per_day_model,
+    fit_caltrack_usage_per_day_models,
     caltrack_usage_per_day_predict,
     caltrack_sufficiency_criteria,
     get_intercept_only_candidate_models,
@@ -43,6 +52,7 @@ from eemeter.caltrack.usage_per_day import (
 )
 from eemeter.exceptions import MissingModelParameterError, UnrecognizedModelTypeError
 from eemeter.features import (
+    TemperaturePeriodIndex,
     compute_time_features,
     compute_temperature_features,
     compute_usage_per_day_feature,
@@ -885,6 +895,23 @@ def test_get_total_degree_day_too_low_warning_fail():
     }
 
 
+def test_get_degree_day_statistics():
+    data = pd.DataFrame(
+        {
+            "cdd_65": [0, 0.1, np.nan, 5],
+            "hdd_65": [2, 0, 1, 0],
+            "n_days": [30, 31, 30, np.nan],
+        }
+    )
+    degree_day_statistics = _get_degree_day_statistics(data, "n_days")
+    assert degree_day_statistics == {
+        "cdd_65": (pytest.approx(3.1), 2),
+        "hdd_65": (pytest.approx(90.0), 2),
+    }
+    degree_day_statistics = _get_degree_day_statistics(data, None, ["cdd_65"])
+    assert degree_day_statistics == {"cdd_65": (pytest.approx(5.1), 2)}
+
+
 def test_get_parameter_negative_warning_ok():
     warnings = get_parameter_negative_warning(
         "intercept_only", {"intercept": 0}, "intercept"
@@ -1401,6 +1428,131 @@ def test_get_cdd_hdd_candidate_models_error():
     assert warning.data["traceback"] is not None
 
 
+def test_get_cdd_hdd_candidate_models_fit_engine_numpy():
+    data = pd.DataFrame(
+        {
+            "meter_value": [6, 1, 1, 6, 3],
+            "cdd_65": [5, 0, 0.1, 0, 2],
+            "hdd_65": [0, 0.1, 0.1, 5, 1],
+            "weights": [1, 1, 100, 1, 2],
+        }
+    )
+    sm_model = get_cdd_hdd_candidate_models(
+        data, 1, 1, 1, 1, 0.1, 0.1, "weights", fit_engine="statsmodels"
+    )[0]
+    np_model = get_cdd_hdd_candidate_models(
+        data, 1, 1, 1, 1, 0.1, 0.1, "weights", fit_engine="numpy"
+    )[0]
+    assert np_model.status == sm_model.status
+    assert sorted(np_model.model_params) == sorted(sm_model.model_params)
+    for key, value in sm_model.model_params.items():
+        assert np_model.model_params[key] == pytest.approx(value)
+    assert np_model.r_squared_adj == pytest.approx(sm_model.r_squared_adj)
+
+
+def test_wls_sufficient_statistics_matches_statsmodels():
+    data = pd.DataFrame(
+        {
+            "meter_value": [6, 1, 1, 6, 3, np.nan, 2],
+            "cdd_65": [5, 0, 0.1, 0, 2, 1, np.nan],
+            "hdd_65": [0, 0.1, 0.1, 5, 1, 0, 0.5],
+            "weights": [1, 1, 100, 1, 2, 1, 3],
+        }
+    )
+    sufficient_statistics = _WLSSufficientStatistics(data, "weights")
+    assert sufficient_statistics.columns == ["cdd_65", "hdd_65"]
+    # row 6 is only partially missing, so single-column fits can't share rows
+    assert sufficient_statistics.shared_rows is False
+
+    for columns in [["cdd_65", "hdd_65"], ["hdd_65"], []]:
+        formula = "meter_value ~ {}".format(" + ".join(columns) or "1")
+        result = smf.wls(formula, data=data, weights=data.weights).fit()
+        params, pvalues, r_squared_adj = sufficient_statistics.fit(columns)
+        for name, value in result.params.items():
+            assert params[name] == pytest.approx(value)
+            assert pvalues[name] == pytest.approx(result.pvalues[name])
+        if columns:
+            assert r_squared_adj == pytest.approx(result.rsquared_adj)
+
+
+def test_wls_sufficient_statistics_row_chunks(monkeypatch):
+    data = pd.DataFrame(
+        {
+            "meter_value": [6, 1, 1, 6, 3, np.nan, 2],
+            "cdd_65": [5, 0, 0.1, 0, 2, 1, np.nan],
+            "hdd_65": [0, 0.1, 0.1, 5, 1, 0, 0.5],
+            "weights": [1, 1, 100, 1, 2, 1, 3],
+        }
+    )
+    columns = ["cdd_65", "hdd_65"]
+    values, weights = _get_wls_values(data, "weights", columns)
+    moments = _get_wls_moments(values[None], weights[None])
+    degree_day_statistics = _get_degree_day_statistics(data, "weights")
+
+    monkeypatch.setattr(usage_per_day, "_ROW_CHUNK_SIZE", 2)
+    sufficient_statistics = _WLSSufficientStatistics(data, "weights")
+    assert sufficient_statistics.nobs == moments[0][0]
+    assert sufficient_statistics.sum_weights == pytest.approx(moments[1][0])
+    assert sufficient_statistics.means == pytest.approx(moments[2][0])
+    assert sufficient_statistics.cross_products == pytest.approx(moments[3][0])
+    assert sufficient_statistics.shared_rows is False
+    assert sufficient_statistics.shared_intercept_rows is False
+    for column, (total, n_non_zero) in _get_degree_day_statistics(
+        data, "weights"
+    ).items():
+        assert total == pytest.approx(degree_day_statistics[column][0])
+        assert n_non_zero == degree_day_statistics[column][1]
+
+
+def test_wls_sufficient_statistics_r_squared_adj_rank_deficient():
+    cdd = np.linspace(0, 10, 20)
+    data = pd.DataFrame(
+        {
+            "meter_value": 2 * cdd + np.sin(np.arange(20)),
+            "cdd_65": cdd,
+            "hdd_60": 0.3 * cdd,
+            "hdd_50": np.cos(np.arange(20)),
+        }
+    )
+    sufficient_statistics = _WLSSufficientStatistics(data, None)
+    bounds = sufficient_statistics.r_squared_adj(
+        [["cdd_65", "hdd_60"], ["cdd_65", "hdd_50"], ["cdd_65"]]
+    )
+    # linearly dependent regressors have no bound
+    assert np.isnan(bounds[0])
+    for bound, columns in zip(bounds[1:], [["cdd_65", "hdd_50"], ["cdd_65"]]):
+        _, _, r_squared_adj = sufficient_statistics.fit(columns)
+        assert bound == pytest.approx(r_squared_adj)
+
+
+def test_candidate_model_lazy_statsmodels_objects():
+    data = pd.DataFrame({"meter_value": [1, 1, 1, 6], "cdd_65": [0, 0.1, 0, 5]})
+    model = get_cdd_only_candidate_models(data, 1, 1, 0.1, None)[0]
+    assert model._model is None
+    assert model._result is None
+    assert model.fit_data is data
+    assert round(model.p_values["cdd_65"], 4) == 0.0002
+    assert model.result is not None
+    assert model.model is not None
+    assert model.result.params["cdd_65"] == pytest.approx(
+        model.model_params["beta_cdd"]
+    )
+    assert model.result.pvalues["cdd_65"] == pytest.approx(model.p_values["cdd_65"])
+
+
+def test_get_cdd_only_candidate_models_fit_engine_numpy_error():
+    data = pd.DataFrame({"meter_value": [], "cdd_65": []})
+    candidate_models = get_cdd_only_candidate_models(
+        data, 0, 0, 0.1, None, fit_engine="numpy"
+    )
+    assert len(candidate_models) == 1
+    model = candidate_models[0]
+    assert model.status == "ERROR"
+    assert len(model.warnings) == 1
+    warning = model.warnings[0]
+    assert warning.qualified_name == ("eemeter.caltrack_daily.cdd_only.model_results")
+
+
 @pytest.fixture
 def candidate_model_qualified_high_r2():
     return CalTRACKUsagePerDayCandidateModel(
@@ -1537,6 +1689,326 @@ def test_fit_caltrack_usage_per_day_model_cdd_only(
     assert round(prediction_df.predicted_usage.sum(), 2) == 10192.0
 
 
+def test_fit_caltrack_usage_per_day_model_fit_engine_numpy(cdd_hdd_h60_c65):
+    sm_results = fit_caltrack_usage_per_day_model(cdd_hdd_h60_c65)
+    np_results = fit_caltrack_usage_per_day_model(cdd_hdd_h60_c65, fit_engine="numpy")
+    assert np_results.settings["fit_engine"] == "numpy"
+    assert len(np_results.candidates) == len(sm_results.candidates)
+    for sm_candidate, np_candidate in zip(sm_results.candidates, np_results.candidates):
+        assert np_candidate.formula == sm_candidate.formula
+        assert np_candidate.status == sm_candidate.status
+        for key, value in sm_candidate.model_params.items():
+            assert np_candidate.model_params[key] == pytest.approx(value)
+        assert np_candidate.r_squared_adj == pytest.approx(sm_candidate.r_squared_adj)
+    assert np_results.model.formula == sm_results.model.formula
+
+
+@pytest.fixture
+def cdd_hdd_grid(il_electricity_cdd_hdd_daily):
+    meter_data = il_electricity_cdd_hdd_daily["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    blackout_start_date = il_electricity_cdd_hdd_daily["blackout_start_date"]
+    temperature_features = compute_temperature_features(
+        meter_data.index,
+        temperature_data,
+        heating_balance_points=range(50, 71, 2),
+        cooling_balance_points=range(55, 76, 2),
+        use_mean_daily_values=True,
+    )
+    meter_data_feature = compute_usage_per_day_feature(meter_data, "meter_value")
+    data = merge_features([meter_data_feature, temperature_features])
+    baseline_data, warnings = get_baseline_data(data, end=blackout_start_date)
+    return baseline_data
+
+
+def test_fit_caltrack_usage_per_day_model_candidate_search_bounded(cdd_hdd_grid):
+    exhaustive_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid, fit_engine="numpy"
+    )
+    bounded_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid, fit_engine="numpy", candidate_search="bounded"
+    )
+    assert bounded_results.settings["candidate_search"] == "bounded"
+    assert bounded_results.model.formula == exhaustive_results.model.formula
+    assert bounded_results.r_squared_adj == pytest.approx(
+        exhaustive_results.r_squared_adj
+    )
+    search = bounded_results.metadata["candidate_search"]
+    assert search["n_candidates"] == len(exhaustive_results.candidates)
+    assert search["n_fitted"] == len(bounded_results.candidates)
+    assert search["n_skipped"] == search["n_candidates"] - search["n_fitted"]
+    assert search["n_skipped"] > 0
+    assert "candidate_search" not in exhaustive_results.metadata
+
+
+def test_fit_caltrack_usage_per_day_model_candidate_search_coarse_to_fine(
+    cdd_hdd_grid,
+):
+    exhaustive_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid, fit_engine="numpy"
+    )
+    results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid,
+        fit_engine="numpy",
+        candidate_search="coarse_to_fine",
+        coarse_balance_point_step=4,
+    )
+    assert results.settings["candidate_search"] == "coarse_to_fine"
+    assert results.settings["coarse_balance_point_step"] == 4
+    assert results.model.formula == exhaustive_results.model.formula
+    search = results.metadata["candidate_search"]
+    assert search["method"] == "coarse_to_fine"
+    assert search["coarse_cooling_balance_points"] == [55, 63, 71]
+    assert search["coarse_heating_balance_points"] == [50, 58, 66]
+    assert set(search["coarse_cooling_balance_points"]) <= set(
+        search["evaluated_cooling_balance_points"]
+    )
+    assert search["n_fitted"] == len(results.candidates)
+    assert search["n_skipped"] == search["n_candidates"] - search["n_fitted"]
+    assert search["n_skipped"] > 0
+
+
+def test_fit_caltrack_usage_per_day_model_coarse_to_fine_refines_each_model_type(
+    cdd_hdd_grid,
+):
+    results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid,
+        fit_engine="numpy",
+        candidate_search="coarse_to_fine",
+        coarse_balance_point_step=4,
+        n_refined_candidates=1,
+    )
+    # three balance points of each degree day type are on the coarse grid
+    for model_type in ["cdd_only", "hdd_only"]:
+        n_fitted = sum(c.model_type == model_type for c in results.candidates)
+        assert n_fitted > 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"coarse_balance_point_step": 0},
+        {"coarse_balance_point_step": -2},
+        {"coarse_balance_point_step": 2.5},
+        {"n_refined_candidates": 0},
+    ],
+)
+def test_fit_caltrack_usage_per_day_model_coarse_to_fine_bad_options(
+    cdd_hdd_grid, kwargs
+):
+    with pytest.raises(ValueError):
+        fit_caltrack_usage_per_day_model(
+            cdd_hdd_grid, candidate_search="coarse_to_fine", **kwargs
+        )
+
+
+def test_fit_caltrack_usage_per_day_models_long_format(cdd_hdd_grid):
+    meter_a = cdd_hdd_grid.assign(meter_id="a")
+    meter_b = cdd_hdd_grid.iloc[:200].assign(
+        meter_id="b", meter_value=cdd_hdd_grid.meter_value.iloc[:200] * 2
+    )
+    model_results = fit_caltrack_usage_per_day_models(pd.concat([meter_b, meter_a]))
+    assert len(model_results) == 2
+    for meter, results in zip([meter_b, meter_a], model_results):
+        single_results = fit_caltrack_usage_per_day_model(
+            meter.drop(columns=["meter_id"]), fit_engine="numpy"
+        )
+        assert results.settings["fit_engine"] == "numpy"
+        assert results.model.formula == single_results.model.formula
+        assert results.r_squared_adj == pytest.approx(single_results.r_squared_adj)
+        assert len(results.candidates) == len(single_results.candidates)
+        for candidate, single_candidate in zip(
+            results.candidates, single_results.candidates
+        ):
+            assert candidate.status == single_candidate.status
+            assert candidate.model_params == pytest.approx(
+                single_candidate.model_params
+            )
+
+
+def test_fit_caltrack_usage_per_day_models_array(cdd_hdd_h60_c65):
+    values = np.stack([cdd_hdd_h60_c65.values, cdd_hdd_h60_c65.values * 3])
+    model_results = fit_caltrack_usage_per_day_models(
+        values,
+        index=cdd_hdd_h60_c65.index,
+        columns=cdd_hdd_h60_c65.columns,
+        chunk_size=1,
+    )
+    assert len(model_results) == 2
+    assert model_results[0].model.formula == "meter_value ~ cdd_65 + hdd_60"
+    assert model_results[1].model.model_params["intercept"] == pytest.approx(
+        model_results[0].model.model_params["intercept"] * 3
+    )
+
+
+def test_fit_caltrack_usage_per_day_models_array_errors(cdd_hdd_h60_c65):
+    with pytest.raises(ValueError):
+        fit_caltrack_usage_per_day_models(cdd_hdd_h60_c65.values)
+    with pytest.raises(ValueError):
+        fit_caltrack_usage_per_day_models(cdd_hdd_h60_c65.values[None])
+    with pytest.raises(ValueError):
+        fit_caltrack_usage_per_day_models(
+            cdd_hdd_h60_c65.values[None],
+            index=cdd_hdd_h60_c65.index,
+            columns=cdd_hdd_h60_c65.columns,
+            fit_engine="statsmodels",
+        )
+
+
+@pytest.mark.parametrize("candidate_search", ["exhaustive", "coarse_to_fine"])
+def test_fit_caltrack_usage_per_day_model_n_jobs(cdd_hdd_grid, candidate_search):
+    sequential_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid, candidate_search=candidate_search
+    )
+    threaded_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid, candidate_search=candidate_search, n_jobs=4
+    )
+    assert threaded_results.model.formula == sequential_results.model.formula
+    assert [c.formula for c in threaded_results.candidates] == [
+        c.formula for c in sequential_results.candidates
+    ]
+    assert [c.r_squared_adj for c in threaded_results.candidates] == [
+        c.r_squared_adj for c in sequential_results.candidates
+    ]
+
+
+@pytest.mark.parametrize("n_jobs", [0, -2, 1.5])
+def test_fit_caltrack_usage_per_day_model_bad_n_jobs(cdd_hdd_grid, n_jobs):
+    with pytest.raises(ValueError, match="n_jobs"):
+        fit_caltrack_usage_per_day_model(cdd_hdd_grid, n_jobs=n_jobs)
+
+
+def test_get_cdd_hdd_candidate_models_executor(cdd_hdd_grid):
+    kwargs = dict(
+        data=cdd_hdd_grid,
+        minimum_non_zero_cdd=10,
+        minimum_non_zero_hdd=10,
+        minimum_total_cdd=20,
+        minimum_total_hdd=20,
+        beta_cdd_maximum_p_value=1,
+        beta_hdd_maximum_p_value=1,
+        weights_col=None,
+    )
+    sequential_candidates = get_cdd_hdd_candidate_models(**kwargs)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        threaded_candidates = get_cdd_hdd_candidate_models(executor=executor, **kwargs)
+    assert [c.formula for c in threaded_candidates] == [
+        c.formula for c in sequential_candidates
+    ]
+    assert [c.status for c in threaded_candidates] == [
+        c.status for c in sequential_candidates
+    ]
+
+
+def test_get_cdd_hdd_candidate_models_insufficient_balance_points(
+    cdd_hdd_grid, monkeypatch
+):
+    def fail(*args, **kwargs):
+        raise AssertionError("insufficient pairs are not checked again")
+
+    monkeypatch.setattr(usage_per_day, "get_single_cdd_hdd_candidate_model", fail)
+    candidate_models = get_cdd_hdd_candidate_models(
+        data=cdd_hdd_grid,
+        minimum_non_zero_cdd=10,
+        minimum_non_zero_hdd=10,
+        minimum_total_cdd=1e9,
+        minimum_total_hdd=20,
+        beta_cdd_maximum_p_value=1,
+        beta_hdd_maximum_p_value=1,
+        weights_col=None,
+    )
+    assert len(candidate_models) > 0
+    assert all(c.status == "NOT ATTEMPTED" for c in candidate_models)
+    assert all(
+        "eemeter.caltrack_daily.cdd_hdd.total_cdd_too_low"
+        in [w.qualified_name for w in c.warnings]
+        for c in candidate_models
+    )
+
+
+def test_get_cdd_hdd_candidate_models_process_pool_executor(cdd_hdd_grid):
+    kwargs = dict(
+        data=cdd_hdd_grid,
+        minimum_non_zero_cdd=10,
+        minimum_non_zero_hdd=10,
+        minimum_total_cdd=20,
+        minimum_total_hdd=20,
+        beta_cdd_maximum_p_value=1,
+        beta_hdd_maximum_p_value=1,
+        weights_col=None,
+    )
+    sequential_candidates = get_cdd_hdd_candidate_models(**kwargs)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        process_candidates = get_cdd_hdd_candidate_models(executor=executor, **kwargs)
+    assert [c.formula for c in process_candidates] == [
+        c.formula for c in sequential_candidates
+    ]
+    assert [c.r_squared_adj for c in process_candidates] == [
+        c.r_squared_adj for c in sequential_candidates
+    ]
+
+
+def test_caltrack_usage_per_day_model_state_append_and_drop(cdd_hdd_grid):
+    state = CalTRACKUsagePerDayModelState(cdd_hdd_grid.iloc[:200])
+    state.append(cdd_hdd_grid.iloc[200:]).drop_oldest(30)
+    assert len(state.data) == len(cdd_hdd_grid) - 30
+    assert repr(state).startswith("CalTRACKUsagePerDayModelState(")
+
+    model_results = state.fit()
+    expected_results = fit_caltrack_usage_per_day_model(
+        cdd_hdd_grid.iloc[30:], fit_engine="numpy"
+    )
+    assert model_results.model.formula == expected_results.model.formula
+    assert model_results.r_squared_adj == pytest.approx(expected_results.r_squared_adj)
+    for candidate, expected_candidate in zip(
+        model_results.candidates, expected_results.candidates
+    ):
+        assert candidate.status == expected_candidate.status
+        assert candidate.model_params == pytest.approx(expected_candidate.model_params)
+
+
+def test_caltrack_usage_per_day_model_state_append_replaces_overlap(
+    cdd_hdd_h60_c65,
+):
+    missing_usage = cdd_hdd_h60_c65.assign(meter_value=np.nan)
+    state = CalTRACKUsagePerDayModelState(missing_usage.iloc[:100])
+    state.append(cdd_hdd_h60_c65.iloc[50:])
+    assert state.data.index.equals(cdd_hdd_h60_c65.index)
+    model_results = state.fit()
+    expected_results = fit_caltrack_usage_per_day_model(
+        pd.concat([missing_usage.iloc[:50], cdd_hdd_h60_c65.iloc[50:]]),
+        fit_engine="numpy",
+    )
+    assert model_results.model.model_params == pytest.approx(
+        expected_results.model.model_params
+    )
+
+
+def test_caltrack_usage_per_day_model_state_drop_all(cdd_hdd_h60_c65):
+    state = CalTRACKUsagePerDayModelState(cdd_hdd_h60_c65)
+    model_results = state.drop_oldest(len(cdd_hdd_h60_c65)).fit()
+    assert model_results.status == "NO DATA"
+
+
+def test_caltrack_usage_per_day_model_state_fit_reserved_kwargs(cdd_hdd_h60_c65):
+    state = CalTRACKUsagePerDayModelState(cdd_hdd_h60_c65)
+    with pytest.raises(ValueError) as exc_info:
+        state.fit(fit_engine="statsmodels", weights_col="n_days_kept")
+    assert "fit_engine, weights_col" in str(exc_info.value)
+
+
+def test_fit_caltrack_usage_per_day_model_bad_candidate_search(cdd_hdd_h60_c65):
+    with pytest.raises(ValueError) as exc_info:
+        fit_caltrack_usage_per_day_model(cdd_hdd_h60_c65, candidate_search="bad")
+    assert "candidate_search" in str(exc_info.value)
+
+
+def test_fit_caltrack_usage_per_day_model_bad_fit_engine(cdd_hdd_h60_c65):
+    with pytest.raises(ValueError) as exc_info:
+        fit_caltrack_usage_per_day_model(cdd_hdd_h60_c65, fit_engine="bad")
+    assert "fit_engine" in str(exc_info.value)
+
+
 def test_fit_caltrack_usage_per_day_model_cdd_hdd_use_billing_presets(
     cdd_hdd_h60_c65, prediction_index, temperature_data
 ):
@@ -1994,6 +2466,35 @@ def test_caltrack_sufficiency_criteria_handle_single_input():
     assert len(data_sufficiency.warnings) == 3
 
 
+def test_caltrack_usage_per_day_predict_period_index(
+    prediction_index, temperature_data
+):
+    period_index = TemperaturePeriodIndex(prediction_index, temperature_data.index)
+    model_params = {
+        "intercept": 1,
+        "beta_cdd": 0.5,
+        "cooling_balance_point": 65,
+        "beta_hdd": 0.25,
+        "heating_balance_point": 60,
+    }
+    prediction = caltrack_usage_per_day_predict(
+        "cdd_hdd",
+        model_params,
+        prediction_index,
+        temperature_data,
+        with_design_matrix=True,
+        period_index=period_index,
+    )
+    expected_prediction = caltrack_usage_per_day_predict(
+        "cdd_hdd",
+        model_params,
+        prediction_index,
+        temperature_data,
+        with_design_matrix=True,
+    )
+    pd.testing.assert_frame_equal(prediction.result, expected_prediction.result)
+
+
 def test_caltrack_usage_per_day_predict_empty(prediction_index, temperature_data):
     prediction = caltrack_usage_per_day_predict(
         "intercept_only",
@@ -25,13 +25,20 @@ import pytest
 from eemeter.features import (
     compute_occupancy_feature,
     compute_temperature_features,
+    _compute_temperature_features_with_day_temperatures,
     compute_temperature_bin_features,
     compute_time_features,
     compute_usage_per_day_feature,
     estimate_hour_of_week_occupancy,
+    estimate_hour_of_week_residual_ratios,
     get_missing_hours_of_week_warning,
     fit_temperature_bins,
+    iterate_temperature_features,
     merge_features,
+    HourOfWeekResidualRatios,
+    TemperatureFeatureCache,
+    TemperaturePeriodIndex,
+    _get_degree_day_totals,
 )
 from eemeter.segmentation import segment_time_series
 
@@ -243,6 +250,110 @@ def test_compute_temperature_features_hourly_data_quality(
     assert round(df.temperature_null.mean(), 2) == 0.0
 
 
+def test_compute_temperature_features_hourly_partial_nan_rows(
+    il_electricity_cdd_hdd_hourly,
+):
+    meter_data = il_electricity_cdd_hdd_hourly["meter_data"]["2016-03-01":"2016-03-02"]
+    temperature_data = il_electricity_cdd_hdd_hourly["temperature_data"].copy()
+    temperature_data["2016-03-01 05:00":"2016-03-01 06:00"] = np.nan
+    kwargs = dict(
+        heating_balance_points=[60],
+        cooling_balance_points=[65],
+        degree_day_method="hourly",
+        data_quality=True,
+    )
+
+    df = compute_temperature_features(meter_data.index, temperature_data, **kwargs)
+    assert list(df.columns) == [
+        "temperature_mean",
+        "cdd_65",
+        "hdd_60",
+        "n_hours_dropped",
+        "n_hours_kept",
+        "temperature_null",
+        "temperature_not_null",
+    ]
+    assert df.iloc[5:7].isnull().all().all()
+    assert df.iloc[7].hdd_60 == max(60 - df.iloc[7].temperature_mean, 0)
+    assert df.iloc[-1].isnull().all()
+
+    df = compute_temperature_features(
+        meter_data.index, temperature_data, keep_partial_nan_rows=True, **kwargs
+    )
+    assert list(df.iloc[5][3:]) == [1, 0, 1, 0]
+    assert pd.isnull(df.iloc[5].cdd_65)
+
+    df = compute_temperature_features(meter_data.index[:0], temperature_data, **kwargs)
+    assert df.shape == (0, 7)
+    assert df.n_hours_kept.dtype == int
+
+
+@pytest.mark.parametrize(
+    "sample, chunk_size",
+    [
+        ("il_electricity_cdd_hdd_hourly", 500),
+        ("il_electricity_cdd_hdd_daily", 30),
+        ("il_electricity_cdd_hdd_billing_monthly", 4),
+    ],
+)
+def test_iterate_temperature_features(request, sample, chunk_size):
+    sample = request.getfixturevalue(sample)
+    meter_data = sample["meter_data"]
+    temperature_data = sample["temperature_data"]
+    # leave some chunks without temperature data
+    temperature_data = temperature_data["2016-02-01":"2016-11-01"]
+    kwargs = dict(
+        heating_balance_points=[60],
+        cooling_balance_points=[65, 70],
+        data_quality=True,
+        degree_day_method="hourly" if meter_data.index.freq == "H" else "daily",
+    )
+
+    df = compute_temperature_features(meter_data.index, temperature_data, **kwargs)
+    chunks = list(
+        iterate_temperature_features(
+            meter_data.index, temperature_data, chunk_size=chunk_size, **kwargs
+        )
+    )
+    assert len(chunks) == -(-len(meter_data) // chunk_size)
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    pd.testing.assert_frame_equal(pd.concat(chunks), df, check_freq=False)
+
+    # no temperature data at all
+    chunks = list(
+        iterate_temperature_features(
+            meter_data.index, temperature_data[:0], chunk_size=chunk_size
+        )
+    )
+    df = compute_temperature_features(meter_data.index, temperature_data[:0])
+    pd.testing.assert_frame_equal(pd.concat(chunks), df, check_freq=False)
+
+
+def test_iterate_temperature_features_errors(il_electricity_cdd_hdd_daily):
+    meter_data = il_electricity_cdd_hdd_daily["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    with pytest.raises(ValueError):
+        next(
+            iterate_temperature_features(
+                meter_data.index, temperature_data, chunk_size=0
+            )
+        )
+    with pytest.raises(ValueError):
+        next(
+            iterate_temperature_features(
+                meter_data.index[::-1], temperature_data, chunk_size=10
+            )
+        )
+    with pytest.raises(ValueError):
+        next(
+            iterate_temperature_features(
+                meter_data.index,
+                temperature_data,
+                temperature_cache=TemperatureFeatureCache(),
+            )
+        )
+
+
 def test_compute_temperature_features_daily_temp_mean(il_electricity_cdd_hdd_daily):
     meter_data = il_electricity_cdd_hdd_daily["meter_data"]
     temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
@@ -481,6 +592,51 @@ def test_compute_temperature_features_billing_monthly_daily_degree_days(
     )
 
 
+def test_compute_temperature_features_with_day_temperatures(
+    il_electricity_cdd_hdd_billing_monthly,
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    df = compute_temperature_features(
+        meter_data.index, temperature_data, cooling_balance_points=[65]
+    )
+    (
+        features,
+        day_temperatures,
+        day_rows,
+    ) = _compute_temperature_features_with_day_temperatures(
+        meter_data.index, temperature_data
+    )
+    pd.testing.assert_frame_equal(
+        features, compute_temperature_features(meter_data.index, temperature_data)
+    )
+    assert (np.diff(day_rows) >= 0).all()
+    n_days_kept = np.bincount(day_rows, minlength=len(df))
+    cdd_65 = np.bincount(
+        day_rows, weights=np.maximum(day_temperatures - 65, 0), minlength=len(df)
+    )
+    kept = df.n_days_kept.notnull()
+    assert (n_days_kept[kept] == df.n_days_kept[kept]).all()
+    assert cdd_65[kept] / n_days_kept[kept] == pytest.approx(df.cdd_65[kept].values)
+
+
+def test_compute_temperature_features_with_day_temperatures_errors(
+    il_electricity_cdd_hdd_billing_monthly, il_electricity_cdd_hdd_hourly
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    with pytest.raises(ValueError):
+        _compute_temperature_features_with_day_temperatures(
+            meter_data.index, temperature_data, degree_day_method="hourly"
+        )
+    meter_data = il_electricity_cdd_hdd_hourly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_hourly["temperature_data"]
+    with pytest.raises(ValueError):
+        _compute_temperature_features_with_day_temperatures(
+            meter_data.index, temperature_data
+        )
+
+
 def test_compute_temperature_features_billing_monthly_daily_degree_days_use_mean_false(
     il_electricity_cdd_hdd_billing_monthly, snapshot
 ):
@@ -795,6 +951,171 @@ def test_compute_temperature_features_with_duplicated_index(
     assert str(excinfo.value) == "Duplicates found in input meter trace index."
 
 
+def test_temperature_period_index():
+    meter_data_index = pd.DatetimeIndex(
+        ["2017-01-01 00:00", "2017-01-01 05:00", "2017-01-02 00:00"], tz="UTC"
+    )
+    temperature_index = pd.date_range(
+        "2016-12-31 23:00", periods=30, freq="H", tz="UTC"
+    )
+    period_index = TemperaturePeriodIndex(
+        meter_data_index, temperature_index, tolerance=pd.Timedelta("10H")
+    )
+    assert list(period_index.codes) == ([-1] + [0] * 5 + [1] * 11 + [-1] * 8 + [2] * 5)
+    assert list(period_index.period_positions) == [0, 1, 2]
+    assert list(period_index.starts) == [0, 5, 16]
+    assert list(period_index.lengths) == [5, 11, 5]
+    assert repr(period_index) == (
+        "TemperaturePeriodIndex(n_periods=3, n_temperatures=30)"
+    )
+    assert period_index.matches(
+        meter_data_index, temperature_index, pd.Timedelta("10H")
+    )
+    assert not period_index.matches(meter_data_index, temperature_index)
+    assert not period_index.matches(
+        meter_data_index[:2], temperature_index, pd.Timedelta("10H")
+    )
+
+
+def test_compute_temperature_features_period_index(
+    il_electricity_cdd_hdd_billing_monthly,
+):
+    meter_data = il_electricity_cdd_hdd_billing_monthly["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_billing_monthly["temperature_data"]
+    period_index = TemperaturePeriodIndex(meter_data.index, temperature_data.index)
+    kwargs = dict(
+        heating_balance_points=[60, 61],
+        cooling_balance_points=[65, 66],
+        data_quality=True,
+    )
+    df = compute_temperature_features(
+        meter_data.index, temperature_data, period_index=period_index, **kwargs
+    )
+    expected_df = compute_temperature_features(
+        meter_data.index, temperature_data, **kwargs
+    )
+    pd.testing.assert_frame_equal(df, expected_df)
+
+    with pytest.raises(ValueError):
+        compute_temperature_features(
+            meter_data.index,
+            temperature_data,
+            tolerance=pd.Timedelta("35D"),
+            period_index=period_index,
+            **kwargs
+        )
+
+
+@pytest.mark.parametrize("tolerance", [None, pd.Timedelta("35D")])
+def test_compute_temperature_features_temperature_cache(
+    il_electricity_cdd_hdd_daily, il_electricity_cdd_hdd_billing_monthly, tolerance
+):
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"].copy()
+    temperature_data.iloc[100:130] = np.nan
+    kwargs = dict(
+        heating_balance_points=[60, 61],
+        cooling_balance_points=[65, 66],
+        data_quality=True,
+        tolerance=tolerance,
+    )
+    cache = TemperatureFeatureCache()
+    for meter_data in [
+        il_electricity_cdd_hdd_daily["meter_data"],
+        il_electricity_cdd_hdd_billing_monthly["meter_data"],
+    ]:
+        # including meter data in a timezone with daylight saving time
+        for meter_data_index in [
+            meter_data.index,
+            meter_data.index.tz_convert("US/Central"),
+        ]:
+            expected_df = compute_temperature_features(
+                meter_data_index, temperature_data, **kwargs
+            )
+            for _ in range(2):
+                df = compute_temperature_features(
+                    meter_data_index,
+                    temperature_data,
+                    temperature_cache=cache,
+                    temperature_cache_key="station",
+                    **kwargs
+                )
+                pd.testing.assert_frame_equal(df, expected_df)
+
+    assert cache.stats == {
+        "hits": 7,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+        "max_size": 128,
+        "period_index_hits": 4,
+        "period_index_misses": 4,
+    }
+
+
+def test_temperature_feature_cache(il_electricity_cdd_hdd_daily):
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    cache = TemperatureFeatureCache(max_size=2)
+    assert repr(cache) == (
+        "TemperatureFeatureCache(size=0, max_size=2, hits=0, misses=0)"
+    )
+
+    entry = cache.get(temperature_data)
+    assert cache.get(temperature_data.copy()) is entry  # content hash
+    assert cache.get(temperature_data, key="a") is not entry
+    assert cache.get(temperature_data, key="a") is cache.get(temperature_data, "a")
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 0)
+
+    # a different index under the same key replaces the entry
+    entry_a = cache.get(temperature_data, key="a")
+    assert cache.get(temperature_data.iloc[:100], key="a") is not entry_a
+
+    cache.get(temperature_data, key="b")
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    means, n_not_null = entry.get_daily_values(5)
+    assert means[0] == pytest.approx(temperature_data.iloc[5:29].mean())
+    assert n_not_null[0] == 24
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats["hits"] == 0
+
+    with pytest.raises(ValueError):
+        TemperatureFeatureCache(max_size=0)
+
+
+def test_get_degree_day_totals():
+    values = np.array([50.0, 60.0, 65.5, 70.0, 55.0, np.nan, 80.0])
+    groups = np.array([0, 0, 0, 1, 1, 2, 3])
+    cooling_balance_points = [60, 65, 72.5]
+    heating_balance_points = [55, 60, 90]
+    cdd, hdd = _get_degree_day_totals(
+        values, groups, 5, cooling_balance_points, heating_balance_points
+    )
+    for group in range(5):
+        group_values = values[groups == group]
+        for i, bp in enumerate(cooling_balance_points):
+            expected = np.maximum(group_values - bp, 0).sum()
+            assert cdd[group, i] == pytest.approx(expected, nan_ok=True)
+        for i, bp in enumerate(heating_balance_points):
+            expected = np.maximum(bp - group_values, 0).sum()
+            assert hdd[group, i] == pytest.approx(expected, nan_ok=True)
+    assert np.isnan(cdd[2]).all()
+    assert (cdd[4] == 0).all()
+
+
+def test_compute_temperature_features_unsorted_meter_data(
+    il_electricity_cdd_hdd_daily,
+):
+    meter_data = il_electricity_cdd_hdd_daily["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    with pytest.raises(ValueError):
+        compute_temperature_features(
+            meter_data.index[::-1], temperature_data, heating_balance_points=[60]
+        )
+
+
 def test_compute_temperature_features_empty_temperature_data():
     index = pd.DatetimeIndex([], tz="UTC", name="dt", freq="H")
     temperature_data = pd.Series({"value": []}, index=index).astype(float)
@@ -964,6 +1285,23 @@ def test_compute_time_features_all():
     assert features.index[-1] == index[-1]
 
 
+def test_compute_time_features_compact():
+    index = pd.date_range("2017-03-01", periods=24 * 31, freq="H", tz="US/Eastern")
+    features = compute_time_features(index, compact=True)
+    assert list(features.dtypes) == [np.int8, np.int8, np.int16]
+    categorical_features = compute_time_features(index)
+    pd.testing.assert_frame_equal(
+        features, categorical_features.astype(features.dtypes.to_dict())
+    )
+    # local wall time across the DST change
+    assert list(features.hour_of_day.iloc[24 * 11 : 24 * 11 + 4]) == [0, 1, 3, 4]
+    assert features.hour_of_week.iloc[0] == 48  # wednesday
+
+    # memoized by index; results can be modified independently
+    features.hour_of_week.iloc[0] = 0
+    assert compute_time_features(index, compact=True).hour_of_week.iloc[0] == 48
+
+
 def test_compute_time_features_none():
     index = pd.date_range("2017-01-01", periods=168, freq="H", tz="UTC")
     with pytest.raises(ValueError):
@@ -1138,6 +1476,38 @@ def test_fit_temperature_bins_with_occupancy_lookup(
     assert unoccupied_bins.sum().sum() == 12
 
 
+def test_fit_temperature_bins_occupancy_missing_hours(
+    temperature_means, even_occupancy
+):
+    occupancy_lookup = even_occupancy.to_frame("occupancy")
+    temperature_means = temperature_means.iloc[:500]
+    temperature_means.iloc[::10] = np.nan
+    occupied_bins, unoccupied_bins = fit_temperature_bins(
+        temperature_means, occupancy_lookup=occupancy_lookup
+    )
+    assert list(occupied_bins.keep_bin_endpoint) == [
+        False,
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert list(unoccupied_bins.keep_bin_endpoint) == [
+        True,
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+    with pytest.raises(ValueError):
+        fit_temperature_bins(
+            temperature_means, occupancy_lookup=occupancy_lookup.iloc[:100]
+        )
+
+
 def test_fit_temperature_bins_empty(temperature_means):
     bins = fit_temperature_bins(temperature_means.iloc[:0])
     assert list(bins.columns) == ["keep_bin_endpoint"]
@@ -1153,6 +1523,22 @@ def test_compute_temperature_bin_features(temperature_means):
     assert bin_features.sum().sum() == 112000.0
 
 
+def test_compute_temperature_bin_features_out(temperature_means):
+    temps = temperature_means.temperature_mean.copy()
+    temps.iloc[:3] = [np.nan, 25.0, 80.0]
+    out = np.zeros((len(temps), 5))
+    bin_features = compute_temperature_bin_features(temps, [25, 75], out=out[:, 1:4])
+    assert list(bin_features.iloc[1]) == [25, 0, 0]
+    assert list(bin_features.iloc[2]) == [25, 50, 5]
+    assert bin_features.iloc[0].isnull().all()
+    assert bin_features.sum(axis=1, min_count=1).equals(temps.rename(None))
+    np.testing.assert_array_equal(out[:, 1:4], bin_features.values)
+    assert (out[:, [0, 4]] == 0).all()
+
+    with pytest.raises(ValueError):
+        compute_temperature_bin_features(temps, [25, 75], out=out)
+
+
 @pytest.fixture
 def even_occupancy():
     return pd.Series([i % 2 == 0 for i in range(168)], index=pd.Categorical(range(168)))
@@ -1183,6 +1569,21 @@ def test_compute_occupancy_feature_with_nans(even_occupancy):
     occupancy = compute_occupancy_feature(hour_of_week, even_occupancy)
 
 
+def test_compute_occupancy_feature_missing_hours(even_occupancy):
+    index = pd.date_range("2017-01-02", periods=200, freq="H", tz="UTC")
+    hour_of_week = compute_time_features(index, compact=True).hour_of_week
+    occupancy = compute_occupancy_feature(hour_of_week, even_occupancy)
+    assert occupancy.dtype == bool
+    assert occupancy.index.equals(index)
+    assert list(occupancy.iloc[166:170]) == [True, False, True, False]
+
+    # hours not in the lookup are null
+    occupancy = compute_occupancy_feature(hour_of_week, even_occupancy.iloc[:100])
+    assert occupancy.iloc[:100].sum() == 50
+    assert occupancy.iloc[100:168].isnull().all()
+    assert occupancy.iloc[168:].notnull().all()
+
+
 @pytest.fixture
 def occupancy_precursor_only_nan(il_electricity_cdd_hdd_hourly):
     meter_data = il_electricity_cdd_hdd_hourly["meter_data"]
@@ -1210,6 +1611,114 @@ def segmentation_only_nan(occupancy_precursor_only_nan):
     )
 
 
+def test_estimate_hour_of_week_occupancy_matches_wls(
+    occupancy_precursor, one_month_segmentation
+):
+    smf = pytest.importorskip("statsmodels.formula.api")
+    occupancy = estimate_hour_of_week_occupancy(
+        occupancy_precursor, segmentation=one_month_segmentation, threshold=0.5
+    )
+    for segment_name in ["jan", "jul"]:
+        weights = one_month_segmentation[segment_name]
+        data = occupancy_precursor[weights > 0].dropna()
+        residuals = (
+            smf.wls(
+                "meter_value ~ cdd_65 + hdd_50",
+                data=data,
+                weights=weights.reindex(data.index),
+            )
+            .fit()
+            .resid
+        )
+        ratios = (
+            (residuals > 0)
+            .groupby(data.hour_of_week.astype(int))
+            .mean()
+            .reindex(range(168))
+        )
+        # hours without data are marked as occupied
+        expected = ~(ratios <= 0.5)
+        assert list(occupancy[segment_name]) == list(expected)
+
+    # segments without data are null
+    segmentation = one_month_segmentation.copy()
+    segmentation["jul"] = 0
+    occupancy = estimate_hour_of_week_occupancy(
+        occupancy_precursor, segmentation=segmentation
+    )
+    assert occupancy.jul.isnull().all()
+    assert occupancy.jan.dtype == bool
+
+
+def test_estimate_hour_of_week_residual_ratios(
+    occupancy_precursor, one_month_segmentation
+):
+    segmentation = one_month_segmentation.copy()
+    segmentation["jul"] = 0
+    residual_ratios = estimate_hour_of_week_residual_ratios(
+        occupancy_precursor, segmentation=segmentation
+    )
+    assert isinstance(residual_ratios, HourOfWeekResidualRatios)
+    assert residual_ratios.ratios.shape == (168, 12)
+    assert list(residual_ratios.ratios.columns) == list(segmentation.columns)
+    assert residual_ratios.ratios.jul.isnull().all()
+    assert residual_ratios.ratios.jan.between(0, 1).all()
+    assert residual_ratios.n_residuals.jan.sum() == (segmentation.jan > 0).sum()
+    assert (
+        (residual_ratios.n_positive_residuals <= residual_ratios.n_residuals)
+        .all()
+        .all()
+    )
+    assert not residual_ratios.has_data.jul
+
+    thresholds = [0.5, 0.65, 0.8]
+    occupancy_lookups = residual_ratios.get_occupancy_lookups(thresholds)
+    assert list(occupancy_lookups) == thresholds
+    for threshold, occupancy_lookup in occupancy_lookups.items():
+        pd.testing.assert_frame_equal(
+            occupancy_lookup,
+            estimate_hour_of_week_occupancy(
+                occupancy_precursor, segmentation=segmentation, threshold=threshold
+            ),
+        )
+
+
+def test_hour_of_week_residual_ratios_threshold_direction():
+    index = pd.CategoricalIndex(range(168), name="hour_of_week")
+    residual_ratios = HourOfWeekResidualRatios(
+        pd.DataFrame({"a": np.full(168, 7)}, index=index),
+        pd.DataFrame({"a": np.full(168, 10)}, index=index),
+        pd.Series([True], index=["a"]),
+    )
+    assert (residual_ratios.ratios.a == 0.7).all()
+    assert residual_ratios.get_occupancy_lookup(0.65).a.all()
+    assert not residual_ratios.get_occupancy_lookup(0.75).a.any()
+
+
+def test_hour_of_week_residual_ratios_segment_without_data():
+    index = pd.CategoricalIndex(range(168), name="hour_of_week")
+    n_positive_residuals = pd.DataFrame(
+        {"a": np.full(168, 7), "b": np.zeros(168)}, index=index
+    )
+    n_residuals = pd.DataFrame({"a": np.full(168, 10), "b": np.zeros(168)}, index=index)
+    residual_ratios = HourOfWeekResidualRatios(
+        n_positive_residuals, n_residuals, pd.Series([True, False], index=["a", "b"])
+    )
+    occupancy_lookup = residual_ratios.get_occupancy_lookup(0.65)
+    assert list(occupancy_lookup.columns) == ["a", "b"]
+    assert list(occupancy_lookup.index) == list(range(168))
+    assert occupancy_lookup.a.dtype == bool
+    assert occupancy_lookup.a.all()
+    assert occupancy_lookup.b.isnull().all()
+    # the index is only named when all segments have data
+    assert occupancy_lookup.index.name is None
+
+    residual_ratios = HourOfWeekResidualRatios(
+        n_positive_residuals[["a"]], n_residuals[["a"]], pd.Series([True], index=["a"])
+    )
+    assert residual_ratios.get_occupancy_lookup(0.65).index.name == "hour_of_week"
+
+
 def test_estimate_hour_of_week_occupancy_segmentation_only_nan(
     occupancy_precursor_only_nan, segmentation_only_nan
 ):
@@ -18,19 +18,23 @@
 
 """
 import gzip
+import os
 from pkg_resources import resource_filename, resource_stream
 from tempfile import TemporaryFile
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from eemeter import (
+    compute_temperature_features,
     meter_data_from_csv,
     meter_data_from_json,
     meter_data_to_csv,
     temperature_data_from_csv,
     temperature_data_from_json,
     temperature_data_to_csv,
+    TemperatureFeatureStore,
 )
 
 
@@ -268,3 +272,74 @@ def test_temperature_data_to_csv(sample_metadata):
         temperature_data_to_csv(series, f)
         f.seek(0)
         assert f.read() == ("dt,temperature\n" "2017-01-01 00:00:00+00:00,10\n")
+
+
+def test_temperature_feature_store(sample_metadata, tmp_path):
+    meter_item = sample_metadata["il-electricity-cdd-hdd-daily"]
+    store = TemperatureFeatureStore(str(tmp_path))
+    with resource_stream("eemeter.samples", meter_item["temperature_filename"]) as f:
+        temperature_data = store.add_csv(
+            "722880",
+            f,
+            day_start_tz="UTC",
+            cooling_balance_points=[65, 70],
+            heating_balance_points=[60],
+            gzipped=True,
+            freq="hourly",
+        )
+    assert store.keys() == ["722880"]
+    assert "722880" in store
+    assert "other" not in store
+    assert "daily_means_18.npy" in os.listdir(str(tmp_path / "722880"))
+    assert np.load(str(tmp_path / "722880" / "not_null.npy")).dtype == bool
+
+    meter_data_index = pd.date_range(
+        "2016-01-01", periods=100, freq="D", tz="UTC", name="start"
+    )
+    kwargs = dict(
+        heating_balance_points=[60], cooling_balance_points=[65, 70], data_quality=True
+    )
+    expected_df = compute_temperature_features(
+        meter_data_index, temperature_data, **kwargs
+    )
+
+    # e.g., in a new worker process
+    store = TemperatureFeatureStore(str(tmp_path))
+    stored_temperature_data = store.load_temperature_data("722880")
+    assert isinstance(stored_temperature_data.values, np.memmap)
+    df = compute_temperature_features(
+        meter_data_index,
+        stored_temperature_data,
+        temperature_cache=store,
+        temperature_cache_key="722880",
+        **kwargs
+    )
+    pd.testing.assert_frame_equal(df, expected_df)
+    means, _ = store.get(stored_temperature_data, key="722880").get_daily_values(18)
+    assert isinstance(means, np.memmap)
+
+
+def test_temperature_feature_store_errors(tmp_path):
+    store = TemperatureFeatureStore(str(tmp_path))
+    temperature_data = pd.Series(
+        np.arange(48.0),
+        index=pd.date_range("2017-01-01", periods=48, freq="H", tz="UTC"),
+    )
+    store.get(temperature_data, key="a")
+    assert store.keys() == ["a"]
+
+    # a different series under the same key must be added explicitly
+    with pytest.raises(ValueError):
+        TemperatureFeatureStore(str(tmp_path)).get(temperature_data.iloc[1:], key="a")
+    # as must a series with the same index but different values
+    with pytest.raises(ValueError):
+        TemperatureFeatureStore(str(tmp_path)).get(temperature_data + 1, key="a")
+    store.add("a", temperature_data.iloc[1:])
+    assert len(store.load_temperature_data("a")) == 47
+
+    with pytest.raises(ValueError):
+        store.get(temperature_data, key="")
+    with pytest.raises(ValueError):
+        store.add("b", temperature_data.resample("D").mean())
+    with pytest.raises(KeyError):
+        store.load_temperature_data("c")
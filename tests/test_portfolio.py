@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+   Copyright 2014-2023 OpenEEmeter contributors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+import threading
+
+import pytest
+
+from eemeter.derivatives import metered_savings
+from eemeter.portfolio import (
+    CalTRACKPortfolioRunner,
+    PortfolioMeter,
+    PortfolioMeterResult,
+)
+from eemeter.transform import get_baseline_data, get_reporting_data
+
+
+@pytest.fixture
+def portfolio_meter(il_electricity_cdd_hdd_daily):
+    meter_data = il_electricity_cdd_hdd_daily["meter_data"]
+    temperature_data = il_electricity_cdd_hdd_daily["temperature_data"]
+    baseline_meter_data, warnings = get_baseline_data(
+        meter_data, end=il_electricity_cdd_hdd_daily["blackout_start_date"]
+    )
+    reporting_meter_data, warnings = get_reporting_data(
+        meter_data, start=il_electricity_cdd_hdd_daily["blackout_end_date"]
+    )
+    return PortfolioMeter(
+        "meter-1", baseline_meter_data, reporting_meter_data, temperature_data
+    )
+
+
+def test_portfolio_meter_result_repr():
+    result = PortfolioMeterResult("meter-1", "SUCCESS")
+    assert repr(result) == "PortfolioMeterResult(meter_id='meter-1', status='SUCCESS')"
+
+
+def test_portfolio_runner_bad_chunk_size():
+    with pytest.raises(ValueError):
+        CalTRACKPortfolioRunner(chunk_size=0)
+
+
+def test_portfolio_runner_billing_fit_kwargs():
+    runner = CalTRACKPortfolioRunner(billing=True, fit_kwargs={"fit_cdd": False})
+    assert runner.fit_kwargs == {
+        "use_billing_presets": True,
+        "weights_col": "n_days_kept",
+        "fit_cdd": False,
+    }
+
+
+def test_portfolio_runner_process_pool(portfolio_meter):
+    meters = [
+        portfolio_meter._replace(meter_id="meter-{}".format(i)) for i in range(3)
+    ] + [("bad-meter", None, None, None)]
+    runner = CalTRACKPortfolioRunner(
+        n_workers=2, chunk_size=2, fit_kwargs={"fit_engine": "numpy"}
+    )
+    results = {result.meter_id: result for result in runner.run(iter(meters))}
+    assert sorted(results) == ["bad-meter", "meter-0", "meter-1", "meter-2"]
+
+    failed = results["bad-meter"]
+    assert failed.status == "FAILED"
+    assert failed.model_results is None
+    assert "Traceback" in failed.error
+
+    result = results["meter-0"]
+    assert result.status == "SUCCESS"
+    assert result.error is None
+    assert result.model_results.status == "SUCCESS"
+    assert result.model_results.metadata["meter_id"] == "meter-0"
+    savings, error_bands = result.savings
+    expected_savings, expected_error_bands = metered_savings(
+        result.model_results,
+        portfolio_meter.reporting_meter_data,
+        portfolio_meter.temperature_data,
+    )
+    assert savings.metered_savings.sum() == pytest.approx(
+        expected_savings.metered_savings.sum()
+    )
+
+    counters = runner.counters
+    assert counters["n_submitted"] == 4
+    assert counters["n_completed"] == 4
+    assert counters["n_succeeded"] == 3
+    assert counters["n_failed"] == 1
+    assert counters["n_chunks"] == 2
+    assert counters["meters_per_second"] > 0
+    assert counters["worker_seconds"] > 0
+
+
+def test_portfolio_runner_executor_without_reporting_data(portfolio_meter):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        runner = CalTRACKPortfolioRunner(
+            executor=executor, fit_kwargs={"fit_engine": "numpy"}
+        )
+        results = list(
+            runner.run([portfolio_meter._replace(reporting_meter_data=None)])
+        )
+    assert len(results) == 1
+    assert results[0].status == "SUCCESS"
+    assert results[0].savings is None
+    assert runner.counters["n_chunks"] == 1
+
+
+class _DeferredExecutor(Executor):
+    """Runs submitted calls once ``release`` is set, counting the calls that
+    are submitted but not yet run."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.n_outstanding = 0
+        self.max_outstanding = 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        with self.lock:
+            self.n_outstanding += 1
+            self.max_outstanding = max(self.max_outstanding, self.n_outstanding)
+
+        def _run():
+            self.release.wait()
+            with self.lock:
+                self.n_outstanding -= 1
+            future.set_result(fn(*args, **kwargs))
+
+        threading.Thread(target=_run).start()
+        return future
+
+
+def test_portfolio_runner_executor_n_workers():
+    executor = _DeferredExecutor()
+    threading.Timer(0.5, executor.release.set).start()
+    runner = CalTRACKPortfolioRunner(n_workers=3, chunk_size=1, executor=executor)
+    meters = [("meter-{}".format(i), None, None, None) for i in range(10)]
+    results = list(runner.run(meters))
+    assert len(results) == 10
+    assert executor.max_outstanding == 6